@@ -1,5 +1,6 @@
 from __future__ import annotations
 import os
+import re
 from logging.config import fileConfig
 
 from alembic import context
@@ -8,6 +9,7 @@ from sqlmodel import SQLModel
 
 # Ensure new SQLModel tables are registered via side-effect import
 import app.models  # noqa: F401
+from app.models.partitions import season_partitioned_tables
 
 config = context.config
 if config.config_file_name:
@@ -23,6 +25,11 @@ target_metadata = SQLModel.metadata
 TABLES_TO_MIGRATE: set[str] = set()
 
 
+_SEASON_PARTITION = re.compile(
+    rf"^({'|'.join(season_partitioned_tables())})_(y\d+|default)$"
+)
+
+
 def include_object(obj, name, type_, _reflected, _compare_to):
     """If TABLES_TO_MIGRATE is non-empty, include only those tables and their columns.
     Alembic calls this for tables, columns, indexes, constraints, etc.
@@ -30,6 +37,10 @@ def include_object(obj, name, type_, _reflected, _compare_to):
     if type_ == "table" and name == "apscheduler_jobs":
         return False
 
+    # the season partitions (see app/models/partitions.py) aren't models
+    if type_ == "table" and _reflected and _SEASON_PARTITION.match(name):
+        return False
+
     if not TABLES_TO_MIGRATE:
         return True
 
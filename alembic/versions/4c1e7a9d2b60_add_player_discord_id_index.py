@@ -0,0 +1,30 @@
+"""add player discord_id index
+
+Revision ID: 4c1e7a9d2b60
+Revises: 1bba3f7edaac
+Create Date: 2026-10-18 10:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1e7a9d2b60'
+down_revision: Union[str, Sequence[str], None] = '1bba3f7edaac'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # every page resolves the viewer by discord_id
+    op.create_index(op.f('ix_player_discord_id'), 'player', ['discord_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_player_discord_id'), table_name='player')
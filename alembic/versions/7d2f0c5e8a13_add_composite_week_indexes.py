@@ -0,0 +1,43 @@
+"""add composite week indexes
+
+Revision ID: 7d2f0c5e8a13
+Revises: 4c1e7a9d2b60
+Create Date: 2026-10-18 11:03:27.118452
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2f0c5e8a13'
+down_revision: Union[str, Sequence[str], None] = '4c1e7a9d2b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Game.games_for_week: the week's games in kickoff order
+    op.create_index('ix_game_week_start', 'game',
+                    ['season', 'season_type', 'week_no', 'start_time'], unique=False)
+    # PlayerGamePick.find_picks_for_week and Player.picks_for_week
+    op.create_index('ix_playergamepick_week', 'playergamepick',
+                    ['season', 'season_type', 'week_no'], unique=False)
+    op.create_index('ix_playergamepick_player_week', 'playergamepick',
+                    ['player_id', 'season', 'season_type', 'week_no'], unique=False)
+    # upsert_award_with_args
+    op.create_index('ix_playeraward_player_award_week', 'playeraward',
+                    ['player_id', 'award_id', 'season', 'season_type', 'week_no'],
+                    unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_playeraward_player_award_week', table_name='playeraward')
+    op.drop_index('ix_playergamepick_player_week', table_name='playergamepick')
+    op.drop_index('ix_playergamepick_week', table_name='playergamepick')
+    op.drop_index('ix_game_week_start', table_name='game')
@@ -0,0 +1,59 @@
+"""add game pick stats
+
+Revision ID: b3e8f1a2c946
+Revises: 7d2f0c5e8a13
+Create Date: 2026-10-19 09:12:44.530218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e8f1a2c946'
+down_revision: Union[str, Sequence[str], None] = '7d2f0c5e8a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('gamepickstats',
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('game_id', sa.Integer(), nullable=False),
+    sa.Column('season', sa.Integer(), nullable=False),
+    sa.Column('season_type', sa.Integer(), nullable=False),
+    sa.Column('week_no', sa.Integer(), nullable=False),
+    sa.Column('home_picks', sa.Integer(), nullable=False),
+    sa.Column('road_picks', sa.Integer(), nullable=False),
+    sa.Column('home_locks', sa.Integer(), nullable=False),
+    sa.Column('road_locks', sa.Integer(), nullable=False),
+    sa.Column('upsets', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['game_id'], ['game.id'], ),
+    sa.PrimaryKeyConstraint('game_id')
+    )
+    op.create_index('ix_gamepickstats_week', 'gamepickstats',
+                    ['season', 'season_type', 'week_no'], unique=False)
+    # count the picks made so far
+    op.execute("""
+        INSERT INTO gamepickstats (game_id, season, season_type, week_no,
+                                   home_picks, road_picks, home_locks, road_locks, upsets)
+        SELECT g.id, g.season, g.season_type, g.week_no,
+               SUM(CASE WHEN p.picked_team_id = g.home_team_id THEN 1 ELSE 0 END),
+               SUM(CASE WHEN p.picked_team_id <> g.home_team_id THEN 1 ELSE 0 END),
+               SUM(CASE WHEN p.picked_team_id = g.home_team_id AND p.is_lock THEN 1 ELSE 0 END),
+               SUM(CASE WHEN p.picked_team_id <> g.home_team_id AND p.is_lock THEN 1 ELSE 0 END),
+               SUM(CASE WHEN p.is_upset THEN 1 ELSE 0 END)
+        FROM game g JOIN playergamepick p ON p.game_id = g.id
+        GROUP BY g.id, g.season, g.season_type, g.week_no
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_gamepickstats_week', table_name='gamepickstats')
+    op.drop_table('gamepickstats')
@@ -0,0 +1,44 @@
+"""add player profile stats
+
+Revision ID: c71d4e9a2b58
+Revises: b3e8f1a2c946
+Create Date: 2026-10-19 14:03:27.118604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71d4e9a2b58'
+down_revision: Union[str, Sequence[str], None] = 'b3e8f1a2c946'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # filled in by the next award job run (PlayerProfileStats.refresh)
+    op.create_table('playerprofilestats',
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('weeks', sa.JSON(), nullable=False),
+    sa.Column('week_points', sa.JSON(), nullable=False),
+    sa.Column('season_rank', sa.JSON(), nullable=False),
+    sa.Column('awards', sa.JSON(), nullable=False),
+    sa.Column('locks', sa.Integer(), nullable=False),
+    sa.Column('lock_wins', sa.Integer(), nullable=False),
+    sa.Column('upsets', sa.Integer(), nullable=False),
+    sa.Column('upset_wins', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['player.id'], ),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('playerprofilestats')
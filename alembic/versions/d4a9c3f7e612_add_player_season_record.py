@@ -0,0 +1,42 @@
+"""add player season record
+
+Revision ID: d4a9c3f7e612
+Revises: c71d4e9a2b58
+Create Date: 2026-10-19 16:41:09.772031
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a9c3f7e612'
+down_revision: Union[str, Sequence[str], None] = 'c71d4e9a2b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # filled in (and the past seasons archived) by the next
+    # update_player_records run
+    op.create_table('playerseasonrecord',
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('season', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('bonus', sa.Integer(), nullable=False),
+    sa.Column('archived', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['player.id'], ),
+    sa.PrimaryKeyConstraint('player_id', 'season')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('playerseasonrecord')
@@ -0,0 +1,137 @@
+"""partition playergamepick and playeraward by season
+
+On PostgreSQL each table is copied into a LIST-partitioned twin with one partition per season that has rows, plus a
+DEFAULT partition, and its indexes, unique constraints and foreign keys are
+recreated on it.  Postgres needs the partition key in every primary key and
+unique constraint of a partitioned table, so ``season`` is added where it is
+missing (the primary keys and ``uq_playergamepick_player_game``); a game
+belongs to one season, so nothing more or less is unique than before.
+``uq_one_lock_per_week`` already has ``season`` and stays a partial unique
+index, enforced per partition.
+
+Later seasons get their partitions from ``models.partitions``.
+
+Other databases aren't partitioned; they only get ``season`` in
+``uq_playergamepick_player_game`` (in batch mode, for SQLite), so the schema
+matches the model on every database.
+
+Revision ID: e5b7a1d94c20
+Revises: d4a9c3f7e612
+Create Date: 2026-10-19 19:22:51.406113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b7a1d94c20'
+down_revision: Union[str, Sequence[str], None] = 'd4a9c3f7e612'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('playergamepick', 'playeraward')
+# constraints that only have season because of the partitioning
+SEASON_ADDED = {'uq_playergamepick_player_game'}
+
+
+def _key(name, columns, partitioned, primary=False):
+    if partitioned:
+        return columns if 'season' in columns else [*columns, 'season']
+    if primary or name in SEASON_ADDED:
+        return [column for column in columns if column != 'season']
+    return columns
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """Copy `table` into a (non-)partitioned twin with the same constraints"""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    primary_key = inspector.get_pk_constraint(table)
+    uniques = inspector.get_unique_constraints(table)
+    indexes = [
+        index for index in inspector.get_indexes(table)
+        if not index.get('duplicates_constraint')
+    ]
+    foreign_keys = inspector.get_foreign_keys(table)
+    sequence = bind.execute(
+        sa.text("SELECT pg_get_serial_sequence(:table, 'id')"), {'table': table}
+    ).scalar()
+    seasons = bind.execute(
+        sa.text(f'SELECT DISTINCT season FROM {table} ORDER BY season')
+    ).scalars().all()
+
+    new = f'{table}_new'
+    partition_by = ' PARTITION BY LIST (season)' if partitioned else ''
+    op.execute(f'CREATE TABLE {new} (LIKE {table} INCLUDING DEFAULTS){partition_by}')
+    if partitioned:
+        # same names as models.partitions.partition_name
+        for season in seasons:
+            op.execute(
+                f'CREATE TABLE {table}_y{int(season)} PARTITION OF {new} '
+                f'FOR VALUES IN ({int(season)})'
+            )
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {new} DEFAULT')
+    op.execute(f'INSERT INTO {new} SELECT * FROM {table}')
+    if sequence:
+        op.execute(f'ALTER SEQUENCE {sequence} OWNED BY {new}.id')
+    # takes the old indexes and constraints (and partitions) with it
+    op.execute(f'DROP TABLE {table}')
+    op.rename_table(new, table)
+
+    op.create_primary_key(
+        primary_key['name'] or f'{table}_pkey', table,
+        _key(primary_key['name'], primary_key['constrained_columns'],
+             partitioned, primary=True)
+    )
+    for unique in uniques:
+        op.create_unique_constraint(
+            unique['name'], table,
+            _key(unique['name'], unique['column_names'], partitioned)
+        )
+    for index in indexes:
+        columns = index['column_names']
+        if index['unique']:
+            columns = _key(index['name'], columns, partitioned)
+        where = index.get('dialect_options', {}).get('postgresql_where')
+        op.create_index(
+            index['name'], table, columns, unique=index['unique'],
+            postgresql_where=sa.text(where) if where else None,
+        )
+    for foreign_key in foreign_keys:
+        op.create_foreign_key(
+            foreign_key['name'], table, foreign_key['referred_table'],
+            foreign_key['constrained_columns'], foreign_key['referred_columns']
+        )
+    op.execute(f'ANALYZE {table}')
+
+
+def _rebuild_unique(partitioned: bool) -> None:
+    """The constraints of SEASON_ADDED, with or without season"""
+    with op.batch_alter_table('playergamepick') as batch_op:
+        for name in SEASON_ADDED:
+            batch_op.drop_constraint(name, type_='unique')
+            batch_op.create_unique_constraint(
+                name, _key(name, ['player_id', 'game_id'], partitioned)
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        _rebuild_unique(partitioned=True)
+        return
+    for table in TABLES:
+        _rebuild(table, partitioned=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        _rebuild_unique(partitioned=False)
+        return
+    for table in TABLES:
+        _rebuild(table, partitioned=False)
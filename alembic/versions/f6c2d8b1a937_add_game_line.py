@@ -0,0 +1,42 @@
+"""add game line history
+
+Revision ID: f6c2d8b1a937
+Revises: e5b7a1d94c20
+Create Date: 2026-10-19 21:05:37.219504
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6c2d8b1a937'
+down_revision: Union[str, Sequence[str], None] = 'e5b7a1d94c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # the first refresh_lines run records each pregame game's current line
+    op.create_table('gameline',
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('game_id', sa.Integer(), nullable=False),
+    sa.Column('bucket', sa.DateTime(), nullable=False),
+    sa.Column('favorite_team_id', sa.Integer(), nullable=False),
+    sa.Column('spread', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['favorite_team_id'], ['team.id'], ),
+    sa.ForeignKeyConstraint(['game_id'], ['game.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('game_id', 'bucket', name='uq_gameline_game_bucket')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('gameline')
@@ -0,0 +1,178 @@
+"""
+Streaming gzip/brotli compression for the pages and API responses.
+
+Bodies are compressed chunk by chunk and each chunk is flushed, so a streamed
+page still reaches the browser as it is rendered.  A response is left alone
+when it is smaller than ``COMPRESSION_MIN_SIZE`` (and not streamed), already
+has a Content-Encoding (the precompressed files from ``StaticAssets``), isn't
+a text format, or is the live score event stream, which must not be buffered.
+
+The levels are read from the environment: ``GZIP_LEVEL`` (1-9) and
+``BROTLI_QUALITY`` (0-11).  The defaults favour CPU over the last few percent,
+the HTML here compresses well at any level.
+"""
+
+import os
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics.prometheus import COMPRESSION_BYTES
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip alone still works
+    brotli = None
+
+MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "image/svg+xml",
+)
+EXCLUDED_TYPES = ("text/event-stream",)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """The best encoding we can produce that the client accepts"""
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.partition(";")
+        quality = params.strip().removeprefix("q=")
+        try:
+            refused = params.strip().startswith("q=") and float(quality) == 0
+        except ValueError:
+            refused = False
+        if not refused:
+            accepted.add(name.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def is_compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").lower()
+    if content_type.startswith(EXCLUDED_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class _Compressor:
+    """Incremental compressor for one response body"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress `data` and flush it, so the client can decode it now"""
+        if self.encoding == "br":
+            return self._br.process(data) + self._br.flush()
+        return self._gz.compress(data) + self._gz.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._br.process(data) + self._br.finish()
+        return self._gz.compress(data) + self._gz.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware; see the module docstring for what is skipped"""
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = MIN_SIZE,
+        gzip_level: int = GZIP_LEVEL,
+        brotli_quality: int = BROTLI_QUALITY,
+        exclude_paths: tuple[str, ...] = ("/static/",),
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressedResponse(self, encoding, send).run(scope, receive)
+
+
+class _CompressedResponse:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def run(self, scope: Scope, receive: Receive):
+        await self.middleware.app(scope, receive, self.on_send)
+
+    async def on_send(self, message: Message):
+        if message["type"] == "http.response.start":
+            # held until the first body chunk shows whether it's worth it
+            self.start = message
+            if not is_compressible(Headers(raw=message.get("headers", []))):
+                self.passthrough = True
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is None:
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+            self.compressor = _Compressor(
+                self.encoding,
+                self.middleware.gzip_level,
+                self.middleware.brotli_quality,
+            )
+            headers = MutableHeaders(scope=self.start)
+            headers["content-encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if "content-length" in headers:
+                del headers["content-length"]
+            if more_body:
+                compressed = self.compressor.chunk(body)
+            else:
+                compressed = self.compressor.finish(body)
+                headers["content-length"] = str(len(compressed))
+            await self.send(self.start)
+        elif more_body:
+            compressed = self.compressor.chunk(body)
+        else:
+            compressed = self.compressor.finish(body)
+
+        COMPRESSION_BYTES.labels(self.encoding, "in").inc(len(body))
+        COMPRESSION_BYTES.labels(self.encoding, "out").inc(len(compressed))
+        await self.send(
+            {"type": "http.response.body", "body": compressed, "more_body": more_body}
+        )
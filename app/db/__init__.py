@@ -4,7 +4,9 @@ from contextlib import contextmanager
 from typing import Iterator
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.config import Config
 
@@ -12,12 +14,58 @@ config = Config.get_config()
 
 DATABASE_URL = config.DATABASE_URL
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True, future=True)
+# Pools (all optional, see docs/sample.env):
+#   <PREFIX>POOL_SIZE / <PREFIX>MAX_OVERFLOW per engine, prefixes DB_ (web
+#   requests), JOBS_DB_ (scheduled jobs) and SCHED_DB_ (the job store);
+#   DB_POOL_TIMEOUT seconds to wait for a connection before failing;
+#   DB_POOL_RECYCLE seconds before a connection is replaced, which is what keeps
+#   them fresh instead of a pre-ping round trip on every checkout
+#   (DB_POOL_PRE_PING=1 turns that back on);
+#   DB_PGBOUNCER=1 when connecting through PgBouncer in transaction mode: no
+#   pooling here and no server-side prepared statements.
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "0") == "1"
+PGBOUNCER = os.getenv("DB_PGBOUNCER", "0") == "1"
+
+
+def engine_options(url: str, prefix: str, pool_size: int, max_overflow: int) -> dict:
+    """create_engine() keyword arguments for the pool named by `prefix`"""
+    backend = make_url(url)
+    options: dict = {"future": True, "pool_pre_ping": POOL_PRE_PING}
+    if PGBOUNCER:
+        options["poolclass"] = NullPool
+        if backend.get_driver_name() == "psycopg":
+            # psycopg prepares statements it has seen a few times, and
+            # PgBouncer may hand the next one to a different server connection
+            options["connect_args"] = {"prepare_threshold": None}
+        return options
+    if backend.get_backend_name() == "sqlite":
+        return options
+    options.update(
+        pool_size=int(os.getenv(f"{prefix}POOL_SIZE", str(pool_size))),
+        max_overflow=int(os.getenv(f"{prefix}MAX_OVERFLOW", str(max_overflow))),
+        pool_timeout=POOL_TIMEOUT,
+        pool_recycle=POOL_RECYCLE,
+    )
+    return options
+
+
+# Web requests: sync handlers run on the anyio thread pool (40 threads)
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL, "DB_", 10, 20))
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
+# Scheduled jobs: one connection per executor thread (jobs.scheduler runs 16),
+# so a busy game day doesn't starve the web pool or the other way round
+jobs_engine = create_engine(
+    DATABASE_URL, **engine_options(DATABASE_URL, "JOBS_DB_", 16, 4)
+)
+
 # APScheduler job store engine (defaults to main DB unless SCHED_DB_URL is set)
 SCHED_DB_URL = os.getenv("SCHED_DB_URL", DATABASE_URL)
-scheduler_engine = create_engine(SCHED_DB_URL, pool_pre_ping=True, future=True)
+scheduler_engine = create_engine(
+    SCHED_DB_URL, **engine_options(SCHED_DB_URL, "SCHED_DB_", 2, 2)
+)
 
 
 @contextmanager
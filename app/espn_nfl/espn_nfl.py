@@ -8,6 +8,7 @@ app/main.py's lifespan context manager before this module is imported and used.
 
 from __future__ import annotations
 
+import os
 import time
 from dataclasses import dataclass
 from typing import Optional, Any, List
@@ -15,6 +16,18 @@ from dateutil import parser
 import httpx
 import sentry_sdk
 
+from app.metrics import record_espn_call
+from app.metrics.prometheus import (
+    count_espn_cache,
+    count_espn_retry,
+    observe_espn_request,
+)
+
+# Overridable so the job pipeline can run against a local stand-in
+# (see benchmarks/espn_standin.py)
+ESPN_SITE_API_HOST = "https://site.api.espn.com"
+ESPN_CORE_API_HOST = "https://sports.core.api.espn.com"
+
 
 def _http_get_with_retry(url: str, **kwargs) -> httpx.Response:
     """
@@ -34,7 +47,15 @@ def _http_get_with_retry(url: str, **kwargs) -> httpx.Response:
 
     for attempt in range(max_retries + 1):  # includes first try
         try:
-            response = httpx.get(url, **kwargs)
+            started = time.perf_counter()
+            status: int | str = "error"
+            try:
+                response = httpx.get(url, **kwargs)
+                status = response.status_code
+            finally:
+                elapsed = time.perf_counter() - started
+                record_espn_call(elapsed)
+                observe_espn_request(status, elapsed)
             if response.status_code in (501, 502, 503):
                 raise httpx.HTTPStatusError(
                     f"Transient error {response.status_code} from {url}",
@@ -46,6 +67,7 @@ def _http_get_with_retry(url: str, **kwargs) -> httpx.Response:
             sentry_sdk.logger.warning(f"Retry attempt {attempt + 1}/{max_retries}")
             if attempt == max_retries:
                 raise
+            count_espn_retry()
             time.sleep(delay)
             delay *= 2  # exponential backoff
     raise RuntimeError("Unexpected fallthrough in _http_get_with_retry")
@@ -94,13 +116,11 @@ class ESPNNfl:
         self._season = None
         self._season_type = season_type
         self._week_no = week_no
-        self._base_url = "https://site.api.espn.com/apis/v2/sports/football/nfl/"
-        self._base_site_url = (
-            "https://site.api.espn.com/apis/site/v2/sports/football/nfl"
-        )
-        self._base_core_api_url = (
-            "https://sports.core.api.espn.com/v2/sports/football/leagues/nfl/"
-        )
+        site_host = os.getenv("ESPN_SITE_API_HOST", ESPN_SITE_API_HOST).rstrip("/")
+        core_host = os.getenv("ESPN_CORE_API_HOST", ESPN_CORE_API_HOST).rstrip("/")
+        self._base_url = site_host + "/apis/v2/sports/football/nfl/"
+        self._base_site_url = site_host + "/apis/site/v2/sports/football/nfl"
+        self._base_core_api_url = core_host + "/v2/sports/football/leagues/nfl/"
 
     @property
     # Note, this cache only survives as long as the object is instantiated.
@@ -108,6 +128,7 @@ class ESPNNfl:
     #  object is GC'd
     def _current_season_week_data(self) -> dict:
         """save the info for the current season, season_type and week"""
+        count_espn_cache("scoreboard", hit=bool(self._current_week_source_data))
         if self._current_week_source_data:
             return self._current_week_source_data
         url_to_query = self._base_site_url + "/scoreboard"
@@ -175,6 +196,7 @@ class ESPNNfl:
         Returns:
             a list of all ESPNNflGames in the JSON structure
         """
+        count_espn_cache("games", hit=bool(self._games))
         if self._games:
             return self._games
         if not self._games_source_data:
@@ -191,6 +213,7 @@ class ESPNNfl:
         Returns:
             a list of all TgfpNflTeams
         """
+        count_espn_cache("teams", hit=bool(self._teams))
         if self._teams:
             return self._teams
         if not self._teams_source_data:
@@ -212,6 +235,7 @@ class ESPNNfl:
         Returns:
             a list of all ESPNNflGames in the JSON structure
         """
+        count_espn_cache("standings", hit=bool(self._standings_source_data))
         if self._standings:
             return self._standings
         if not self._standings_source_data:
@@ -306,6 +330,23 @@ class ESPNNflGame:
             return_odds = ESPNNflOdd(data_source=self._data_source, odd_data=first_odd)
         return return_odds
 
+    def line(self) -> Optional[tuple[Optional[str], float]]:
+        """
+        The favored team's short name and the spread, read from the odds
+        alone (unlike favored_team / spread, this never fetches the teams).
+        A pick 'em is (None, 0.5): the home team at half a point, as
+        favored_team and spread have it.
+        Returns:
+            None when there are no odds yet
+        """
+        odds = self._odds()
+        if odds is None:
+            return None
+        favored_team_short_name = odds.favored_team_short_name
+        if favored_team_short_name is None:
+            return None, 0.5
+        return favored_team_short_name, odds.favored_team_spread
+
     @property
     def favored_team(self) -> Optional[ESPNNflTeam]:
         if self._favored_team:
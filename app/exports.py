@@ -0,0 +1,431 @@
+"""
+Season exports of picks, games, line history, awards and weekly results, as
+CSV or Parquet.
+
+Rows are read with ``yield_per`` (a server-side cursor on PostgreSQL) and
+written out one batch at a time, so an export of every season ever holds one
+batch in memory, not the history.  Parquet needs ``pyarrow``, which isn't a
+requirement of the app: without it only CSV is offered.
+
+The admin route streams an export as the response (``/admin/export/picks.csv``,
+with an API key) and ``python -m exports`` (run from the app dir) writes one
+to a file::
+
+    python -m exports picks --season 2025 --format parquet -o picks-2025.parquet
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select
+
+from models import Award, Game, GameLine, Player, PlayerAward, PlayerGamePick, Team
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - CSV alone still works
+    pa = None
+    pq = None
+
+BATCH_SIZE = 5_000
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class ExportError(ValueError):
+    """An unknown dataset or format, or Parquet without pyarrow"""
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    kind: type
+
+
+@dataclass(frozen=True)
+class Dataset:
+    columns: tuple[Column, ...]
+    query: Callable[[Optional[int]], sa.Select]
+
+
+def _game_won(picked_team_id) -> sa.ColumnElement:
+    """True when the pick won, false when it lost, NULL until the game is final"""
+    final = Game.game_status == "STATUS_FINAL"
+    home_won = Game.home_team_score > Game.road_team_score
+    road_won = Game.road_team_score > Game.home_team_score
+    return sa.case(
+        (
+            sa.and_(final, home_won),
+            picked_team_id == Game.home_team_id,
+        ),
+        (
+            sa.and_(final, road_won),
+            picked_team_id == Game.road_team_id,
+        ),
+        else_=sa.null(),
+    )
+
+
+def _picks_query(season: Optional[int]) -> sa.Select:
+    picked = aliased(Team)
+    statement = (
+        select(
+            PlayerGamePick.id,
+            PlayerGamePick.season,
+            PlayerGamePick.season_type,
+            PlayerGamePick.week_no,
+            PlayerGamePick.player_id,
+            Player.nick_name,
+            PlayerGamePick.game_id,
+            picked.short_name,
+            PlayerGamePick.is_lock,
+            PlayerGamePick.is_upset,
+            _game_won(PlayerGamePick.picked_team_id),
+            PlayerGamePick.created_at,
+        )
+        .join(Player, Player.id == PlayerGamePick.player_id)
+        .join(Game, Game.id == PlayerGamePick.game_id)
+        .join(picked, picked.id == PlayerGamePick.picked_team_id)
+        .order_by(PlayerGamePick.id)
+    )
+    if season is not None:
+        statement = statement.where(PlayerGamePick.season == season)
+    return statement
+
+
+def _games_query(season: Optional[int]) -> sa.Select:
+    home = aliased(Team)
+    road = aliased(Team)
+    favorite = aliased(Team)
+    statement = (
+        select(
+            Game.id,
+            Game.season,
+            Game.season_type,
+            Game.week_no,
+            Game.start_time,
+            road.short_name,
+            home.short_name,
+            favorite.short_name,
+            Game.spread,
+            Game.road_team_score,
+            Game.home_team_score,
+            Game.game_status,
+            Game.tgfp_nfl_game_id,
+        )
+        .join(home, home.id == Game.home_team_id)
+        .join(road, road.id == Game.road_team_id)
+        .join(favorite, favorite.id == Game.favorite_team_id)
+        .order_by(Game.id)
+    )
+    if season is not None:
+        statement = statement.where(Game.season == season)
+    return statement
+
+
+def _game_lines_query(season: Optional[int]) -> sa.Select:
+    favorite = aliased(Team)
+    statement = (
+        select(
+            GameLine.game_id,
+            Game.season,
+            Game.season_type,
+            Game.week_no,
+            GameLine.bucket,
+            favorite.short_name,
+            GameLine.spread,
+        )
+        .join(Game, Game.id == GameLine.game_id)
+        .join(favorite, favorite.id == GameLine.favorite_team_id)
+        .order_by(GameLine.game_id, GameLine.bucket)
+    )
+    if season is not None:
+        statement = statement.where(Game.season == season)
+    return statement
+
+
+def _awards_query(season: Optional[int]) -> sa.Select:
+    statement = (
+        select(
+            PlayerAward.id,
+            PlayerAward.season,
+            PlayerAward.season_type,
+            PlayerAward.week_no,
+            PlayerAward.player_id,
+            Player.nick_name,
+            Award.slug,
+            Award.point_value,
+            PlayerAward.game_id,
+        )
+        .join(Player, Player.id == PlayerAward.player_id)
+        .join(Award, Award.id == PlayerAward.award_id)
+        .order_by(PlayerAward.id)
+    )
+    if season is not None:
+        statement = statement.where(PlayerAward.season == season)
+    return statement
+
+
+def _weekly_results_query(season: Optional[int]) -> sa.Select:
+    """Each player's week, scored like PlayerGamePick.bonus_points"""
+    won = _game_won(PlayerGamePick.picked_team_id)
+
+    def count(condition) -> sa.ColumnElement:
+        return sa.func.sum(sa.case((condition, 1), else_=0))
+
+    wins = count(won.is_(True))
+    losses = count(won.is_(False))
+    bonus = (
+        count(sa.and_(won.is_(True), PlayerGamePick.is_lock))
+        + count(sa.and_(won.is_(True), PlayerGamePick.is_upset))
+        - count(sa.and_(won.is_(False), PlayerGamePick.is_lock))
+    )
+    statement = (
+        select(
+            PlayerGamePick.season,
+            PlayerGamePick.season_type,
+            PlayerGamePick.week_no,
+            PlayerGamePick.player_id,
+            Player.nick_name,
+            sa.func.count(),
+            wins,
+            losses,
+            bonus,
+            wins + bonus,
+        )
+        .join(Player, Player.id == PlayerGamePick.player_id)
+        .join(Game, Game.id == PlayerGamePick.game_id)
+        .group_by(
+            PlayerGamePick.season,
+            PlayerGamePick.season_type,
+            PlayerGamePick.week_no,
+            PlayerGamePick.player_id,
+            Player.nick_name,
+        )
+        .order_by(
+            PlayerGamePick.season,
+            PlayerGamePick.season_type,
+            PlayerGamePick.week_no,
+            PlayerGamePick.player_id,
+        )
+    )
+    if season is not None:
+        statement = statement.where(PlayerGamePick.season == season)
+    return statement
+
+
+DATASETS: dict[str, Dataset] = {
+    "picks": Dataset(
+        columns=(
+            Column("id", int),
+            Column("season", int),
+            Column("season_type", int),
+            Column("week_no", int),
+            Column("player_id", int),
+            Column("nick_name", str),
+            Column("game_id", int),
+            Column("picked_team", str),
+            Column("is_lock", bool),
+            Column("is_upset", bool),
+            Column("won", bool),
+            Column("created_at", datetime),
+        ),
+        query=_picks_query,
+    ),
+    "games": Dataset(
+        columns=(
+            Column("id", int),
+            Column("season", int),
+            Column("season_type", int),
+            Column("week_no", int),
+            Column("start_time", datetime),
+            Column("road_team", str),
+            Column("home_team", str),
+            Column("favorite_team", str),
+            Column("spread", float),
+            Column("road_team_score", int),
+            Column("home_team_score", int),
+            Column("game_status", str),
+            Column("tgfp_nfl_game_id", str),
+        ),
+        query=_games_query,
+    ),
+    "game_lines": Dataset(
+        columns=(
+            Column("game_id", int),
+            Column("season", int),
+            Column("season_type", int),
+            Column("week_no", int),
+            Column("bucket", datetime),
+            Column("favorite_team", str),
+            Column("spread", float),
+        ),
+        query=_game_lines_query,
+    ),
+    "awards": Dataset(
+        columns=(
+            Column("id", int),
+            Column("season", int),
+            Column("season_type", int),
+            Column("week_no", int),
+            Column("player_id", int),
+            Column("nick_name", str),
+            Column("award", str),
+            Column("point_value", int),
+            Column("game_id", int),
+        ),
+        query=_awards_query,
+    ),
+    "weekly_results": Dataset(
+        columns=(
+            Column("season", int),
+            Column("season_type", int),
+            Column("week_no", int),
+            Column("player_id", int),
+            Column("nick_name", str),
+            Column("picks", int),
+            Column("wins", int),
+            Column("losses", int),
+            Column("bonus", int),
+            Column("points", int),
+        ),
+        query=_weekly_results_query,
+    ),
+}
+
+
+def formats() -> list[str]:
+    return ["csv", "parquet"] if pa is not None else ["csv"]
+
+
+def batches(
+    session: Session, dataset: Dataset, season: Optional[int] = None
+) -> Iterator[list[tuple]]:
+    """The dataset's rows, `BATCH_SIZE` at a time"""
+    statement = dataset.query(season).execution_options(yield_per=BATCH_SIZE)
+    for partition in session.execute(statement).partitions():
+        yield [tuple(row) for row in partition]
+
+
+def csv_chunks(
+    columns: tuple[Column, ...], rows: Iterable[list[tuple]]
+) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.name for column in columns])
+    for batch in rows:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _Sink:
+    """A write-only file for ParquetWriter that hands the bytes back as written"""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # ParquetWriter keeps footer offsets from this, so never reset it
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_schema(columns: tuple[Column, ...]):
+    types = {
+        int: pa.int64(),
+        float: pa.float64(),
+        bool: pa.bool_(),
+        str: pa.string(),
+        datetime: pa.timestamp("us"),
+    }
+    return pa.schema([(column.name, types[column.kind]) for column in columns])
+
+
+def parquet_chunks(
+    columns: tuple[Column, ...], rows: Iterable[list[tuple]]
+) -> Iterator[bytes]:
+    """One Parquet row group per batch"""
+    if pa is None:
+        raise ExportError("parquet exports need pyarrow")
+    schema = _arrow_schema(columns)
+    sink = _Sink()
+    with pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema) as writer:
+        for batch in rows:
+            arrays = [
+                pa.array([row[i] for row in batch], type=field.type)
+                for i, field in enumerate(schema)
+            ]
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def export(
+    session: Session, name: str, fmt: str = "csv", season: Optional[int] = None
+) -> Iterator[bytes]:
+    """The export as a stream of bytes; checks `name` and `fmt` up front"""
+    dataset = DATASETS.get(name)
+    if dataset is None:
+        raise ExportError(f"unknown dataset {name!r}, one of {', '.join(DATASETS)}")
+    if fmt not in formats():
+        raise ExportError(f"unknown format {fmt!r}, one of {', '.join(formats())}")
+    writer = csv_chunks if fmt == "csv" else parquet_chunks
+    return writer(dataset.columns, batches(session, dataset, season))
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    # pylint: disable=import-outside-toplevel
+    from db import jobs_engine
+
+    parser = argparse.ArgumentParser(description="Export picks, games and awards")
+    parser.add_argument("dataset", choices=list(DATASETS))
+    parser.add_argument("--season", type=int, help="one season (default: all)")
+    parser.add_argument("--format", choices=formats(), default="csv")
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    output = (
+        open(args.output, "wb")
+        if args.output
+        else contextlib.nullcontext(sys.stdout.buffer)
+    )
+    with Session(jobs_engine) as session, output as file:
+        for chunk in export(session, args.dataset, args.format, args.season):
+            file.write(chunk)
+
+
+if __name__ == "__main__":
+    main()
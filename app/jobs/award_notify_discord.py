@@ -1,10 +1,12 @@
 import datetime
+import time
 
 from discord_webhook import DiscordWebhook, DiscordEmbed
 from sqlmodel import Session
 
 from models import PlayerAward
 from config import Config
+from app.metrics.prometheus import AWARD_NOTIFY_LATENCY
 
 config = Config.get_config()
 
@@ -39,5 +41,7 @@ def send_award_notification(session: Session):
         award_embed = get_award_embed(player_award)
         webhook = DiscordWebhook(url=config.DISCORD_AWARD_BOT_WEBHOOK_URL)
         webhook.add_embed(award_embed)
+        started = time.perf_counter()
         webhook.execute()
+        AWARD_NOTIFY_LATENCY.observe(time.perf_counter() - started)
     session.commit()
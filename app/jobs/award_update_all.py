@@ -8,10 +8,12 @@ app/main.py's lifespan context manager before any jobs are scheduled or executed
 import sentry_sdk
 from sqlmodel import Session, select
 
-from db import engine
+from db import jobs_engine
 from espn_nfl import ESPNNfl
 from jobs.award_notify_discord import send_award_notification
-from models import Game, PlayerGamePick, AwardSlug, Player
+from models import Game, GamePickStats, PlayerGamePick, AwardSlug, Player
+from models import PlayerProfileStats, PlayerSeasonRecord
+from models import award_rules
 from models.award_helpers import upsert_award_with_args
 from models.model_helpers import WeekInfo
 
@@ -35,12 +37,16 @@ def sync_won_the_week(week_info: WeekInfo, session: Session):
     active_players: list[Player] = Player.active_players(session=session)
     if len(active_players) < 2:
         raise Exception("Too few players")
-    sorted_players = sorted(
-        active_players, key=lambda p: p.wins_for_week(week_info), reverse=True
+    winner = int(
+        award_rules.won_the_week(
+            wins=[p.wins_for_week(week_info) for p in active_players],
+            points=[
+                p.total_points_for_week(week_info=week_info) for p in active_players
+            ],
+        )
     )
-    top_total_points = sorted_players[0].total_points_for_week(week_info=week_info)
-    if top_total_points > sorted_players[1].total_points_for_week(week_info=week_info):
-        player = sorted_players[0]
+    if winner >= 0:
+        player = active_players[winner]
         upsert_award_with_args(
             session=session,
             player_id=player.id,
@@ -49,24 +55,43 @@ def sync_won_the_week(week_info: WeekInfo, session: Session):
         )
 
 
-def sync_in_your_face(week_info: WeekInfo, session: Session):
+def sync_in_your_face(week_info: WeekInfo, session: Session, recounted: bool = False):
     games: list[Game] = Game.games_for_week(week_info=week_info, session=session)
+    pick_stats = GamePickStats.for_week(session, week_info)
     for game in games:
-        statement = select(PlayerGamePick).where(PlayerGamePick.game_id == game.id)
-        picks: list[PlayerGamePick] = list(session.exec(statement).all())
-        winners: list[Player] = []
-        for pick in picks:
-            if pick.is_win:
-                winners.append(pick.player)
-        if len(winners) == 1:
-            player: Player = winners[0]
-            upsert_award_with_args(
-                session=session,
-                player_id=player.id,
-                slug=AwardSlug.IN_YOUR_FACE,
-                week_info=week_info,
-                game_id=game.id,
+        stats = pick_stats.get(game.id)
+        winning_team_id = game.winning_team_id
+        # award_rules.in_your_face, from the counts: only the lone pick on the
+        # winner has to be loaded
+        if stats is None or winning_team_id is None:
+            continue
+        if stats.picks_for(game, winning_team_id) != 1:
+            continue
+        statement = (
+            select(PlayerGamePick.player_id)
+            .where(PlayerGamePick.game_id == game.id)
+            .where(PlayerGamePick.picked_team_id == winning_team_id)
+        )
+        player_ids = session.exec(statement).all()
+        if len(player_ids) != 1:
+            if recounted:
+                continue
+            # the counts drifted from the picks (a pick fixed or deleted by
+            # hand): recount the week and start over
+            sentry_sdk.logger.warning(
+                f"Pick counts for game {game.id} don't match its picks, "
+                f"recounting week {week_info.cache_key}"
             )
+            GamePickStats.rebuild(session, week_info)
+            sync_in_your_face(week_info, session, recounted=True)
+            return
+        upsert_award_with_args(
+            session=session,
+            player_id=player_ids[0],
+            slug=AwardSlug.IN_YOUR_FACE,
+            week_info=week_info,
+            game_id=game.id,
+        )
 
 
 def sync_perfect_week(week_info: WeekInfo, session: Session):
@@ -77,7 +102,7 @@ def sync_perfect_week(week_info: WeekInfo, session: Session):
     for player in active_players:
         losses: int = player.losses_for_week(week_info=week_info)
         wins: int = player.wins_for_week(week_info=week_info)
-        if losses == 0 and wins > 0:
+        if award_rules.perfect_week(wins=wins, losses=losses):
             upsert_award_with_args(
                 session=session,
                 player_id=player.id,
@@ -100,11 +125,20 @@ def sync_quick_pick(week_info: WeekInfo, session: Session):
 
 
 def update_all_awards():
-    with Session(engine) as session:
-        week_infos: list[WeekInfo] = Game.get_distinct_week_infos(session=session)
+    with Session(jobs_engine) as session:
+        # an archived season's awards are as final as its records
+        archived = set(PlayerSeasonRecord.archived_seasons(session=session))
+        week_infos: list[WeekInfo] = [
+            week_info
+            for week_info in Game.get_distinct_week_infos(session=session)
+            if week_info.season not in archived
+        ]
         for week_info in week_infos:
             sync_perfect_week(week_info=week_info, session=session)
             sync_in_your_face(week_info=week_info, session=session)
             sync_quick_pick(week_info=week_info, session=session)
             sync_won_the_week(week_info=week_info, session=session)
+        # after the awards, so a newly final week is recorded with its awards
+        PlayerProfileStats.refresh(session)
+        session.commit()
         send_award_notification(session=session)
@@ -4,14 +4,18 @@ Creates the weekly picks page by fetching games from ESPN and storing them in th
 Note: This module uses sentry_sdk.logger for logging. Sentry SDK is initialized in
 app/main.py's lifespan context manager before any jobs are scheduled or executed.
 """
-from typing import List
+from typing import Dict, List
 
 import sentry_sdk
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlmodel import Session, select
 
-from db import engine
-from models import Game, Team
+from db import jobs_engine
+from models import Game, PlayerGamePick, Team
 from models.model_helpers import WeekInfo
+from models.partitions import ensure_season_partitions
+from models.picks_page import picks_page_cache
 from espn_nfl import ESPNNfl, ESPNNflGame
 
 
@@ -26,34 +30,83 @@ class CreatePicksException(Exception):
         return f"Exception: {self.msg}"
 
 
-def _game_from_nfl_game(session: Session, nfl_game: ESPNNflGame) -> Game:
-    road_team: Team = session.exec(
-        select(Team).where(Team.tgfp_nfl_team_id == nfl_game.away_team.id)
-    ).one()
-    home_team: Team = session.exec(
-        select(Team).where(Team.tgfp_nfl_team_id == nfl_game.home_team.id)
-    ).one()
-    if nfl_game.favored_team:
-        fav_team: Team = session.exec(
-            select(Team).where(Team.tgfp_nfl_team_id == nfl_game.favored_team.id)
-        ).one()
-    else:
-        fav_team = home_team
-    game = Game(
-        favorite_team_id=fav_team.id,
-        home_team_id=home_team.id,
-        road_team_id=road_team.id,
-        game_status=nfl_game.game_status_type,
-        home_team_score=0,
-        road_team_score=0,
-        spread=nfl_game.spread,
-        start_time=nfl_game.start_time,
-        week_no=nfl_game.week_no,
-        season_type=nfl_game.season_type,
-        tgfp_nfl_game_id=nfl_game.id,
-        season=nfl_game.season,
+def _team_ids_by_nfl_id(session: Session) -> Dict[str, int]:
+    """ESPN team id → our team id, for every team in one query"""
+    return dict(session.exec(select(Team.tgfp_nfl_team_id, Team.id)).all())
+
+
+def _game_row(team_ids: Dict[str, int], nfl_game: ESPNNflGame) -> dict:
+    try:
+        road_team_id = team_ids[nfl_game.away_team.id]
+        home_team_id = team_ids[nfl_game.home_team.id]
+        fav_team_id = (
+            team_ids[nfl_game.favored_team.id] if nfl_game.favored_team else home_team_id
+        )
+    except KeyError as exc:
+        raise CreatePicksException(f"Unknown team {exc} in {nfl_game}") from exc
+    return {
+        "favorite_team_id": fav_team_id,
+        "home_team_id": home_team_id,
+        "road_team_id": road_team_id,
+        "game_status": nfl_game.game_status_type,
+        "home_team_score": 0,
+        "road_team_score": 0,
+        "spread": nfl_game.spread,
+        "start_time": nfl_game.start_time,
+        "week_no": nfl_game.week_no,
+        "season_type": nfl_game.season_type,
+        "tgfp_nfl_game_id": nfl_game.id,
+        "season": nfl_game.season,
+    }
+
+
+def _picked_game_ids(session: Session, rows: List[dict]) -> List[int]:
+    """The ids of the games in `rows` that already have picks"""
+    statement = (
+        select(PlayerGamePick.game_id)
+        .join(Game, Game.id == PlayerGamePick.game_id)
+        .where(PlayerGamePick.season.in_({row["season"] for row in rows}))
+        .where(Game.tgfp_nfl_game_id.in_([row["tgfp_nfl_game_id"] for row in rows]))
+        .distinct()
+    )
+    return list(session.exec(statement).all())
+
+
+def upsert_games(session: Session, rows: List[dict]):
+    """
+    Insert the week's games in one statement.  Games that already exist (a
+    rerun) keep their status and scores, which are update_game's, and until
+    kickoff take the current line and start time: the spread, the favorite
+    and the start time of a game that has started are never rewritten (as in
+    refresh_lines).  Like refresh_lines, a game with picks keeps its favorite,
+    and its spread with it, when ESPN now favors the other team.
+    """
+    if not rows:
+        return
+    dialect = postgresql if session.bind.dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(Game).values(rows)
+    # picks_form stores is_upset against the favorite at the time of the pick
+    frozen = sa.and_(
+        Game.id.in_(_picked_game_ids(session, rows)),
+        Game.favorite_team_id != statement.excluded.favorite_team_id,
+    )
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=["tgfp_nfl_game_id"],
+            set_={
+                "spread": sa.case(
+                    (frozen, Game.spread), else_=statement.excluded.spread
+                ),
+                "favorite_team_id": sa.case(
+                    (frozen, Game.favorite_team_id),
+                    else_=statement.excluded.favorite_team_id,
+                ),
+                "start_time": statement.excluded.start_time,
+                "updated_at": sa.func.now(),
+            },
+            where=Game.game_status == "STATUS_SCHEDULED",
+        )
     )
-    return game
 
 
 def create_the_picks(week_info: WeekInfo):
@@ -69,7 +122,7 @@ def create_the_picks(week_info: WeekInfo):
     sentry_sdk.logger.info(
         f"Creating weekly picks page for {week_info.season_type_name} week {week_info.week_no}"
     )
-    with Session(engine) as session:
+    with Session(jobs_engine) as session:
         nfl: ESPNNfl = ESPNNfl(
             week_no=week_info.week_no, season_type=week_info.season_type
         )
@@ -77,12 +130,18 @@ def create_the_picks(week_info: WeekInfo):
         if not nfl_games:
             sentry_sdk.logger.error("No nfl_games found")
             raise CreatePicksException("There should have been games!!!")
+        # before anybody can pick (or win an award in) the new season
+        for partition in ensure_season_partitions(session, week_info.season):
+            sentry_sdk.logger.info(f"Created partition {partition}")
+        team_ids = _team_ids_by_nfl_id(session)
+        rows: List[dict] = []
         nfl_game: ESPNNflGame
         for nfl_game in nfl_games:
             sentry_sdk.logger.debug(
                 f"Creating pick for nfl_game: {nfl_game}",
                 nfl_game=nfl_game.extra_info,  # type: ignore[arg-type]
             )
-            tgfp_game = _game_from_nfl_game(nfl_game=nfl_game, session=session)
-            session.add(tgfp_game)
+            rows.append(_game_row(team_ids, nfl_game))
+        upsert_games(session, rows)
         session.commit()
+    picks_page_cache.invalidate(week_info)
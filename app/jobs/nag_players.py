@@ -14,7 +14,7 @@ import arrow
 from discord_webhook import DiscordWebhook
 from sqlmodel import Session
 
-from db import engine
+from db import jobs_engine
 from models import Game, Player
 from config import Config
 from models.model_helpers import WeekInfo, current_week_info
@@ -62,7 +62,7 @@ def nag_the_players():
     config: Config = Config.get_config()
     nag_payload = None
     week_info: WeekInfo = current_week_info()
-    with Session(engine) as session:
+    with Session(jobs_engine) as session:
         nag_payload = get_nag_payload(session=session, week_info=week_info)
     if nag_payload:
         webhook = DiscordWebhook(
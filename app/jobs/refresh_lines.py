@@ -0,0 +1,121 @@
+"""
+Keep the week's spreads current until kickoff.
+
+The spreads come from ESPN when the picks page is created on Wednesday, and
+the odds keep moving after that.  This job reads the whole week from one
+scoreboard fetch and, for each game that hasn't kicked off, compares ESPN's
+line with the game's and with its GameLine history: only what moved is
+written, so a quiet run costs the fetch and four SELECTs.
+
+picks_form stores ``is_upset`` against the favorite at the time of the pick,
+so once a game has picks its favorite is frozen: the spread keeps moving while
+ESPN has the same favorite, and a flip is only recorded in the history.
+
+Note: This module uses sentry_sdk.logger for logging. Sentry SDK is initialized in
+app/main.py's lifespan context manager before any jobs are scheduled or executed.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Set
+
+import sentry_sdk
+from sqlmodel import Session, select
+
+from db import jobs_engine
+from espn_nfl import ESPNNfl, ESPNNflGame
+from models import Game, GameLine, PlayerGamePick, Team
+from models.model_helpers import WeekInfo
+from models.picks_page import picks_page_cache
+
+
+def _team_ids_by_short_name(session: Session) -> Dict[str, int]:
+    return dict(session.exec(select(Team.short_name, Team.id)).all())
+
+
+def _picked_game_ids(session: Session, week_info: WeekInfo) -> Set[int]:
+    statement = (
+        select(PlayerGamePick.game_id)
+        .where(PlayerGamePick.season == week_info.season)
+        .where(PlayerGamePick.season_type == week_info.season_type)
+        .where(PlayerGamePick.week_no == week_info.week_no)
+        .distinct()
+    )
+    return set(session.exec(statement).all())
+
+
+def refresh_lines(session: Session, week_info: WeekInfo) -> List[Game]:
+    """
+    Update the lines of the week's games that haven't kicked off; returns
+    the games whose line moved.  Doesn't commit.
+    """
+    now = datetime.now(timezone.utc)
+    games: Dict[str, Game] = {
+        game.tgfp_nfl_game_id: game
+        for game in Game.games_for_week(session=session, week_info=week_info)
+        if game.is_pregame and game.utc_start_time > now
+    }
+    if not games:
+        return []
+    nfl = ESPNNfl(week_no=week_info.week_no, season_type=week_info.season_type)
+    team_ids = _team_ids_by_short_name(session)
+    game_ids = [game.id for game in games.values()]
+    recorded = GameLine.latest_lines(session, game_ids)
+    picked = _picked_game_ids(session, week_info)
+
+    moved: List[Game] = []
+    lines: List[dict] = []
+    nfl_game: ESPNNflGame
+    for nfl_game in nfl.games():
+        game = games.get(nfl_game.id)
+        if game is None or not nfl_game.is_pregame:
+            continue
+        line = nfl_game.line()
+        if line is None:
+            continue
+        favored_short_name, spread = line
+        favorite_team_id = (
+            team_ids.get(favored_short_name)
+            if favored_short_name
+            else game.home_team_id
+        )
+        if favorite_team_id is None:
+            sentry_sdk.logger.warning(
+                f"Unknown favorite {favored_short_name} for game {game.id}"
+            )
+            continue
+        flipped = favorite_team_id != game.favorite_team_id
+        if flipped and game.id in picked:
+            sentry_sdk.logger.info(
+                f"Not moving the favorite of game {game.id}, it has picks"
+            )
+        elif (favorite_team_id, spread) != (game.favorite_team_id, game.spread):
+            game.favorite_team_id = favorite_team_id
+            game.spread = spread
+            session.add(game)
+            moved.append(game)
+        if recorded.get(game.id) != (favorite_team_id, spread):
+            lines.append(
+                {
+                    "game_id": game.id,
+                    "favorite_team_id": favorite_team_id,
+                    "spread": spread,
+                }
+            )
+    GameLine.append(session, lines, now)
+    return moved
+
+
+def refresh_the_lines(week_info: WeekInfo):
+    """Refreshes the week's spreads"""
+    if week_info.is_skip_week:
+        return
+    with Session(jobs_engine) as session:
+        moved = refresh_lines(session, week_info)
+        session.commit()
+    if moved:
+        sentry_sdk.logger.info(
+            f"Lines moved for {len(moved)} games in {week_info.season_type_name} "
+            f"week {week_info.week_no}"
+        )
+        # the picks page shows the spreads
+        picks_page_cache.invalidate(week_info)
@@ -15,7 +15,7 @@ from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.interval import IntervalTrigger
-from db import scheduler_engine, engine
+from db import scheduler_engine, jobs_engine
 
 jobstores = {"default": SQLAlchemyJobStore(engine=scheduler_engine)}
 executors = {"default": ThreadPoolExecutor(16)}
@@ -30,7 +30,7 @@ config: Config = Config.get_config()
 
 def schedule_nag_players(week_info: WeekInfo):
     """Creates the flows for nagging players"""
-    with Session(engine) as session:
+    with Session(jobs_engine) as session:
         first_game: Game = Game.get_first_game_of_the_week(
             session=session, week_info=week_info
         )
@@ -55,7 +55,7 @@ def schedule_nag_players(week_info: WeekInfo):
 
 def schedule_update_games(week_info: WeekInfo):
     """Creates the flows for updating games"""
-    with Session(engine) as session:
+    with Session(jobs_engine) as session:
         this_weeks_games: List[Game] = Game.games_for_week(
             session=session, week_info=week_info
         )
@@ -117,6 +117,18 @@ def schedule_create_picks(week_info: WeekInfo):
     )
 
 
+def schedule_refresh_lines(week_info: WeekInfo):
+    """The spreads move until kickoff; the job no-ops once every game has started"""
+    trigger = IntervalTrigger(minutes=30, jitter=60)
+    job_scheduler.add_job(
+        "app.jobs.refresh_lines:refresh_the_lines",
+        trigger=trigger,
+        id="refresh_lines",
+        args=[week_info],
+        replace_existing=True,
+    )
+
+
 def schedule_sync_team_records():
     pacific = timezone("America/Los_Angeles")
     trigger = CronTrigger(day_of_week="tue", hour=4, minute=0, timezone=pacific)
@@ -147,6 +159,7 @@ def schedule_jobs(week_info: WeekInfo):
     schedule_nag_players(week_info=week_info)
     schedule_update_games(week_info=week_info)
     schedule_create_picks(week_info=week_info)
+    schedule_refresh_lines(week_info=week_info)
     schedule_sync_team_records()
     schedule_award_updates()
 
@@ -1,16 +1,106 @@
-from sqlmodel import Session
+"""
+Copy each team's wins / losses / ties from the ESPN standings.
+
+One pass over ``ESPNNfl.teams()`` (the teams and standings fetches) builds the
+records by ESPN team id; the teams whose record changed are then updated in a
+single ``UPDATE ... FROM (VALUES ...)``, and the changes are logged.
+
+Note: This module uses sentry_sdk.logger for logging. Sentry SDK is initialized in
+app/main.py's lifespan context manager before any jobs are scheduled or executed.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import sentry_sdk
+import sqlalchemy as sa
+from sqlmodel import Session, select
+
+from db import jobs_engine
+from espn_nfl import ESPNNfl
 from models import Team
-from app.db import engine
-from espn_nfl import ESPNNfl, ESPNNflTeam
-
-
-def sync_the_team_records():
-    nfl: ESPNNfl = ESPNNfl()
-    with Session(engine) as session:
-        teams = Team.all_teams(session)
-        for team in teams:
-            nfl_team: ESPNNflTeam = nfl.find_teams(team_id=team.tgfp_nfl_team_id)[0]
-            team.wins = nfl_team.wins
-            team.losses = nfl_team.losses
-            team.ties = nfl_team.ties
+from models.picks_page import picks_page_cache
+
+Record = Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class TeamRecordChange:
+    team_id: int
+    short_name: str
+    before: Record
+    after: Record
+
+    def __str__(self):
+        before, after = ("-".join(map(str, r)) for r in (self.before, self.after))
+        return f"{self.short_name} {before} → {after}"
+
+
+def _records_by_nfl_id(nfl: ESPNNfl) -> Dict[str, Record]:
+    return {team.id: (team.wins, team.losses, team.ties) for team in nfl.teams()}
+
+
+def sync_team_records(
+    session: Session, nfl: Optional[ESPNNfl] = None
+) -> List[TeamRecordChange]:
+    """
+    Update the teams whose record changed; returns the changes.  Pass the
+    `nfl` whose teams were already fetched to reuse them.  Doesn't commit.
+    """
+    records = _records_by_nfl_id(nfl or ESPNNfl())
+    changes: List[TeamRecordChange] = []
+    statement = select(
+        Team.id,
+        Team.tgfp_nfl_team_id,
+        Team.short_name,
+        Team.wins,
+        Team.losses,
+        Team.ties,
+    )
+    for team_id, nfl_team_id, short_name, *before in session.exec(statement).all():
+        after = records.get(nfl_team_id)
+        if after is None:
+            sentry_sdk.logger.warning(f"No ESPN standings for team {short_name}")
+            continue
+        if tuple(before) != after:
+            changes.append(TeamRecordChange(team_id, short_name, tuple(before), after))
+    if not changes:
+        return changes
+
+    standings = (
+        sa.values(
+            sa.column("id", sa.Integer),
+            sa.column("wins", sa.Integer),
+            sa.column("losses", sa.Integer),
+            sa.column("ties", sa.Integer),
+            name="standings",
+        ).data([(change.team_id, *change.after) for change in changes])
+        # WITH standings(...) AS (VALUES ...): SQLite can't name the columns
+        # of a VALUES in FROM
+        .cte("standings")
+    )
+    session.execute(
+        sa.update(Team)
+        .where(Team.id == standings.c.id)
+        .values(
+            wins=standings.c.wins,
+            losses=standings.c.losses,
+            ties=standings.c.ties,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return changes
+
+
+def sync_the_team_records(nfl: Optional[ESPNNfl] = None):
+    with Session(jobs_engine) as session:
+        changes = sync_team_records(session, nfl)
         session.commit()
+    if not changes:
+        sentry_sdk.logger.info("Team records unchanged")
+        return
+    sentry_sdk.logger.info(
+        f"Updated {len(changes)} team records: {', '.join(map(str, changes))}"
+    )
+    # the picks page shows each team's record
+    picks_page_cache.invalidate()
@@ -9,11 +9,14 @@ import sentry_sdk
 from apscheduler.jobstores.base import JobLookupError
 from sqlmodel import Session
 
-from db import engine
+from db import jobs_engine
 from .scheduler import job_scheduler, job_id_for_game_id
 from espn_nfl import ESPNNfl
 
 from models import Game
+from app.live import publish_game_update
+from models.picks_page import picks_page_cache
+from models.model_helpers import WeekInfo
 from .update_player_records import update_player_records
 
 
@@ -34,11 +37,32 @@ def _update_one_game(session: Session, game_id: int) -> Game | None:
             f"No game with id {game_id}  Probably because ESPN was not responding"
         )
         return None
+    before = (game.home_team_score, game.road_team_score, game.game_status)
+    was_final = game.is_final
+    was_pregame = game.is_pregame
     game.home_team_score = int(nfl_game.total_home_points)
     game.road_team_score = int(nfl_game.total_away_points)
     game.game_status = nfl_game.game_status_type
     session.add(game)
     session.commit()
+    if was_pregame and not game.is_pregame:
+        # the game can't be picked any more
+        picks_page_cache.refresh(
+            session,
+            WeekInfo(
+                season=game.season, season_type=game.season_type, week_no=game.week_no
+            ),
+        )
+    if before != (game.home_team_score, game.road_team_score, game.game_status):
+        try:
+            publish_game_update(
+                session, game, became_final=game.is_final and not was_final
+            )
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # the browsers catch up on the next change, the job must go on
+            sentry_sdk.logger.warning(
+                f"Couldn't publish the live score for game {game_id}: {exc}"
+            )
     return game
 
 
@@ -49,7 +73,7 @@ def update_a_game(game_id: int):
     @type game_id: int
     :return: The current live status of the game
     """
-    with Session(engine) as session:
+    with Session(jobs_engine) as session:
         game = _update_one_game(session=session, game_id=game_id)
         if game and game.is_final:
             job_id: str = job_id_for_game_id(game_id=game_id)
@@ -1,18 +1,26 @@
 from sqlmodel import Session
 
-from models import Game, Player
-from models.model_helpers import WeekInfo
+from models import Game, Player, PlayerSeasonRecord
 
 
 def update_player_records(session: Session):
-    week_infos: list[WeekInfo] = Game.get_distinct_week_infos(session=session)
+    """
+    Recount the latest season from its picks, and archive any earlier season
+    that isn't yet, so only the season in play is ever rescanned.
+    ``Player.wins`` / ``losses`` / ``bonus`` hold the latest season's record.
+    """
+    season = Game.latest_season(session=session)
+    if season is None:
+        return
+    PlayerSeasonRecord.archive_before(session=session, season=season)
+    records = {
+        record.player_id: record
+        for record in PlayerSeasonRecord.update_season(session=session, season=season)
+    }
     for player in Player.active_players(session=session):
-        player.wins = 0
-        player.losses = 0
-        player.bonus = 0
-        for week_info in week_infos:
-            player.wins += player.wins_for_week(week_info=week_info)
-            player.losses += player.losses_for_week(week_info=week_info)
-            player.bonus += player.bonus_for_week(week_info=week_info)
+        record = records.get(player.id)
+        player.wins = record.wins if record else 0
+        player.losses = record.losses if record else 0
+        player.bonus = record.bonus if record else 0
         session.add(player)
     session.commit()
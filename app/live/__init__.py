@@ -0,0 +1,13 @@
+"""Live score push to the browsers"""
+
+from .broker import ScoreBroker, score_broker, sse_frame
+from .scores import publish_game_update, week_topic, week_totals
+
+__all__ = [
+    "ScoreBroker",
+    "publish_game_update",
+    "score_broker",
+    "sse_frame",
+    "week_topic",
+    "week_totals",
+]
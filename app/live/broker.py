@@ -0,0 +1,86 @@
+"""
+In-process pub/sub for live scores.
+
+The score jobs run on the scheduler's thread pool, the browsers are served from
+the event loop.  ``publish`` can be called from any thread: the event is
+serialized once and handed to the loop, which drops it into every subscriber's
+queue.  A client that falls behind loses its oldest events rather than holding
+up everyone else; each event carries the full state of what it describes, so
+the next one catches it up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from typing import Optional
+
+from app.metrics.prometheus import LIVE_CLIENTS, LIVE_EVENTS
+
+
+def sse_frame(event: str, data: dict) -> str:
+    """A single Server-Sent Events message"""
+    payload = json.dumps(data, separators=(",", ":"))
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+class ScoreBroker:
+    """Fans score events out to every browser watching a week"""
+
+    def __init__(self, queue_size: int = 64):
+        self._queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(self, topic: str) -> asyncio.Queue:
+        """Must be called from the event loop that will read the queue"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._subscribers.setdefault(topic, set()).add(queue)
+        LIVE_CLIENTS.inc()
+        return queue
+
+    def unsubscribe(self, topic: str, queue: asyncio.Queue):
+        with self._lock:
+            queues = self._subscribers.get(topic)
+            if queues is None or queue not in queues:
+                return
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[topic]
+        LIVE_CLIENTS.dec()
+
+    def has_subscribers(self, topic: str) -> bool:
+        with self._lock:
+            return bool(self._subscribers.get(topic))
+
+    def publish(self, topic: str, event: str, data: dict) -> bool:
+        """Thread safe; returns False when nobody is listening"""
+        with self._lock:
+            loop = self._loop
+            listening = bool(self._subscribers.get(topic))
+        if not listening or loop is None or loop.is_closed():
+            return False
+        frame = sse_frame(event, data)
+        try:
+            loop.call_soon_threadsafe(self._deliver, topic, frame)
+        except RuntimeError:
+            # the loop shut down between the check and the call
+            return False
+        return True
+
+    def _deliver(self, topic: str, frame: str):
+        with self._lock:
+            queues = list(self._subscribers.get(topic, ()))
+        LIVE_EVENTS.labels("published").inc()
+        for queue in queues:
+            if queue.full():
+                queue.get_nowait()
+                LIVE_EVENTS.labels("dropped").inc()
+            queue.put_nowait(frame)
+
+
+score_broker = ScoreBroker()
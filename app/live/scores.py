@@ -0,0 +1,59 @@
+"""
+What the score updater tells the browsers.
+
+``score`` events carry one game's scores and status.  When a game goes final
+the week's records change, so a ``totals`` event with every player's
+wins / losses / bonus for the week follows it.
+"""
+
+from __future__ import annotations
+
+from sqlmodel import Session
+
+from models import Game, Player, PlayerGamePick
+from models.model_helpers import WeekInfo
+
+from .broker import score_broker
+
+
+def week_topic(week_info: WeekInfo) -> str:
+    return week_info.cache_key
+
+
+def _game_week_info(game: Game) -> WeekInfo:
+    return WeekInfo(
+        season=game.season, season_type=game.season_type, week_no=game.week_no
+    )
+
+
+def week_totals(session: Session, week_info: WeekInfo) -> dict[str, list[int]]:
+    """{player_id: [wins, losses, bonus]} for everyone with picks this week"""
+    by_player: dict[int, list[PlayerGamePick]] = {}
+    for pick in PlayerGamePick.find_picks_for_week(week_info, session):
+        by_player.setdefault(pick.player_id, []).append(pick)
+    totals = {}
+    for player_id, picks in by_player.items():
+        # pylint: disable=protected-access
+        record = Player._record_from_picks(picks)
+        totals[str(player_id)] = [record["wins"], record["losses"], record["bonus"]]
+    return totals
+
+
+def publish_game_update(session: Session, game: Game, became_final: bool) -> None:
+    """Push `game`'s score to everyone watching its week"""
+    topic = week_topic(_game_week_info(game))
+    if not score_broker.has_subscribers(topic):
+        return
+    score_broker.publish(
+        topic,
+        "score",
+        {
+            "id": game.id,
+            "home": game.home_team_score,
+            "road": game.road_team_score,
+            "status": game.game_status,
+        },
+    )
+    if became_final:
+        totals = week_totals(session, _game_week_info(game))
+        score_broker.publish(topic, "totals", totals)
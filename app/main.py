@@ -12,20 +12,32 @@ import uvicorn
 from fastapi import FastAPI, Request, Depends, HTTPException, status
 import sentry_sdk
 from sentry_sdk.integrations.logging import LoggingIntegration
-from fastapi.templating import Jinja2Templates
-from starlette.staticfiles import StaticFiles
 from starlette.middleware.sessions import SessionMiddleware
-from starlette.responses import HTMLResponse, RedirectResponse
+from starlette.responses import HTMLResponse, RedirectResponse, Response
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+from sqlalchemy import insert
 from sqlmodel import Session, select
-from db import engine
-from models import Player, PlayerGamePick, Team, Game, Award
-from jobs.scheduler import schedule_jobs, job_scheduler
+from db import engine, jobs_engine, scheduler_engine
+from models import Player, PlayerGamePick, Team, Game, Award, GamePickStats
+from models import PlayerProfileStats, PlayerSeasonRecord
+from models import CurrentPlayer, current_player_cache
+from jobs.scheduler import schedule_jobs, job_scheduler, executors
 from models.award_helpers import init_award_table
-from app.routers import auth, mail, admin
+from models.picks_page import PicksPage, picks_page_cache
+from app.projections import projection_cache
+from app.routers import auth, mail, admin, live, api
+from app.metrics import RequestTimingMiddleware, instrument_engine
+from app.metrics.prometheus import (
+    instrument_scheduler,
+    latest_metrics,
+    register_engine_pool,
+)
 from apscheduler.triggers.cron import CronTrigger
 
 from config import Config
+from app.templating import templates, warm_templates
+from app.static_assets import StaticAssets
+from app.compression import CompressionMiddleware
 from models.model_helpers import current_week_info, WeekInfo
 
 config = Config.get_config()
@@ -62,6 +74,7 @@ async def lifespan(
         ],
     )
     init_award_table()
+    warm_templates()
     try:
         pacific = timezone("America/Los_Angeles")
         trigger = CronTrigger(day_of_week="wed", hour=7, minute=0, timezone=pacific)
@@ -94,13 +107,22 @@ app = FastAPI(
 app.include_router(auth.router)
 app.include_router(mail.router)
 app.include_router(admin.router)
+app.include_router(live.router)
+app.include_router(api.router)
 app.add_middleware(
     SessionMiddleware, secret_key=config.SESSION_SECRET_KEY, max_age=None
 )
-app.mount("/static", StaticFiles(directory="static"), name="static")
-templates = Jinja2Templates(directory="templates")
+app.mount("/static", StaticAssets(directory="static"), name="static")
 # noinspection PyTypeChecker
 app.add_middleware(ProxyHeadersMiddleware, trusted_hosts=["*"])
+app.add_middleware(RequestTimingMiddleware)
+app.add_middleware(CompressionMiddleware)
+instrument_engine(engine)
+instrument_engine(jobs_engine)
+register_engine_pool("web", engine)
+register_engine_pool("jobs", jobs_engine)
+register_engine_pool("scheduler", scheduler_engine)
+instrument_scheduler(job_scheduler, executors)
 
 
 def _get_session():
@@ -113,12 +135,12 @@ def _get_current_week_info() -> WeekInfo:
 
 
 def get_error_messages(
-    player_picks: List[PlayerGamePick], games: List[Game], upset_id: int, lock_id: int
+    picked_team_ids: List[int], games: List[Game], upset_id: int, lock_id: int
 ) -> List[str]:
     """
      Get Error Messages
     Args:
-       player_picks: list of all the picks details
+       picked_team_ids: the team picked for each game that has a pick
        games: all the current week's games
        upset_id: team_id of the upset team
        lock_id: lock_id of the lock team
@@ -126,32 +148,21 @@ def get_error_messages(
         :class:`List` - error_message array (empty array if none)
     """
     errors = []
+    picked: set[int] = set(picked_team_ids)
     # First let's make sure that the form was completed (no missed picks)
-    if len(player_picks) != len(games):
+    if len(picked_team_ids) != len(games):
         errors.append("You missed a pick")
 
     # Now let's make sure that the lock and pick are the same
     if lock_id:
-        # loop through each pick until I find a pick that matches the lock, if not found, then warn
-        found_lock: bool = False
-        for pick in player_picks:
-            if pick.picked_team_id == lock_id:
-                found_lock = True
-        if not found_lock:
+        if lock_id not in picked:
             errors.append("You need to actually pick the team you picked for a lock")
     else:
         # Cool, now let's see if they missed their lock
         errors.append("You missed your lock.  (You must choose a lock)")
 
-    if upset_id:
-        found_upset: bool = False
-        for pick in player_picks:
-            if pick.picked_team_id == upset_id:
-                found_upset = True
-        if not found_upset:
-            errors.append(
-                "You cannot choose an upset that you didn't choose as a winner"
-            )
+    if upset_id and upset_id not in picked:
+        errors.append("You cannot choose an upset that you didn't choose as a winner")
 
     return errors
 
@@ -169,15 +180,21 @@ async def _verify_player(request: Request) -> int:
     )
 
 
+def _current_player(
+    discord_id: int = Depends(_verify_player),
+    session: Session = Depends(_get_session),
+) -> Optional[CurrentPlayer]:
+    """The logged-in player; no query when we've seen them in the last few minutes"""
+    return current_player_cache.resolve(session, discord_id)
+
+
 @app.get("/")
 def home(
     request: Request,
-    discord_id: int = Depends(_verify_player),
-    session: Session = Depends(_get_session),
+    player: Optional[CurrentPlayer] = Depends(_current_player),
     week_info: WeekInfo = Depends(_get_current_week_info),
 ):
     """Home page"""
-    player: Player = Player.by_discord_id(session, discord_id)
     context = {
         "player": player,
         "config": config,
@@ -191,15 +208,20 @@ def ping():
     return {"status": "pong"}
 
 
+@app.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint"""
+    payload, content_type = latest_metrics()
+    return Response(content=payload, media_type=content_type)
+
+
 @app.get("/home")
 def home_legacy(
     request: Request,
-    discord_id: int = Depends(_verify_player),
-    session: Session = Depends(_get_session),
+    player: Optional[CurrentPlayer] = Depends(_current_player),
     week_info: WeekInfo = Depends(_get_current_week_info),
 ):
     """Home page"""
-    player: Player = Player.by_discord_id(session, discord_id)
     context = {
         "player": player,
         "config": config,
@@ -211,26 +233,42 @@ def home_legacy(
 @app.get("/profile")
 def profile(
     request: Request,
-    discord_id: int = Depends(_verify_player),
+    profile_player_id: Optional[int] = None,
+    player: Optional[CurrentPlayer] = Depends(_current_player),
     session: Session = Depends(_get_session),
     week_info: WeekInfo = Depends(_get_current_week_info),
 ):
-    player: Player = Player.by_discord_id(session, discord_id)
-    context = {"player": player, "config": config, "week_info": week_info}
+    """A player's history, charted from the precomputed profile stats"""
+    if profile_player_id is None and player is not None:
+        profile_player_id = player.id
+    profile_player = (
+        session.get(Player, profile_player_id) if profile_player_id else None
+    )
+    if profile_player is None:
+        return RedirectResponse(url="/standings", status_code=status.HTTP_302_FOUND)
+    stats = PlayerProfileStats.for_player(session, profile_player.id)
+    context = {
+        "player": player,
+        "config": config,
+        "week_info": week_info,
+        "profile_player": profile_player,
+        "stats": stats,
+        "awards": {award.slug: award for award in session.exec(select(Award)).all()},
+        "chart": stats.chart_json(),
+    }
     return templates.TemplateResponse(
-        request=request, name="coming_soon.j2", context=context
+        request=request, name="profile.j2", context=context
     )
 
 
 @app.get("/picks", response_class=HTMLResponse)
 def picks(
     request: Request,
-    discord_id: int = Depends(_verify_player),
+    player: CurrentPlayer = Depends(_current_player),
     session: Session = Depends(_get_session),
     week_info: WeekInfo = Depends(_get_current_week_info),
 ):
     """Picks page"""
-    player: Player = Player.by_discord_id(session, discord_id)
 
     # Check if this is a skip week (e.g., postseason bye week)
     if week_info.is_skip_week:
@@ -247,7 +285,7 @@ def picks(
             request=request, name="error_picks.j2", context=context
         )
 
-    if player.picks_for_week(week_info):
+    if PlayerGamePick.player_has_picks_for_week(session, player.id, week_info):
         context = {
             "error_messages": [
                 "Sorry, you can't change your picks.  If you think this is a problem, contact John"
@@ -260,29 +298,13 @@ def picks(
         return templates.TemplateResponse(
             request=request, name="error_picks.j2", context=context
         )
-    games: List[Game] = Game.games_for_week(session=session, week_info=week_info)
-    valid_games = []
-    started_games = []
-    game: Game
-    for game in games:
-        if game.is_pregame:
-            valid_games.append(game)
-        else:
-            started_games.append(game)
-    valid_lock_teams = []
-    valid_upset_teams = []
-    for game in valid_games:
-        valid_upset_teams.append(game.underdog_team)
-        valid_lock_teams.append(game.home_team)
-        valid_lock_teams.append(game.road_team)
-    valid_lock_teams.sort(key=lambda x: x.long_name, reverse=False)
-    valid_upset_teams.sort(key=lambda x: x.long_name, reverse=False)
+    page: PicksPage = picks_page_cache.get(session, week_info)
     pick = None
     context = {
-        "valid_games": valid_games,
-        "started_games": started_games,
-        "valid_lock_teams": valid_lock_teams,
-        "valid_upset_teams": valid_upset_teams,
+        "valid_games": page.valid_games,
+        "started_games": page.started_games,
+        "valid_lock_teams": page.valid_lock_teams,
+        "valid_upset_teams": page.valid_upset_teams,
         "player": player,
         "config": config,
         "pick": pick,
@@ -294,11 +316,11 @@ def picks(
 @app.post("/picks_form")
 async def picks_form(
     request: Request,
-    discord_id: int = Depends(_verify_player),
+    current_player: CurrentPlayer = Depends(_current_player),
     session: Session = Depends(_get_session),
     week_info: WeekInfo = Depends(_get_current_week_info),
 ):
-    player: Player = Player.by_discord_id(session=session, discord_id=discord_id)
+    player: Player = session.get(Player, current_player.id)
 
     # Check if picks already exist for this week
     existing_picks = player.picks_for_week(week_info)
@@ -336,28 +358,28 @@ async def picks_form(
     # now get the form variables
     lock_id: int = int(form.get("lock")) if form.get("lock") else 0
     upset_id: int = int(form.get("upset")) if form.get("upset") else 0
-    pick_detail: List[PlayerGamePick] = []
+    pick_rows: List[dict] = []
     for game in games:
         key = f"game_{game.id}"
         if key in form:
             winner_id = int(form.get(key))
-            is_lock = winner_id == lock_id
-            is_upset = winner_id == upset_id
-            pg_pick: PlayerGamePick = PlayerGamePick(
-                player_id=player.id,
-                game_id=game.id,
-                picked_team_id=winner_id,
-                season=week_info.season,
-                season_type=week_info.season_type,
-                week_no=game.week_no,
-                is_lock=is_lock,
-                is_upset=is_upset,
+            pick_rows.append(
+                {
+                    "player_id": player.id,
+                    "game_id": game.id,
+                    "picked_team_id": winner_id,
+                    "season": week_info.season,
+                    "season_type": week_info.season_type,
+                    "week_no": game.week_no,
+                    "is_lock": winner_id == lock_id,
+                    "is_upset": winner_id == upset_id,
+                }
             )
-            pick_detail.append(pg_pick)
-            session.add(pg_pick)
 
     # Below is where we check for errors
-    error_messages = get_error_messages(pick_detail, games, upset_id, lock_id)
+    error_messages = get_error_messages(
+        [row["picked_team_id"] for row in pick_rows], games, upset_id, lock_id
+    )
     if error_messages:
         context = {
             "error_messages": error_messages,
@@ -370,6 +392,9 @@ async def picks_form(
             request=request, name="error_picks.j2", context=context
         )
     try:
+        # the whole week in one multi-row INSERT rather than a flush per pick
+        session.execute(insert(PlayerGamePick).values(pick_rows))
+        GamePickStats.add_picks(session, pick_rows, games)
         session.commit()
         job_scheduler.add_job(
             "app.jobs.award_update_all:update_all_awards",
@@ -402,14 +427,38 @@ async def picks_form(
 @app.get("/allpicks")
 def allpicks(
     request: Request,
-    discord_id: int = Depends(_verify_player),
-    session: Session = Depends(_get_session),
+    current_player: CurrentPlayer = Depends(_current_player),
     week_info: WeekInfo = Depends(_get_current_week_info),
     week_no: int = None,
     season_type: int = None,
     season: int = None,
 ):
-    player: Player = Player.by_discord_id(session, discord_id)
+    """
+    The grid is streamed as it renders, and the template lazy-loads every
+    player's picks while it does, so this session (unlike a _get_session one,
+    closed when the handler returns) stays open until the response is sent.
+    """
+    session = Session(engine)
+    try:
+        return _allpicks_response(
+            request, session, current_player, week_info, week_no, season_type, season
+        )
+    except Exception:
+        session.close()
+        raise
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def _allpicks_response(
+    request: Request,
+    session: Session,
+    current_player: CurrentPlayer,
+    week_info: WeekInfo,
+    week_no: Optional[int],
+    season_type: Optional[int],
+    season: Optional[int],
+) -> Response:
+    player: Player = session.get(Player, current_player.id)
 
     if week_no and season_type and season:
         display_week_info = WeekInfo(
@@ -446,21 +495,38 @@ def allpicks(
         "teams": teams,
         "config": config,
         "all_week_infos": all_week_infos,
+        "pick_stats": GamePickStats.for_week(session, display_week_info),
     }
-    return templates.TemplateResponse(
-        request=request, name="allpicks.j2", context=context
+    return templates.StreamingTemplateResponse(
+        request=request,
+        name="allpicks.j2",
+        context=context,
+        on_close=session.close,
     )
 
 
 @app.get("/standings")
 async def standings(
     request: Request,
-    discord_id: int = Depends(_verify_player),
+    season: Optional[int] = None,
+    player: Optional[CurrentPlayer] = Depends(_current_player),
     session: Session = Depends(_get_session),
     week_info: WeekInfo = Depends(_get_current_week_info),
 ):
-    """Returns the standings page"""
-    player: Player = Player.by_discord_id(session, discord_id)
+    """Returns the standings page, or an archived season's final standings"""
+    past_seasons: List[int] = PlayerSeasonRecord.archived_seasons(session=session)
+    if season is not None and season in past_seasons:
+        context = {
+            "player": player,
+            "config": config,
+            "week_info": week_info,
+            "season": season,
+            "past_seasons": past_seasons,
+            "leaders": PlayerSeasonRecord.leaderboard(session=session, season=season),
+        }
+        return templates.TemplateResponse(
+            request=request, name="season_standings.j2", context=context
+        )
     players: List[Player] = list(
         session.exec(select(Player).where(Player.active)).all()
     )
@@ -489,21 +555,67 @@ async def standings(
         "config": config,
         "week_info": week_info,
         "awards": session.exec(select(Award)),
+        "past_seasons": past_seasons,
     }
     return templates.TemplateResponse(
         request=request, name="standings.j2", context=context
     )
 
 
+@app.get("/contrarians")
+def contrarians(
+    request: Request,
+    player: Optional[CurrentPlayer] = Depends(_current_player),
+    session: Session = Depends(_get_session),
+    week_info: WeekInfo = Depends(_get_current_week_info),
+):
+    """Who wins by going against the league"""
+    rows = GamePickStats.contrarian_leaderboard(
+        session, week_info.season, week_info.season_type
+    )
+    players = {
+        p.id: p
+        for p in session.exec(
+            select(Player).where(Player.id.in_([row[0] for row in rows]))
+        ).all()
+    }
+    context = {
+        "player": player,
+        "week_info": week_info,
+        "config": config,
+        "leaders": [(players[row[0]], *row[1:]) for row in rows],
+    }
+    return templates.TemplateResponse(
+        request=request, name="contrarians.j2", context=context
+    )
+
+
+@app.get("/projections")
+def projections(
+    request: Request,
+    player: Optional[CurrentPlayer] = Depends(_current_player),
+    session: Session = Depends(_get_session),
+    week_info: WeekInfo = Depends(_get_current_week_info),
+):
+    """Projected standings for the current week"""
+    context = {
+        "player": player,
+        "week_info": week_info,
+        "config": config,
+        "projection": projection_cache.get(session, week_info),
+    }
+    return templates.TemplateResponse(
+        request=request, name="projections.j2", context=context
+    )
+
+
 @app.get("/rules")
 async def rules(
     request: Request,
-    discord_id: int = Depends(_verify_player),
-    session: Session = Depends(_get_session),
+    player: Optional[CurrentPlayer] = Depends(_current_player),
     week_info: WeekInfo = Depends(_get_current_week_info),
 ):
     """Rules page"""
-    player: Player = Player.by_discord_id(session, discord_id)
     context = {
         "player": player,
         "week_info": week_info,
@@ -0,0 +1,23 @@
+"""Request level performance instrumentation"""
+
+from .request_timing import (
+    RequestStats,
+    RequestTimingMiddleware,
+    TimedJinja2Templates,
+    current_request_stats,
+    instrument_engine,
+    record_espn_call,
+    route_timings,
+    track_stats,
+)
+
+__all__ = [
+    "RequestStats",
+    "RequestTimingMiddleware",
+    "TimedJinja2Templates",
+    "current_request_stats",
+    "instrument_engine",
+    "record_espn_call",
+    "route_timings",
+    "track_stats",
+]
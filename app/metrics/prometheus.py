@@ -0,0 +1,235 @@
+"""
+Prometheus metrics for the web app, the job scheduler and the ESPN client.
+
+Everything lives in the default ``prometheus_client`` registry and is scraped
+from ``/metrics``.  Pool and executor gauges are read at scrape time by
+collectors, so nothing has to poll them.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_SUBMITTED,
+)
+from apscheduler.schedulers.base import BaseScheduler
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+REQUEST_LATENCY = Histogram(
+    "tgfp_http_request_duration_seconds",
+    "Time until the response headers are sent, by route",
+    ["method", "route", "status"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+JOB_DURATION = Histogram(
+    "tgfp_scheduler_job_duration_seconds",
+    "Time from submission to completion of a scheduled job run",
+    ["job", "outcome"],
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+JOB_MISSED = Counter(
+    "tgfp_scheduler_job_misfires_total",
+    "Job runs skipped because they were past their misfire grace time",
+    ["job"],
+)
+ESPN_REQUESTS = Counter(
+    "tgfp_espn_requests_total",
+    "HTTP round trips to ESPN by status code ('error' for connection failures)",
+    ["status"],
+)
+ESPN_LATENCY = Histogram(
+    "tgfp_espn_request_duration_seconds",
+    "Latency of a single ESPN round trip",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+ESPN_RETRIES = Counter("tgfp_espn_retries_total", "ESPN requests that were retried")
+ESPN_CACHE = Counter(
+    "tgfp_espn_cache_lookups_total",
+    "ESPNNfl lookups served from the instance cache or fetched (or parsed)",
+    ["source", "result"],
+)
+AWARD_NOTIFY_LATENCY = Histogram(
+    "tgfp_award_notification_duration_seconds",
+    "Time to deliver a single award notification to the discord webhook",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+DB_CONNECTS = Counter(
+    "tgfp_db_connections_opened_total",
+    "New database connections, by engine (recycling and NullPool show up here)",
+    ["engine"],
+)
+LIVE_CLIENTS = Gauge(
+    "tgfp_live_score_clients", "Browsers connected to the live score stream"
+)
+COMPRESSION_BYTES = Counter(
+    "tgfp_http_compression_bytes_total",
+    "Response body bytes before ('in') and after ('out') compression",
+    ["encoding", "stage"],
+)
+LIVE_EVENTS = Counter(
+    "tgfp_live_score_events_total",
+    "Live score events published, and the ones dropped for slow clients",
+    ["result"],
+)
+
+
+def observe_request(method: str, route: str, status: int | str, seconds: float):
+    REQUEST_LATENCY.labels(method, route, str(status)).observe(seconds)
+
+
+def observe_espn_request(status: int | str, seconds: float):
+    ESPN_REQUESTS.labels(str(status)).inc()
+    ESPN_LATENCY.observe(seconds)
+
+
+def count_espn_retry():
+    ESPN_RETRIES.inc()
+
+
+def count_espn_cache(source: str, hit: bool):
+    ESPN_CACHE.labels(source, "hit" if hit else "miss").inc()
+
+
+class _PoolCollector(Collector):
+    """Reads checkout / overflow numbers off the registered engine pools"""
+
+    def __init__(self):
+        self._engines: dict[str, Engine] = {}
+
+    def add(self, name: str, engine: Engine):
+        self._engines[name] = engine
+
+    def collect(self):
+        gauges = {
+            "size": GaugeMetricFamily(
+                "tgfp_db_pool_size", "Configured pool size", labels=["engine"]
+            ),
+            "checkedout": GaugeMetricFamily(
+                "tgfp_db_pool_checked_out",
+                "Connections currently checked out",
+                labels=["engine"],
+            ),
+            "overflow": GaugeMetricFamily(
+                "tgfp_db_pool_overflow",
+                "Connections opened beyond the pool size (negative when below it)",
+                labels=["engine"],
+            ),
+            "checkedin": GaugeMetricFamily(
+                "tgfp_db_pool_checked_in",
+                "Idle connections in the pool",
+                labels=["engine"],
+            ),
+        }
+        for name, engine in self._engines.items():
+            pool = engine.pool
+            for attr, gauge in gauges.items():
+                # NullPool / StaticPool don't keep counts
+                reader = getattr(pool, attr, None)
+                if reader is not None:
+                    gauge.add_metric([name], reader())
+        yield from gauges.values()
+
+
+class _SchedulerCollector(Collector):
+    """Executor queue depth and in-flight job runs for the registered scheduler"""
+
+    def __init__(self, tracker: "_JobTracker"):
+        self._tracker = tracker
+        self._executors: dict = {}
+
+    def add_executors(self, executors: dict):
+        self._executors.update(executors)
+
+    def collect(self):
+        queue_depth = GaugeMetricFamily(
+            "tgfp_scheduler_queue_depth",
+            "Job runs submitted to an executor but not yet started",
+            labels=["executor"],
+        )
+        for alias, executor in self._executors.items():
+            # pylint: disable=protected-access
+            work_queue = getattr(getattr(executor, "_pool", None), "_work_queue", None)
+            if work_queue is not None:
+                queue_depth.add_metric([alias], work_queue.qsize())
+        yield queue_depth
+        yield GaugeMetricFamily(
+            "tgfp_scheduler_jobs_in_flight",
+            "Job runs submitted and not yet finished",
+            value=self._tracker.in_flight(),
+        )
+
+
+class _JobTracker:
+    """Remembers when each job was submitted so completion can be timed"""
+
+    def __init__(self):
+        self._started: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def job_label(job_id: str) -> str:
+        # ids carry game ids / weeks ('game_id:123'), keep the label bounded
+        return re.sub(r"\d+", "N", job_id)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._started)
+
+    def listener(self, event):
+        job = self.job_label(event.job_id)
+        if event.code == EVENT_JOB_SUBMITTED:
+            with self._lock:
+                self._started[event.job_id] = time.perf_counter()
+        elif event.code == EVENT_JOB_MISSED:
+            JOB_MISSED.labels(job).inc()
+        elif event.code in (EVENT_JOB_EXECUTED, EVENT_JOB_ERROR):
+            with self._lock:
+                started = self._started.pop(event.job_id, None)
+            if started is not None:
+                outcome = "error" if event.code == EVENT_JOB_ERROR else "success"
+                JOB_DURATION.labels(job, outcome).observe(time.perf_counter() - started)
+
+
+_pool_collector = _PoolCollector()
+_job_tracker = _JobTracker()
+_scheduler_collector = _SchedulerCollector(_job_tracker)
+REGISTRY.register(_pool_collector)
+REGISTRY.register(_scheduler_collector)
+
+
+def register_engine_pool(name: str, engine: Engine):
+    """Expose the pool gauges for `engine` under the label `name`"""
+    _pool_collector.add(name, engine)
+    connects = DB_CONNECTS.labels(name)
+    event.listen(engine, "connect", lambda *_: connects.inc())
+
+
+def instrument_scheduler(scheduler: BaseScheduler, executors: dict):
+    """Time job runs, count misfires and expose the executor queue depth"""
+    scheduler.add_listener(
+        _job_tracker.listener,
+        EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED,
+    )
+    _scheduler_collector.add_executors(executors)
+
+
+def latest_metrics() -> tuple[bytes, str]:
+    """Returns the exposition payload and its content type"""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,292 @@
+"""
+Per-request timing for the web app.
+
+Every request gets a :class:`RequestStats` stored in a context variable.  The
+SQLAlchemy cursor events, the ESPN http helper and the template renderer add to
+it while the request is being handled, and :class:`RequestTimingMiddleware`
+turns it into a ``Server-Timing`` header and a per-route running total that the
+admin metrics page reports.
+
+Sync endpoints run in a worker thread with a *copy* of the request context, so
+the stats object is shared (not the variable), which is why it is mutable.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+from starlette.templating import Jinja2Templates
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .prometheus import observe_request
+
+
+@dataclass
+class RequestStats:
+    """Counters collected while a single request is handled"""
+
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    espn_calls: int = 0
+    espn_seconds: float = 0.0
+    template_seconds: float = 0.0
+
+    def server_timing(self, wall_seconds: float) -> str:
+        """Returns the stats formatted as a Server-Timing header value"""
+        return ", ".join(
+            [
+                f"app;dur={wall_seconds * 1000:.1f}",
+                f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_queries} queries"',
+                f'espn;dur={self.espn_seconds * 1000:.1f};desc="{self.espn_calls} calls"',
+                f"tpl;dur={self.template_seconds * 1000:.1f}",
+            ]
+        )
+
+
+@dataclass
+class RouteTiming:
+    """Running totals for a single route"""
+
+    requests: int = 0
+    wall_seconds: float = 0.0
+    max_wall_seconds: float = 0.0
+    db_queries: int = 0
+    max_db_queries: int = 0
+    db_seconds: float = 0.0
+    espn_calls: int = 0
+    espn_seconds: float = 0.0
+    template_seconds: float = 0.0
+
+    def add(self, stats: RequestStats, wall_seconds: float):
+        self.requests += 1
+        self.wall_seconds += wall_seconds
+        self.max_wall_seconds = max(self.max_wall_seconds, wall_seconds)
+        self.db_queries += stats.db_queries
+        self.max_db_queries = max(self.max_db_queries, stats.db_queries)
+        self.db_seconds += stats.db_seconds
+        self.espn_calls += stats.espn_calls
+        self.espn_seconds += stats.espn_seconds
+        self.template_seconds += stats.template_seconds
+
+    def as_dict(self) -> dict:
+        """Averages (in ms) plus the raw counts, for the metrics endpoint"""
+        count = self.requests or 1
+        return {
+            "requests": self.requests,
+            "avg_wall_ms": round(self.wall_seconds / count * 1000, 2),
+            "max_wall_ms": round(self.max_wall_seconds * 1000, 2),
+            "avg_db_queries": round(self.db_queries / count, 2),
+            "max_db_queries": self.max_db_queries,
+            "avg_db_ms": round(self.db_seconds / count * 1000, 2),
+            "avg_espn_calls": round(self.espn_calls / count, 2),
+            "avg_espn_ms": round(self.espn_seconds / count * 1000, 2),
+            "avg_template_ms": round(self.template_seconds / count * 1000, 2),
+        }
+
+
+@dataclass
+class RouteTimings:
+    """Thread safe registry of :class:`RouteTiming` keyed by 'METHOD /path'"""
+
+    _routes: dict[str, RouteTiming] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def add(self, route_key: str, stats: RequestStats, wall_seconds: float):
+        with self._lock:
+            self._routes.setdefault(route_key, RouteTiming()).add(stats, wall_seconds)
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            return {
+                key: timing.as_dict() for key, timing in sorted(self._routes.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+route_timings = RouteTimings()
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "tgfp_request_stats", default=None
+)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Returns the stats for the request being handled, None outside a request"""
+    return _request_stats.get()
+
+
+@contextmanager
+def track_stats() -> Iterator[RequestStats]:
+    """Collect stats for a block of code outside a request (jobs, benchmarks)"""
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(token)
+
+
+def record_espn_call(seconds: float):
+    """Called by the ESPN client for every http round trip"""
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.espn_calls += 1
+        stats.espn_seconds += seconds
+
+
+def _before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _many):
+    conn.info.setdefault("tgfp_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, _cursor, _statement, _parameters, _context, _many):
+    started: float = conn.info["tgfp_query_start"].pop()
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+def instrument_engine(engine: Engine):
+    """Count and time every statement executed through `engine`"""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class TimedJinja2Templates(Jinja2Templates):
+    """Jinja2Templates that adds its render time to the current request stats"""
+
+    # noinspection PyPep8Naming
+    def TemplateResponse(self, *args, **kwargs):  # pylint: disable=invalid-name
+        started = time.perf_counter()
+        response = super().TemplateResponse(*args, **kwargs)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.template_seconds += time.perf_counter() - started
+        return response
+
+    # noinspection PyPep8Naming
+    def StreamingTemplateResponse(  # pylint: disable=invalid-name
+        self,
+        request: Request,
+        name: str,
+        context: dict,
+        on_close: Optional[Callable[[], None]] = None,
+        chunk_size: int = 16 * 1024,
+    ) -> StreamingResponse:
+        """
+        Render `name` with ``Template.generate`` while it is being sent, so the
+        first rows go out before the last ones are rendered.  Anything the
+        template loads lazily is loaded during the send: keep the session open
+        and pass its ``close`` as `on_close`.  Render time and those queries
+        are still counted, but they can't be in the Server-Timing header, which
+        has already gone: read them from the route's totals
+        (/admin/request_metrics), which are added once the body is sent.
+
+        The template is rendered by a sync generator, which Starlette runs in
+        the threadpool: ``generate`` and the lazy loads it triggers are
+        blocking, so an async iterator would have to hop to a thread for every
+        chunk anyway.
+
+        `on_close` runs once, however the send ends: after the last chunk, when
+        rendering fails, or when the client goes away (a background task is
+        skipped in the last two cases).
+        """
+        context.setdefault("request", request)
+        for context_processor in self.context_processors:
+            context.update(context_processor(request))
+        template = self.get_template(name)
+        stats = _request_stats.get()
+
+        def chunks() -> Iterator[bytes]:
+            pending: list[str] = []
+            size = 0
+            rendering = 0.0
+            started = time.perf_counter()
+            try:
+                for fragment in template.generate(context):
+                    pending.append(fragment)
+                    size += len(fragment)
+                    if size >= chunk_size:
+                        # time spent waiting on the client isn't render time
+                        rendering += time.perf_counter() - started
+                        yield "".join(pending).encode()
+                        started = time.perf_counter()
+                        pending, size = [], 0
+                if pending:
+                    yield "".join(pending).encode()
+            finally:
+                rendering += time.perf_counter() - started
+                if stats is not None:
+                    stats.template_seconds += rendering
+                if closer is not None:
+                    closer()
+
+        iterator = chunks()
+        # also when the response is dropped before the first chunk: a
+        # generator that never started has no finally to run
+        closer = weakref.finalize(iterator, on_close) if on_close else None
+        return StreamingResponse(iterator, media_type="text/html; charset=utf-8")
+
+
+def _route_path(scope: Scope) -> str:
+    # routing fills these into the (shared) scope; mounts such as /static only
+    # leave their prefix behind in root_path
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    return scope.get("root_path") or "<unmatched>"
+
+
+class RequestTimingMiddleware:
+    """
+    Pure ASGI middleware (so the context variable is visible to the endpoint)
+    that adds a Server-Timing header and records per-route totals.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        wall_seconds: Optional[float] = None
+        status_code: int | str = 500
+
+        async def send_with_timing(message: Message):
+            nonlocal wall_seconds, status_code
+            if message["type"] == "http.response.start":
+                wall_seconds = time.perf_counter() - started
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing(wall_seconds))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            if wall_seconds is None:
+                wall_seconds = time.perf_counter() - started
+            route_path = _route_path(scope)
+            route_timings.add(f"{scope['method']} {route_path}", stats, wall_seconds)
+            observe_request(scope["method"], route_path, status_code, wall_seconds)
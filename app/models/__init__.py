@@ -5,9 +5,14 @@ from .api_key import ApiKey
 from .game import Game
 from .player_game_pick import PlayerGamePick
 from .player import Player
+from .current_player import CurrentPlayer, current_player_cache
 from .team import Team
 from .award import Award, AwardSlug
 from .player_award import PlayerAward
+from .game_pick_stats import GamePickStats
+from .game_line import GameLine
+from .player_profile_stats import PlayerProfileStats
+from .player_season_record import PlayerSeasonRecord
 
 
 __all__ = [
@@ -16,8 +21,14 @@ __all__ = [
     "Game",
     "PlayerGamePick",
     "Player",
+    "CurrentPlayer",
+    "current_player_cache",
     "Team",
     "Award",
     "PlayerAward",
+    "GamePickStats",
+    "GameLine",
+    "PlayerProfileStats",
+    "PlayerSeasonRecord",
     "AwardSlug",
 ]
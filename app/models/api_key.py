@@ -1,5 +1,5 @@
 from typing import Optional
-from sqlmodel import SQLModel, Field
+from sqlmodel import SQLModel, Field, Session, select
 
 from .base import TGFPModelBase
 
@@ -7,4 +7,10 @@ from .base import TGFPModelBase
 class ApiKey(TGFPModelBase, SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     token: str = Field(index=True, unique=True, description="API token string")
-    description: str
\ No newline at end of file
+    description: str
+
+    @staticmethod
+    def by_token(session: Session, token: str) -> Optional["ApiKey"]:
+        """Returns the key for `token`, if there is one"""
+        statement = select(ApiKey).where(ApiKey.token == token).limit(1)
+        return session.exec(statement).first()
@@ -0,0 +1,42 @@
+"""
+The weekly award rules, on arrays.
+
+Every function takes per-player arrays whose *last* axis is the player, so the
+award job passes one week's numbers (shape ``(players,)``) and the what-if
+simulator passes one row per possible outcome (``(outcomes, players)``) through
+the same rule.  Winners come back as an index into the player axis, ``-1``
+for nobody.
+"""
+
+import numpy as np
+
+
+def won_the_week(wins: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """
+    Rank the players by wins for the week (ties keep the input order); the top
+    one wins when their total points beat the runner-up's
+    """
+    wins = np.asarray(wins)
+    points = np.asarray(points)
+    if wins.shape[-1] < 2:
+        raise ValueError("Too few players")
+    order = np.argsort(-wins, axis=-1, kind="stable")
+    first = order[..., 0]
+    second = order[..., 1]
+    first_points = np.take_along_axis(points, first[..., None], axis=-1)[..., 0]
+    second_points = np.take_along_axis(points, second[..., None], axis=-1)[..., 0]
+    return np.where(first_points > second_points, first, -1)
+
+
+def perfect_week(wins: np.ndarray, losses: np.ndarray) -> np.ndarray:
+    """Per player: won at least once and never lost"""
+    return (np.asarray(losses) == 0) & (np.asarray(wins) > 0)
+
+
+def in_your_face(correct: np.ndarray) -> np.ndarray:
+    """For one game, whoever was the only one to pick the winner"""
+    correct = np.asarray(correct, dtype=bool)
+    if correct.shape[-1] == 0:
+        return np.full(correct.shape[:-1], -1)
+    alone = correct.sum(axis=-1) == 1
+    return np.where(alone, correct.argmax(axis=-1), -1)
@@ -0,0 +1,75 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlmodel import Session
+
+from .player import Player
+
+
+@dataclass(frozen=True)
+class CurrentPlayer:
+    """
+    The logged-in player's identity and display fields, detached from any
+    session.  Enough for the page chrome; handlers that need the player's picks
+    load the ``Player`` by ``id``.
+    """
+
+    id: int
+    discord_id: int
+    first_name: str
+    last_name: str
+    nick_name: str
+    email: str
+
+    @property
+    def full_name(self):
+        return self.first_name + " " + self.last_name
+
+    @staticmethod
+    def from_player(player: Player) -> "CurrentPlayer":
+        return CurrentPlayer(
+            id=player.id,
+            discord_id=player.discord_id,
+            first_name=player.first_name,
+            last_name=player.last_name,
+            nick_name=player.nick_name,
+            email=player.email,
+        )
+
+
+class CurrentPlayerCache:
+    """discord_id → :class:`CurrentPlayer`, kept for `ttl` seconds"""
+
+    def __init__(self, ttl: float = 300.0):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: dict[int, tuple[float, CurrentPlayer]] = {}
+
+    def resolve(self, session: Session, discord_id: int) -> Optional[CurrentPlayer]:
+        """The cached player, or one looked up (and cached) through `session`"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(discord_id)
+        if entry and entry[0] > now:
+            return entry[1]
+        player = Player.by_discord_id(session, discord_id)
+        if player is None:
+            # not cached: they may be added to the league any minute
+            return None
+        current = CurrentPlayer.from_player(player)
+        with self._lock:
+            self._entries[discord_id] = (now + self._ttl, current)
+        return current
+
+    def invalidate(self, discord_id: Optional[int] = None):
+        """Forget one player, or everybody"""
+        with self._lock:
+            if discord_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(discord_id, None)
+
+
+current_player_cache = CurrentPlayerCache()
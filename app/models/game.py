@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import Optional, TYPE_CHECKING, List
 
 import pytz
+import sqlalchemy as sa
 from sqlmodel import Field, Relationship, Session, select
 
 from .base import TGFPModelBase
@@ -12,6 +13,12 @@ if TYPE_CHECKING:
 
 
 class Game(TGFPModelBase, table=True):
+    __table_args__ = (
+        # games_for_week: filter on the week, ordered by kickoff
+        sa.Index(
+            "ix_game_week_start", "season", "season_type", "week_no", "start_time"
+        ),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
 
     # Foreign keys to teams (matches favorite/road/home links in Beanie)
@@ -98,6 +105,16 @@ class Game(TGFPModelBase, table=True):
                 return self.road_team
         return None
 
+    @property
+    def winning_team_id(self) -> Optional[int]:
+        """:attr:`winning_team`'s id, without loading the team"""
+        if self.is_final:
+            if self.home_team_score > self.road_team_score:
+                return self.home_team_id
+            if self.home_team_score < self.road_team_score:
+                return self.road_team_id
+        return None
+
     @staticmethod
     def games_for_week(
         session: Session,
@@ -128,6 +145,11 @@ class Game(TGFPModelBase, table=True):
             return None
         return games[-1]
 
+    @staticmethod
+    def latest_season(session: Session) -> Optional[int]:
+        """The newest season with games, None before there are any"""
+        return session.exec(select(sa.func.max(Game.season))).one()
+
     @staticmethod
     def get_distinct_week_infos(session: Session) -> List[WeekInfo]:
         """Returns a list of distinct week infos"""
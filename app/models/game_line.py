@@ -0,0 +1,101 @@
+# app/models/game_line.py
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Field, Session, select
+
+from .base import TGFPModelBase
+
+BUCKET = timedelta(hours=1)
+
+
+class GameLine(TGFPModelBase, table=True):
+    """
+    One point in a game's line history: the favorite and spread as of `bucket`.
+
+    Written by ``refresh_lines`` only when ESPN's line moved (plus the first
+    line it sees for a game), at most one row per game per :data:`BUCKET`: a
+    move within the bucket overwrites that bucket's row, earlier buckets are
+    never touched.  ``Game.spread`` / ``favorite_team_id`` hold the latest
+    line, except that a game's favorite stops changing once it has picks.
+    """
+
+    __table_args__ = (
+        sa.UniqueConstraint("game_id", "bucket", name="uq_gameline_game_bucket"),
+    )
+    id: Optional[int] = Field(default=None, primary_key=True)
+    game_id: int = Field(foreign_key="game.id")
+    # naive UTC, like Game.start_time
+    bucket: datetime
+    favorite_team_id: int = Field(foreign_key="team.id")
+    spread: float
+
+    @staticmethod
+    def bucket_for(moment: datetime) -> datetime:
+        """The start of the bucket `moment` falls in, as naive UTC"""
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        epoch = datetime(1970, 1, 1)
+        return epoch + (moment - epoch) // BUCKET * BUCKET
+
+    @staticmethod
+    def latest_lines(
+        session: Session, game_ids: Iterable[int]
+    ) -> dict[int, tuple[int, float]]:
+        """game_id → the (favorite_team_id, spread) last recorded for it"""
+        game_ids = list(game_ids)
+        newest = (
+            select(GameLine.game_id, sa.func.max(GameLine.bucket).label("bucket"))
+            .where(GameLine.game_id.in_(game_ids))
+            .group_by(GameLine.game_id)
+            .subquery()
+        )
+        statement = select(
+            GameLine.game_id, GameLine.favorite_team_id, GameLine.spread
+        ).join(
+            newest,
+            sa.and_(
+                GameLine.game_id == newest.c.game_id,
+                GameLine.bucket == newest.c.bucket,
+            ),
+        )
+        return {
+            game_id: (favorite_team_id, spread)
+            for game_id, favorite_team_id, spread in session.exec(statement).all()
+        }
+
+    @staticmethod
+    def append(session: Session, lines: list[dict], moment: datetime):
+        """
+        Record `lines` (dicts of game_id, favorite_team_id and spread) in
+        `moment`'s bucket, in one statement.  Doesn't commit.
+        """
+        if not lines:
+            return
+        bucket = GameLine.bucket_for(moment)
+        dialect = postgresql if session.bind.dialect.name == "postgresql" else sqlite
+        statement = dialect.insert(GameLine).values(
+            [{**line, "bucket": bucket} for line in lines]
+        )
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["game_id", "bucket"],
+                set_={
+                    "favorite_team_id": statement.excluded.favorite_team_id,
+                    "spread": statement.excluded.spread,
+                    "updated_at": sa.func.now(),
+                },
+            )
+        )
+
+    @staticmethod
+    def for_game(session: Session, game_id: int) -> list["GameLine"]:
+        """The game's history, oldest first"""
+        statement = (
+            select(GameLine)
+            .where(GameLine.game_id == game_id)
+            .order_by(GameLine.bucket)
+        )
+        return list(session.exec(statement).all())
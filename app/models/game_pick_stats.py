@@ -0,0 +1,188 @@
+# app/models/game_pick_stats.py
+from typing import Optional
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Field, Session, select
+
+from .base import TGFPModelBase
+from .game import Game
+from .model_helpers import WeekInfo
+from .player_game_pick import PlayerGamePick
+
+COUNTS = ("home_picks", "road_picks", "home_locks", "road_locks", "upsets")
+
+
+class GamePickStats(TGFPModelBase, table=True):
+    """
+    How the league picked one game: picks and locks per side, and upsets.
+
+    Kept up to date when picks are submitted (:meth:`add_picks`, in the same
+    transaction as the picks) so the grid's consensus row, the in your face
+    award and the contrarian leaderboard read counts instead of every pick.
+    :meth:`rebuild` recounts from the picks, for backfills and repairs.
+    """
+
+    __table_args__ = (
+        sa.Index("ix_gamepickstats_week", "season", "season_type", "week_no"),
+    )
+    game_id: int = Field(foreign_key="game.id", primary_key=True)
+
+    # denormalized from the game for the week lookups
+    season: int
+    season_type: int
+    week_no: int
+
+    home_picks: int = 0
+    road_picks: int = 0
+    home_locks: int = 0
+    road_locks: int = 0
+    upsets: int = 0
+
+    @property
+    def total_picks(self) -> int:
+        return self.home_picks + self.road_picks
+
+    def picks_for(self, game: Game, team_id: int) -> int:
+        return self.home_picks if team_id == game.home_team_id else self.road_picks
+
+    def locks_for(self, game: Game, team_id: int) -> int:
+        return self.home_locks if team_id == game.home_team_id else self.road_locks
+
+    def share_for(self, game: Game, team_id: int) -> float:
+        """Fraction of the league's picks on `team_id`"""
+        if not self.total_picks:
+            return 0.0
+        return self.picks_for(game, team_id) / self.total_picks
+
+    @staticmethod
+    def for_week(session: Session, week_info: WeekInfo) -> dict[int, "GamePickStats"]:
+        """game_id → stats for the week's games that have picks"""
+        statement = (
+            select(GamePickStats)
+            .where(GamePickStats.season == week_info.season)
+            .where(GamePickStats.season_type == week_info.season_type)
+            .where(GamePickStats.week_no == week_info.week_no)
+        )
+        return {stats.game_id: stats for stats in session.exec(statement).all()}
+
+    @staticmethod
+    def add_picks(session: Session, pick_rows: list[dict], games: list[Game]):
+        """Count newly inserted picks (the rows given to the picks INSERT)"""
+        by_id = {game.id: game for game in games}
+        rows = []
+        for pick in pick_rows:
+            game = by_id[pick["game_id"]]
+            home = pick["picked_team_id"] == game.home_team_id
+            rows.append(
+                {
+                    "game_id": game.id,
+                    "season": game.season,
+                    "season_type": game.season_type,
+                    "week_no": game.week_no,
+                    "home_picks": int(home),
+                    "road_picks": int(not home),
+                    "home_locks": int(home and pick["is_lock"]),
+                    "road_locks": int(not home and pick["is_lock"]),
+                    "upsets": int(pick["is_upset"]),
+                }
+            )
+        if not rows:
+            return
+        dialect = postgresql if session.bind.dialect.name == "postgresql" else sqlite
+        statement = dialect.insert(GamePickStats).values(rows)
+        table = GamePickStats.__table__
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["game_id"],
+                set_={
+                    **{
+                        name: table.c[name] + statement.excluded[name]
+                        for name in COUNTS
+                    },
+                    "updated_at": sa.func.now(),
+                },
+            )
+        )
+
+    @staticmethod
+    def counts_from_picks():
+        """SELECT of the stats rows, counted from the picks"""
+        pick = PlayerGamePick
+        home = pick.picked_team_id == Game.home_team_id
+
+        def count(condition) -> sa.ColumnElement:
+            return sa.func.sum(sa.case((condition, 1), else_=0))
+
+        return (
+            select(
+                Game.id,
+                Game.season,
+                Game.season_type,
+                Game.week_no,
+                count(home),
+                count(sa.not_(home)),
+                count(sa.and_(home, pick.is_lock)),
+                count(sa.and_(sa.not_(home), pick.is_lock)),
+                count(pick.is_upset),
+            )
+            .join(pick, pick.game_id == Game.id)
+            .group_by(Game.id, Game.season, Game.season_type, Game.week_no)
+        )
+
+    @staticmethod
+    def rebuild(session: Session, week_info: Optional[WeekInfo] = None):
+        """Recount one week, or everything, from the picks"""
+        delete = sa.delete(GamePickStats)
+        counts = GamePickStats.counts_from_picks()
+        if week_info is not None:
+            delete = (
+                delete.where(GamePickStats.season == week_info.season)
+                .where(GamePickStats.season_type == week_info.season_type)
+                .where(GamePickStats.week_no == week_info.week_no)
+            )
+            counts = (
+                counts.where(Game.season == week_info.season)
+                .where(Game.season_type == week_info.season_type)
+                .where(Game.week_no == week_info.week_no)
+            )
+        session.execute(delete)
+        session.execute(
+            sa.insert(GamePickStats).from_select(
+                ["game_id", "season", "season_type", "week_no", *COUNTS], counts
+            )
+        )
+
+    @staticmethod
+    def contrarian_leaderboard(
+        session: Session, season: int, season_type: int
+    ) -> list[tuple[int, int, int, int]]:
+        """
+        (player_id, picks, minority picks, minority picks that won) for the
+        season, most minority wins first.  A minority pick is one on the side
+        fewer than half the league took.
+        """
+        pick = PlayerGamePick
+        stats = GamePickStats
+        home = pick.picked_team_id == Game.home_team_id
+        same_side = sa.case((home, stats.home_picks), else_=stats.road_picks)
+        minority = same_side * 2 < stats.home_picks + stats.road_picks
+        won = sa.and_(
+            Game.game_status == "STATUS_FINAL",
+            sa.or_(
+                sa.and_(home, Game.home_team_score > Game.road_team_score),
+                sa.and_(sa.not_(home), Game.road_team_score > Game.home_team_score),
+            ),
+        )
+        minority_picks = sa.func.sum(sa.case((minority, 1), else_=0))
+        minority_wins = sa.func.sum(sa.case((sa.and_(minority, won), 1), else_=0))
+        statement = (
+            select(pick.player_id, sa.func.count(), minority_picks, minority_wins)
+            .join(stats, stats.game_id == pick.game_id)
+            .join(Game, Game.id == pick.game_id)
+            .where(pick.season == season)
+            .where(pick.season_type == season_type)
+            .group_by(pick.player_id)
+            .order_by(minority_wins.desc(), minority_picks.desc())
+        )
+        return [tuple(row) for row in session.exec(statement).all()]
@@ -0,0 +1,87 @@
+"""
+Season partitions of the tables that grow every week and never shrink.
+
+On PostgreSQL, the tables whose ``info`` says ``partition_by: season``
+(``playergamepick`` and ``playeraward``) are LIST-partitioned on ``season``
+by migration ``e5b7a1d94c20``: one partition per season, plus a DEFAULT one
+so an insert never fails for want of a partition.  Every hot query filters on
+the season, so the planner only ever opens the current season's partition.
+
+Postgres requires the partition key in each primary key and unique
+constraint, so there the primary key is ``(id, season)``.  Ids still come
+from the table's one sequence, so ``id`` alone stays unique, and the models
+keep it as their only primary key (other databases aren't partitioned).
+
+A season's partitions should exist before its first row:
+:func:`ensure_season_partitions` runs when the season's games are created,
+before anybody can pick them.  Postgres won't create a partition for values
+the DEFAULT partition holds, so rows that got there first (a pick or award
+written before the games were) are moved into the new partition.
+"""
+
+import sqlalchemy as sa
+from sqlmodel import Session, SQLModel
+
+
+def season_partitioned_tables() -> list[str]:
+    return [
+        table.name
+        for table in SQLModel.metadata.sorted_tables
+        if table.info.get("partition_by") == "season"
+    ]
+
+
+def partition_name(table: str, season: int) -> str:
+    return f"{table}_y{int(season)}"
+
+
+def _is_partitioned(session: Session, table: str) -> bool:
+    statement = sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p"
+        " JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :table)"
+    )
+    return bool(session.execute(statement, {"table": table}).scalar())
+
+
+def ensure_season_partitions(session: Session, season: int) -> list[str]:
+    """
+    Create `season`'s partition of each partitioned table that lacks one;
+    returns the partitions created.  A no-op off PostgreSQL, or before the
+    migration.
+    """
+    if session.bind.dialect.name != "postgresql":
+        return []
+    created = []
+    for table in season_partitioned_tables():
+        name = partition_name(table, season)
+        if not _is_partitioned(session, table):
+            continue
+        if session.execute(
+            sa.text("SELECT to_regclass(:name)"), {"name": name}
+        ).scalar():
+            continue
+        # rows the DEFAULT partition already holds for the season would make
+        # the CREATE fail: move them out first, and back in once it exists
+        moved = f"{name}_moved"
+        session.execute(
+            sa.text(
+                f"CREATE TEMPORARY TABLE {moved} AS"
+                f" SELECT * FROM {table}_default WHERE season = :season"
+            ),
+            {"season": season},
+        )
+        rows = session.execute(
+            sa.text(f"DELETE FROM {table}_default WHERE season = :season"),
+            {"season": season},
+        ).rowcount
+        session.execute(
+            sa.text(
+                f"CREATE TABLE {name} PARTITION OF {table}"
+                f" FOR VALUES IN ({int(season)})"
+            )
+        )
+        if rows:
+            session.execute(sa.text(f"INSERT INTO {table} SELECT * FROM {moved}"))
+        session.execute(sa.text(f"DROP TABLE {moved}"))
+        created.append(name)
+    return created
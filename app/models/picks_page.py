@@ -0,0 +1,146 @@
+"""
+The /picks page for a week, built once and shared by every player.
+
+What the page shows only changes when a game leaves pregame (the game's poller
+rebuilds it then, see ``jobs.update_game``), when the week's games are created
+or when the team records are synced.  In between, handlers read it from memory.
+Entries also expire on their own (at the next kickoff, and after ``MAX_AGE``
+regardless) so a process that didn't run the job that changed things still
+catches up.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlmodel import Session
+
+from .game import Game
+from .model_helpers import WeekInfo
+from .team import Team
+
+MAX_AGE = 600.0
+# once a kickoff has passed, wait at least this long between rebuilds while
+# the game's status catches up
+MIN_AGE = 30.0
+
+
+@dataclass(frozen=True)
+class PicksPageTeam:
+    id: int
+    short_name: str
+    long_name: str
+    wins: int
+    losses: int
+
+    @staticmethod
+    def from_team(team: Team) -> "PicksPageTeam":
+        return PicksPageTeam(
+            id=team.id,
+            short_name=team.short_name,
+            long_name=team.long_name,
+            wins=team.wins,
+            losses=team.losses,
+        )
+
+
+@dataclass(frozen=True)
+class PicksPageGame:
+    id: int
+    road_team: PicksPageTeam
+    home_team: PicksPageTeam
+    favorite_team: PicksPageTeam
+    spread: float
+    start_time: datetime
+
+
+@dataclass(frozen=True)
+class PicksPage:
+    week_info: WeekInfo
+    valid_games: list[PicksPageGame]
+    started_games: list[PicksPageGame]
+    valid_lock_teams: list[PicksPageTeam]
+    valid_upset_teams: list[PicksPageTeam]
+    next_kickoff: Optional[datetime]
+
+    @staticmethod
+    def build(session: Session, week_info: WeekInfo) -> "PicksPage":
+        teams: dict[int, PicksPageTeam] = {}
+
+        def team_view(team: Team) -> PicksPageTeam:
+            if team.id not in teams:
+                teams[team.id] = PicksPageTeam.from_team(team)
+            return teams[team.id]
+
+        valid_games = []
+        started_games = []
+        valid_lock_teams = []
+        valid_upset_teams = []
+        for game in Game.games_for_week(session=session, week_info=week_info):
+            view = PicksPageGame(
+                id=game.id,
+                road_team=team_view(game.road_team),
+                home_team=team_view(game.home_team),
+                favorite_team=team_view(game.favorite_team),
+                spread=game.spread,
+                start_time=game.utc_start_time,
+            )
+            if game.is_pregame:
+                valid_games.append(view)
+                valid_upset_teams.append(team_view(game.underdog_team))
+                valid_lock_teams.append(view.home_team)
+                valid_lock_teams.append(view.road_team)
+            else:
+                started_games.append(view)
+        valid_lock_teams.sort(key=lambda x: x.long_name, reverse=False)
+        valid_upset_teams.sort(key=lambda x: x.long_name, reverse=False)
+        return PicksPage(
+            week_info=week_info,
+            valid_games=valid_games,
+            started_games=started_games,
+            valid_lock_teams=valid_lock_teams,
+            valid_upset_teams=valid_upset_teams,
+            next_kickoff=min((g.start_time for g in valid_games), default=None),
+        )
+
+
+class PicksPageCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pages: dict[str, tuple[float, PicksPage]] = {}
+
+    @staticmethod
+    def _is_fresh(built_at: float, page: PicksPage) -> bool:
+        age = time.monotonic() - built_at
+        if age >= MAX_AGE:
+            return False
+        if page.next_kickoff and page.next_kickoff <= datetime.now(timezone.utc):
+            return age < MIN_AGE
+        return True
+
+    def get(self, session: Session, week_info: WeekInfo) -> PicksPage:
+        """The week's page, built through `session` if it isn't cached"""
+        with self._lock:
+            entry = self._pages.get(week_info.cache_key)
+        if entry and self._is_fresh(*entry):
+            return entry[1]
+        return self.refresh(session, week_info)
+
+    def refresh(self, session: Session, week_info: WeekInfo) -> PicksPage:
+        page = PicksPage.build(session, week_info)
+        with self._lock:
+            self._pages[week_info.cache_key] = (time.monotonic(), page)
+        return page
+
+    def invalidate(self, week_info: Optional[WeekInfo] = None):
+        """Forget one week, or all of them"""
+        with self._lock:
+            if week_info is None:
+                self._pages.clear()
+            else:
+                self._pages.pop(week_info.cache_key, None)
+
+
+picks_page_cache = PicksPageCache()
@@ -21,7 +21,7 @@ class Player(TGFPModelBase, table=True):
     losses: int
     bonus: int
     email: str = Field(index=True, unique=True, description="player's email address")
-    discord_id: int = Field(sa_type=sa.BigInteger, nullable=False)
+    discord_id: int = Field(sa_type=sa.BigInteger, nullable=False, index=True)
 
     game_picks: List["PlayerGamePick"] = Relationship(back_populates="player")
     player_awards: List["PlayerAward"] = Relationship(back_populates="player")
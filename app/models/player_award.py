@@ -13,6 +13,7 @@ if TYPE_CHECKING:
 
 
 class PlayerAward(TGFPModelBase, table=True):
+    # LIST-partitioned on season on PostgreSQL, see models.partitions
     __table_args__ = (
         sa.UniqueConstraint(
             "player_id",
@@ -22,6 +23,16 @@ class PlayerAward(TGFPModelBase, table=True):
             "game_id",
             name="uq_playeraward_player_award_week",
         ),
+        # upsert_award_with_args looks awards up by player, award and week
+        sa.Index(
+            "ix_playeraward_player_award_week",
+            "player_id",
+            "award_id",
+            "season",
+            "season_type",
+            "week_no",
+        ),
+        {"info": {"partition_by": "season"}},
     )
     id: int | None = Field(default=None, primary_key=True)
 
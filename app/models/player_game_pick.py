@@ -53,9 +53,14 @@ class PlayerGamePick(TGFPModelBase, table=True):
 
     Constraints & Indexes
     ---------------------
-    - ``uq_playergamepick_player_game``: unique ``(player_id, game_id)``.
+    - ``uq_playergamepick_player_game``: unique ``(player_id, game_id, season)``;
+      ``season`` only because the partitions need it (a game has one season).
     - ``uq_one_lock_per_week``: partial unique index over
       ``(player_id, season, week_no)`` where ``is_lock = true`` to restrict one lock per week.
+    - ``ix_playergamepick_week`` / ``ix_playergamepick_player_week``: the week
+      lookups, for everybody and for one player.
+    - On PostgreSQL the table is LIST-partitioned on ``season`` (see
+      :mod:`models.partitions`), and its primary key is ``(id, season)``.
 
     Notes
     -----
@@ -67,7 +72,7 @@ class PlayerGamePick(TGFPModelBase, table=True):
 
     __table_args__ = (
         sa.UniqueConstraint(
-            "player_id", "game_id", name="uq_playergamepick_player_game"
+            "player_id", "game_id", "season", name="uq_playergamepick_player_game"
         ),
         sa.Index(
             "uq_one_lock_per_week",
@@ -77,7 +82,19 @@ class PlayerGamePick(TGFPModelBase, table=True):
             "week_no",
             unique=True,
             postgresql_where=sa.text("is_lock = true"),
+            sqlite_where=sa.text("is_lock = 1"),
         ),
+        # find_picks_for_week
+        sa.Index("ix_playergamepick_week", "season", "season_type", "week_no"),
+        # Player.picks_for_week
+        sa.Index(
+            "ix_playergamepick_player_week",
+            "player_id",
+            "season",
+            "season_type",
+            "week_no",
+        ),
+        {"info": {"partition_by": "season"}},
     )
     id: Optional[int] = Field(default=None, primary_key=True)
 
@@ -127,6 +144,20 @@ class PlayerGamePick(TGFPModelBase, table=True):
         )
         return list(session.exec(statement).all())
 
+    @staticmethod
+    def player_has_picks_for_week(
+        session: Session, player_id: int, week_info: WeekInfo
+    ) -> bool:
+        statement = (
+            select(PlayerGamePick.id)
+            .where(PlayerGamePick.player_id == player_id)
+            .where(PlayerGamePick.season == week_info.season)
+            .where(PlayerGamePick.season_type == week_info.season_type)
+            .where(PlayerGamePick.week_no == week_info.week_no)
+            .limit(1)
+        )
+        return session.exec(statement).first() is not None
+
     @property
     def bonus_points(self) -> int:
         bonus_points = 0
@@ -0,0 +1,223 @@
+# app/models/player_profile_stats.py
+from collections import defaultdict
+from typing import Optional
+
+import sqlalchemy as sa
+from sqlalchemy.orm import selectinload
+from sqlmodel import Field, Session, select
+
+from .award import Award
+from .base import TGFPModelBase
+from .game import Game
+from .model_helpers import WeekInfo
+from .player import Player
+from .player_award import PlayerAward
+from .player_game_pick import PlayerGamePick
+
+SEASON_TYPE_LABELS = {1: "Pre ", 2: "Wk ", 3: "Post "}
+
+
+class PlayerProfileStats(TGFPModelBase, table=True):
+    """
+    A player's history for the /profile charts, one row per player.
+
+    The series are parallel JSON arrays with one entry per final week the
+    player picked in, oldest first: ``weeks`` holds ``[season, season_type,
+    week_no]``, ``week_points`` the points scored that week and
+    ``season_rank`` where the player stood in that season after it.
+    :meth:`refresh` appends the weeks that finished since the last run, so the
+    page never reads a pick.
+    """
+
+    player_id: int = Field(foreign_key="player.id", primary_key=True)
+
+    weeks: list = Field(default_factory=list, sa_type=sa.JSON)
+    week_points: list = Field(default_factory=list, sa_type=sa.JSON)
+    season_rank: list = Field(default_factory=list, sa_type=sa.JSON)
+    # [season, season_type, week_no, award slug]
+    awards: list = Field(default_factory=list, sa_type=sa.JSON)
+
+    locks: int = 0
+    lock_wins: int = 0
+    upsets: int = 0
+    upset_wins: int = 0
+
+    @property
+    def lock_rate(self) -> Optional[float]:
+        return self.lock_wins / self.locks if self.locks else None
+
+    @property
+    def upset_rate(self) -> Optional[float]:
+        return self.upset_wins / self.upsets if self.upsets else None
+
+    def chart_json(self) -> dict:
+        """The series as Chart.js wants them: labels plus one array per line"""
+        cumulative = []
+        total = 0
+        season = None
+        for week, points in zip(self.weeks, self.week_points):
+            if season != week[:2]:
+                season, total = week[:2], 0
+            total += points
+            cumulative.append(total)
+        return {
+            "labels": [
+                f"{season} {SEASON_TYPE_LABELS.get(season_type, '')}{week_no}"
+                for season, season_type, week_no in self.weeks
+            ],
+            "weeks": self.weeks,
+            "week_points": self.week_points,
+            "season_points": cumulative,
+            "season_rank": self.season_rank,
+            "locks": self.locks,
+            "lock_wins": self.lock_wins,
+            "lock_rate": self.lock_rate,
+            "upsets": self.upsets,
+            "upset_wins": self.upset_wins,
+            "upset_rate": self.upset_rate,
+            "awards": [
+                {"season": s, "season_type": st, "week_no": w, "slug": slug}
+                for s, st, w, slug in self.awards
+            ],
+        }
+
+    @staticmethod
+    def for_player(session: Session, player_id: int) -> "PlayerProfileStats":
+        """The player's stats, empty if they have none yet"""
+        stats = session.get(PlayerProfileStats, player_id)
+        return stats or PlayerProfileStats(player_id=player_id)
+
+    @staticmethod
+    def final_week_infos(session: Session) -> list[WeekInfo]:
+        """Weeks whose games are all final, oldest first"""
+        final = sa.func.sum(sa.case((Game.game_status == "STATUS_FINAL", 1), else_=0))
+        statement = (
+            select(Game.season, Game.season_type, Game.week_no)
+            .group_by(Game.season, Game.season_type, Game.week_no)
+            .having(sa.func.count() == final)
+            .order_by(Game.season, Game.season_type, Game.week_no)
+        )
+        return [WeekInfo(*row) for row in session.exec(statement).all()]
+
+    @staticmethod
+    def _week_key(week_info: WeekInfo) -> tuple[int, int, int]:
+        return week_info.season, week_info.season_type, week_info.week_no
+
+    @staticmethod
+    def _any_picks(session: Session, week_infos: list[WeekInfo]) -> bool:
+        statement = select(PlayerGamePick.id).where(
+            sa.or_(
+                *(
+                    sa.and_(
+                        PlayerGamePick.season == week_info.season,
+                        PlayerGamePick.season_type == week_info.season_type,
+                        PlayerGamePick.week_no == week_info.week_no,
+                    )
+                    for week_info in week_infos
+                )
+            )
+        )
+        return session.exec(statement.limit(1)).first() is not None
+
+    @staticmethod
+    def refresh(session: Session) -> int:
+        """
+        Append every final week that isn't recorded yet; returns how many
+        weeks were added.  Doesn't commit.
+        """
+        # pylint: disable=too-many-locals
+        rows = {
+            row.player_id: row for row in session.exec(select(PlayerProfileStats)).all()
+        }
+        recorded = {tuple(week) for row in rows.values() for week in row.weeks}
+        through = max(recorded, default=None)
+        week_infos = [
+            week_info
+            for week_info in PlayerProfileStats.final_week_infos(session)
+            if PlayerProfileStats._week_key(week_info) not in recorded
+        ]
+        late = [
+            week_info
+            for week_info in week_infos
+            if through is not None and PlayerProfileStats._week_key(week_info) < through
+        ]
+        if late:
+            # a week held open by a postponed game went final after the weeks
+            # following it; the series are in week order, so recount them all
+            # (weeks nobody picked in are never recorded, and don't count)
+            if PlayerProfileStats._any_picks(session, late):
+                return PlayerProfileStats.rebuild(session)
+            week_infos = [w for w in week_infos if w not in late]
+        if not week_infos:
+            return 0
+
+        # season points so far, to rank against
+        season_totals: dict[tuple, dict[int, int]] = defaultdict(dict)
+        for row in rows.values():
+            for week, points in zip(row.weeks, row.week_points):
+                totals = season_totals[tuple(week[:2])]
+                totals[row.player_id] = totals.get(row.player_id, 0) + points
+
+        for week_info in week_infos:
+            key = [week_info.season, week_info.season_type, week_info.week_no]
+            statement = (
+                select(PlayerGamePick)
+                .where(PlayerGamePick.season == week_info.season)
+                .where(PlayerGamePick.season_type == week_info.season_type)
+                .where(PlayerGamePick.week_no == week_info.week_no)
+                # the teams are few, and come from the identity map after once
+                .options(selectinload(PlayerGamePick.game))
+            )
+            picks_by_player: dict[int, list[PlayerGamePick]] = defaultdict(list)
+            for pick in session.exec(statement).all():
+                picks_by_player[pick.player_id].append(pick)
+            if not picks_by_player:
+                continue
+            awards = session.exec(
+                select(PlayerAward.player_id, Award.slug)
+                .join(Award, Award.id == PlayerAward.award_id)
+                .where(PlayerAward.season == week_info.season)
+                .where(PlayerAward.season_type == week_info.season_type)
+                .where(PlayerAward.week_no == week_info.week_no)
+                .order_by(PlayerAward.id)
+            ).all()
+
+            totals = season_totals[tuple(key[:2])]
+            week_points = {}
+            for player_id, picks in picks_by_player.items():
+                # pylint: disable=protected-access
+                record = Player._record_from_picks(picks)
+                week_points[player_id] = record["wins"] + record["bonus"]
+                totals[player_id] = totals.get(player_id, 0) + week_points[player_id]
+
+            for player_id, picks in picks_by_player.items():
+                row = rows.get(player_id)
+                if row is None:
+                    row = rows[player_id] = PlayerProfileStats(player_id=player_id)
+                # 1 + everyone ahead, so ties share a rank
+                rank = 1 + sum(1 for t in totals.values() if t > totals[player_id])
+                # new lists, so the JSON columns are seen as changed
+                row.weeks = row.weeks + [key]
+                row.week_points = row.week_points + [week_points[player_id]]
+                row.season_rank = row.season_rank + [rank]
+                row.awards = row.awards + [
+                    [*key, slug]
+                    for award_player_id, slug in awards
+                    if award_player_id == player_id
+                ]
+                row.locks += sum(1 for pick in picks if pick.is_lock)
+                row.lock_wins += sum(
+                    1 for pick in picks if pick.is_lock and pick.is_win
+                )
+                row.upsets += sum(1 for pick in picks if pick.is_upset)
+                row.upset_wins += sum(
+                    1 for pick in picks if pick.is_upset and pick.is_win
+                )
+                session.add(row)
+        return len(week_infos)
+
+    @staticmethod
+    def rebuild(session: Session) -> int:
+        """Recount everything from the picks, after scores were corrected"""
+        session.execute(sa.delete(PlayerProfileStats))
+        return PlayerProfileStats.refresh(session)
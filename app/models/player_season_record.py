@@ -0,0 +1,158 @@
+# app/models/player_season_record.py
+from collections import defaultdict
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import selectinload
+from sqlmodel import Field, Session, select
+
+from .base import TGFPModelBase
+from .game import Game
+from .player import Player
+from .player_game_pick import PlayerGamePick
+
+
+class SeasonArchived(ValueError):
+    """The season's records are frozen"""
+
+
+class PlayerSeasonRecord(TGFPModelBase, table=True):
+    """
+    A player's wins, losses and bonus for one season.
+
+    The current season's rows are recounted from that season's picks by
+    ``update_player_records`` (which copies them to ``Player.wins`` / ``losses``
+    / ``bonus`` for the hot paths).  Once a later season has games, the earlier
+    ones are counted one last time and ``archived``: archived rows are never
+    recounted, and serve the past seasons' leaderboards.
+    """
+
+    player_id: int = Field(foreign_key="player.id", primary_key=True)
+    season: int = Field(primary_key=True)
+    wins: int = 0
+    losses: int = 0
+    bonus: int = 0
+    archived: bool = False
+
+    @property
+    def total_points(self) -> int:
+        return self.wins + self.bonus
+
+    @property
+    def winning_pct(self) -> float:
+        wins_and_losses = float(self.wins + self.losses)
+        if wins_and_losses:
+            return self.wins / wins_and_losses
+        return 0
+
+    @staticmethod
+    def records_from_picks(session: Session, season: int) -> dict[int, dict]:
+        """player_id → {'wins', 'losses', 'bonus'} for the season's picks"""
+        statement = (
+            select(PlayerGamePick)
+            .where(PlayerGamePick.season == season)
+            .options(selectinload(PlayerGamePick.game))
+        )
+        picks_by_player: dict[int, list[PlayerGamePick]] = defaultdict(list)
+        for pick in session.exec(statement).all():
+            picks_by_player[pick.player_id].append(pick)
+        return {
+            # pylint: disable=protected-access
+            player_id: Player._record_from_picks(picks)
+            for player_id, picks in picks_by_player.items()
+        }
+
+    @staticmethod
+    def _season_rows(session: Session, season: int) -> list["PlayerSeasonRecord"]:
+        statement = (
+            select(PlayerSeasonRecord)
+            .where(PlayerSeasonRecord.season == season)
+            .execution_options(populate_existing=True)
+        )
+        return list(session.exec(statement).all())
+
+    @staticmethod
+    def update_season(session: Session, season: int) -> list["PlayerSeasonRecord"]:
+        """
+        Recount the season's rows from its picks; doesn't commit.  The game
+        jobs run this concurrently, so the rows are upserted in one statement
+        (and an archived row is never overwritten).
+        """
+        existing = PlayerSeasonRecord._season_rows(session, season)
+        if any(row.archived for row in existing):
+            raise SeasonArchived(season)
+        records = PlayerSeasonRecord.records_from_picks(session, season)
+        player_ids = records.keys() | {row.player_id for row in existing}
+        if player_ids:
+            values = [
+                {
+                    "player_id": player_id,
+                    "season": season,
+                    **records.get(player_id, {"wins": 0, "losses": 0, "bonus": 0}),
+                }
+                for player_id in sorted(player_ids)
+            ]
+            dialect = (
+                postgresql if session.bind.dialect.name == "postgresql" else sqlite
+            )
+            statement = dialect.insert(PlayerSeasonRecord).values(values)
+            session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["player_id", "season"],
+                    set_={
+                        "wins": statement.excluded.wins,
+                        "losses": statement.excluded.losses,
+                        "bonus": statement.excluded.bonus,
+                        "updated_at": sa.func.now(),
+                    },
+                    where=sa.not_(PlayerSeasonRecord.archived),
+                )
+            )
+        return PlayerSeasonRecord._season_rows(session, season)
+
+    @staticmethod
+    def archive_before(session: Session, season: int) -> list[int]:
+        """
+        Count and freeze every season before `season` that isn't archived
+        yet; returns those seasons.  Doesn't commit.  Runs on every game
+        update, so the candidates come from the games (a few hundred a
+        season), never from the earlier seasons' picks.
+        """
+        with_games = session.exec(
+            select(Game.season).where(Game.season < season).distinct()
+        ).all()
+        archived = set(PlayerSeasonRecord.archived_seasons(session))
+        seasons = sorted(set(with_games) - archived)
+        for old_season in seasons:
+            PlayerSeasonRecord.update_season(session, old_season)
+            session.execute(
+                sa.update(PlayerSeasonRecord)
+                .where(PlayerSeasonRecord.season == old_season)
+                .values(archived=True)
+            )
+        return seasons
+
+    @staticmethod
+    def archived_seasons(session: Session) -> list[int]:
+        """Seasons with frozen records, newest first"""
+        statement = (
+            select(PlayerSeasonRecord.season)
+            .where(PlayerSeasonRecord.archived)
+            .distinct()
+            .order_by(PlayerSeasonRecord.season.desc())
+        )
+        return list(session.exec(statement).all())
+
+    @staticmethod
+    def leaderboard(
+        session: Session, season: int
+    ) -> list[tuple["PlayerSeasonRecord", Player]]:
+        """Everyone with a record in the season, most points first"""
+        statement = (
+            select(PlayerSeasonRecord, Player)
+            .join(Player, Player.id == PlayerSeasonRecord.player_id)
+            .where(PlayerSeasonRecord.season == season)
+        )
+        rows = [tuple(row) for row in session.exec(statement).all()]
+        rows.sort(key=lambda row: row[0].total_points, reverse=True)
+        return rows
@@ -0,0 +1,27 @@
+"""Projected standings: who leads after the week, wins it, goes perfect"""
+
+from .simulator import favorite_win_probability, simulate
+from .week import (
+    DEFAULT_SIMULATIONS,
+    PlayerProjection,
+    WeekProjection,
+    project_week,
+    projection_cache,
+    state_key,
+)
+from .whatif import UnknownWinner, WhatIf, WhatIfPlayer, what_if
+
+__all__ = [
+    "DEFAULT_SIMULATIONS",
+    "PlayerProjection",
+    "UnknownWinner",
+    "WeekProjection",
+    "WhatIf",
+    "WhatIfPlayer",
+    "favorite_win_probability",
+    "project_week",
+    "projection_cache",
+    "simulate",
+    "state_key",
+    "what_if",
+]
@@ -0,0 +1,136 @@
+"""
+Monte Carlo over the games still to be decided, in NumPy.
+
+A game's outcome only ever adds a fixed amount to a player's wins, losses and
+points (which amount depends on whether the favorite won), so every total is
+linear in the outcome matrix: ``outcomes (sims × games) @ delta (games ×
+players) + base``.  One draw of uniform numbers and three matrix products
+cover every simulation, with no Python loop over players, games or sims.
+
+Win probabilities come from the spread: the favorite wins by a normally
+distributed margin with mean ``spread`` and standard deviation ``MARGIN_SD``
+points (the usual NFL figure).  Winning the week and a perfect week are
+decided by the award job's own rules (``models.award_rules``).
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from models.award_rules import perfect_week, won_the_week
+
+MARGIN_SD = 13.45
+# bounds the (sims × players) work arrays to a few MB each
+CHUNK = 50_000
+
+
+def favorite_win_probability(
+    spread: np.ndarray, favorite_lead: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """P(favorite wins) per game; `favorite_lead` shifts games in progress"""
+    margin = np.asarray(spread, dtype=np.float64)
+    if favorite_lead is not None:
+        margin = margin + favorite_lead
+    z = margin / (MARGIN_SD * math.sqrt(2.0))
+    return 0.5 * (1.0 + np.vectorize(math.erf, otypes=[np.float64])(z))
+
+
+@dataclass(frozen=True)
+class OpenGames:
+    """
+    What each undecided game is worth to each player, favorite win or not.
+
+    Every array is (games × players), zero where the player has no pick.
+    """
+
+    favorite_win_probability: np.ndarray
+    wins_if_favorite: np.ndarray
+    wins_if_underdog: np.ndarray
+    losses_if_favorite: np.ndarray
+    losses_if_underdog: np.ndarray
+    points_if_favorite: np.ndarray
+    points_if_underdog: np.ndarray
+
+
+@dataclass(frozen=True)
+class Standing:
+    """Where each player stands before the open games are played, (players,)"""
+
+    season_points: np.ndarray
+    week_wins: np.ndarray
+    week_losses: np.ndarray
+    week_points: np.ndarray
+
+
+@dataclass(frozen=True)
+class Projection:
+    """Per player probabilities, (players,) each"""
+
+    simulations: int
+    first_after_week: np.ndarray
+    week_win: np.ndarray
+    perfect_week: np.ndarray
+    expected_week_points: np.ndarray
+
+
+def linear_totals(
+    outcomes: np.ndarray, if_favorite: np.ndarray, if_underdog: np.ndarray
+):
+    delta = (if_favorite - if_underdog).astype(np.float32)
+    return outcomes @ delta + if_underdog.sum(axis=0, dtype=np.float32)
+
+
+def simulate(
+    standing: Standing,
+    games: OpenGames,
+    simulations: int = 100_000,
+    seed: Optional[int] = None,
+) -> Projection:
+    # pylint: disable=too-many-locals
+    rng = np.random.default_rng(seed)
+    players = standing.season_points.shape[0]
+    probability = games.favorite_win_probability.astype(np.float32)
+    first = np.zeros(players)
+    week_win = np.zeros(players)
+    perfect = np.zeros(players)
+    points_total = np.zeros(players)
+
+    remaining = simulations
+    while remaining > 0:
+        size = min(CHUNK, remaining)
+        remaining -= size
+        outcomes = (
+            rng.random((size, probability.shape[0]), dtype=np.float32) < probability
+        ).astype(np.float32)
+
+        week_points = standing.week_points + linear_totals(
+            outcomes, games.points_if_favorite, games.points_if_underdog
+        )
+        wins = standing.week_wins + linear_totals(
+            outcomes, games.wins_if_favorite, games.wins_if_underdog
+        )
+        losses = standing.week_losses + linear_totals(
+            outcomes, games.losses_if_favorite, games.losses_if_underdog
+        )
+        season = standing.season_points + (week_points - standing.week_points)
+
+        # a shared first place is split between the players in it
+        leaders = season == season.max(axis=1, keepdims=True)
+        first += (leaders / leaders.sum(axis=1, keepdims=True)).sum(axis=0)
+        if players > 1:
+            winner = won_the_week(wins, week_points)
+            week_win += np.bincount(winner[winner >= 0], minlength=players)
+        perfect += perfect_week(wins, losses).sum(axis=0)
+        points_total += week_points.sum(axis=0)
+
+    return Projection(
+        simulations=simulations,
+        first_after_week=first / simulations,
+        week_win=week_win / simulations,
+        perfect_week=perfect / simulations,
+        expected_week_points=points_total / simulations,
+    )
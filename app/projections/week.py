@@ -0,0 +1,257 @@
+"""
+Projected standings for a week: the simulator fed from the database.
+
+Only the week's own games are simulated, so "first" means first in the season
+standings once this week is over, not at the end of the season: later weeks
+have neither games nor picks to simulate yet.  The season totals are today's,
+so only the current week is projected.
+
+Final games count as they ended.  Games in progress are simulated with the
+favorite's current lead added to the spread.  Picks on games that haven't
+kicked off are hidden on /allpicks and the API until kickoff, and a
+probability over one or two such games gives them away just as well, so
+pregame games are only simulated once every active player has submitted
+(picks can't be changed after that); until then they are left out and the
+projection says so.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from sqlmodel import Session
+
+from models import Game, Player, PlayerGamePick
+from models.model_helpers import WeekInfo
+
+from .simulator import OpenGames, Standing, favorite_win_probability, simulate
+
+DEFAULT_SIMULATIONS = 100_000
+
+
+@dataclass(frozen=True)
+class PlayerProjection:
+    player_id: int
+    nick_name: str
+    season_points: int
+    week_points: int
+    first_after_week: float
+    week_win: float
+    perfect_week: float
+    expected_week_points: float
+
+
+@dataclass(frozen=True)
+class WeekProjection:
+    week_info: WeekInfo
+    simulations: int
+    open_games: int
+    pregame_included: bool
+    players: list[PlayerProjection]
+
+
+def open_games_matrix(
+    games: list[Game], player_index: dict[int, int], picks: list[PlayerGamePick]
+) -> OpenGames:
+    shape = (len(games), len(player_index))
+    arrays = {
+        name: np.zeros(shape, dtype=np.float32)
+        for name in (
+            "wins_if_favorite",
+            "wins_if_underdog",
+            "losses_if_favorite",
+            "losses_if_underdog",
+            "points_if_favorite",
+            "points_if_underdog",
+        )
+    }
+    game_index = {game.id: i for i, game in enumerate(games)}
+    for pick in picks:
+        g = game_index.get(pick.game_id)
+        p = player_index.get(pick.player_id)
+        if g is None or p is None:
+            continue
+        picked_favorite = pick.picked_team_id == games[g].favorite_team_id
+        winner, loser = (
+            ("favorite", "underdog") if picked_favorite else ("underdog", "favorite")
+        )
+        # same scoring as PlayerGamePick.bonus_points
+        arrays[f"wins_if_{winner}"][g, p] = 1
+        arrays[f"points_if_{winner}"][g, p] = 1 + pick.is_lock + pick.is_upset
+        arrays[f"losses_if_{loser}"][g, p] = 1
+        arrays[f"points_if_{loser}"][g, p] = -int(pick.is_lock)
+
+    spread = np.array([game.spread for game in games], dtype=np.float64)
+    lead = np.array([_favorite_lead(game) for game in games], dtype=np.float64)
+    return OpenGames(
+        favorite_win_probability=favorite_win_probability(spread, lead), **arrays
+    )
+
+
+def _favorite_lead(game: Game) -> float:
+    if game.is_pregame:
+        return 0.0
+    home, road = game.home_team_score or 0, game.road_team_score or 0
+    lead = home - road
+    return float(lead if game.favorite_team_id == game.home_team_id else -lead)
+
+
+def state_key(session: Session, week_info: WeekInfo) -> str:
+    """Changes whenever anything the projection depends on does"""
+    games = Game.games_for_week(session=session, week_info=week_info)
+    picks = PlayerGamePick.find_picks_for_week(week_info, session)
+    players = Player.active_players(session=session)
+    state = (
+        week_info.cache_key,
+        [
+            (
+                g.id,
+                g.game_status,
+                g.home_team_score,
+                g.road_team_score,
+                # pregame win probabilities come from the line
+                g.spread,
+                g.favorite_team_id,
+            )
+            for g in games
+        ],
+        len(picks),
+        sorted((p.id, p.total_points) for p in players),
+    )
+    return hashlib.sha1(repr(state).encode(), usedforsecurity=False).hexdigest()
+
+
+@dataclass(frozen=True)
+class WeekState:
+    """The active players' picks and records for a week, ready to simulate"""
+
+    players: list[Player]
+    player_index: dict[int, int]
+    games: list[Game]
+    picks: list[PlayerGamePick]
+    open_games: list[Game]
+    pregame_included: bool
+    standing: Standing
+
+    def open_games_matrix(self) -> OpenGames:
+        return open_games_matrix(self.open_games, self.player_index, self.picks)
+
+
+def load_week(session: Session, week_info: WeekInfo) -> WeekState:
+    players = Player.active_players(session=session)
+    player_index = {player.id: i for i, player in enumerate(players)}
+    games = Game.games_for_week(session=session, week_info=week_info)
+    picks = [
+        pick
+        for pick in PlayerGamePick.find_picks_for_week(week_info, session)
+        if pick.player_id in player_index
+    ]
+    submitted = {pick.player_id for pick in picks}
+    pregame_included = all(player.id in submitted for player in players)
+    open_games = [
+        game
+        for game in games
+        if not game.is_final and (pregame_included or not game.is_pregame)
+    ]
+    final_ids = {game.id for game in games if game.is_final}
+
+    final_picks: dict[int, list[PlayerGamePick]] = {}
+    for pick in picks:
+        if pick.game_id in final_ids:
+            final_picks.setdefault(pick.player_id, []).append(pick)
+    records = [
+        # pylint: disable=protected-access
+        Player._record_from_picks(final_picks.get(player.id, []))
+        for player in players
+    ]
+    week_wins = np.array([r["wins"] for r in records], dtype=np.float32)
+    week_points = week_wins + np.array([r["bonus"] for r in records], dtype=np.float32)
+    return WeekState(
+        players=players,
+        player_index=player_index,
+        games=games,
+        picks=picks,
+        open_games=open_games,
+        pregame_included=pregame_included,
+        standing=Standing(
+            season_points=np.array([p.total_points for p in players], dtype=np.float32),
+            week_wins=week_wins,
+            week_losses=np.array([r["losses"] for r in records], dtype=np.float32),
+            week_points=week_points,
+        ),
+    )
+
+
+def project_week(
+    session: Session,
+    week_info: WeekInfo,
+    simulations: int = DEFAULT_SIMULATIONS,
+    seed: Optional[int] = None,
+) -> WeekProjection:
+    week = load_week(session, week_info)
+    rows: list[PlayerProjection] = []
+    if week.players:
+        projection = simulate(
+            week.standing,
+            week.open_games_matrix(),
+            simulations=simulations,
+            seed=seed,
+        )
+        for i, player in enumerate(week.players):
+            rows.append(
+                PlayerProjection(
+                    player_id=player.id,
+                    nick_name=player.nick_name,
+                    season_points=player.total_points,
+                    week_points=int(week.standing.week_points[i]),
+                    first_after_week=float(projection.first_after_week[i]),
+                    week_win=float(projection.week_win[i]),
+                    perfect_week=float(projection.perfect_week[i]),
+                    expected_week_points=float(projection.expected_week_points[i]),
+                )
+            )
+    rows.sort(key=lambda row: (row.first_after_week, row.season_points), reverse=True)
+    return WeekProjection(
+        week_info=week_info,
+        simulations=simulations,
+        open_games=len(week.open_games),
+        pregame_included=week.pregame_included,
+        players=rows,
+    )
+
+
+class ProjectionCache:
+    """The last few projections, keyed by :func:`state_key`"""
+
+    def __init__(self, size: int = 8):
+        self._size = size
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, int], WeekProjection] = {}
+
+    def get(
+        self,
+        session: Session,
+        week_info: WeekInfo,
+        simulations: int = DEFAULT_SIMULATIONS,
+    ) -> WeekProjection:
+        key = (state_key(session, week_info), simulations)
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None:
+            return cached
+        # seeded by the state, so every worker shows the same numbers
+        projection = project_week(
+            session, week_info, simulations, seed=int(key[0][:12], 16)
+        )
+        with self._lock:
+            self._entries[key] = projection
+            while len(self._entries) > self._size:
+                self._entries.pop(next(iter(self._entries)))
+        return projection
+
+
+projection_cache = ProjectionCache()
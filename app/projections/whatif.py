@@ -0,0 +1,172 @@
+"""
+"Who wins the week if X and Y win?"
+
+Every combination of results of the week's undecided games is enumerated, as
+the rows of a bit matrix (row ``i``, column ``g`` is bit ``g`` of ``i``: did
+game ``g``'s favorite win), weighted by its probability, and run through the
+award rules in ``models.award_rules`` for every row at once.  Games the
+caller has decided (``winners``) are fixed rather than enumerated.  Sixteen
+open games is 65,536 rows; past ``MAX_ENUMERATED`` the rows are sampled
+instead.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+from sqlmodel import Session
+
+from models.award_rules import in_your_face, perfect_week, won_the_week
+from models.model_helpers import WeekInfo
+
+from .simulator import linear_totals
+from .week import WeekState, load_week
+
+MAX_ENUMERATED = 16
+
+
+class UnknownWinner(ValueError):
+    """A team in `winners` isn't playing in one of the week's open games"""
+
+
+@dataclass(frozen=True)
+class WhatIfPlayer:
+    player_id: int
+    nick_name: str
+    won_the_week: float
+    perfect_week: float
+    in_your_face: float
+
+
+@dataclass(frozen=True)
+class WhatIf:
+    week_info: WeekInfo
+    open_games: int
+    fixed_games: int
+    outcomes: int
+    enumerated: bool
+    pregame_included: bool
+    players: list[WhatIfPlayer]
+
+
+def outcome_bits(games: int) -> np.ndarray:
+    """Every favorite-won / lost combination of `games` games, (2**games × games)"""
+    rows = np.arange(1 << games, dtype=np.uint32)[:, None]
+    return ((rows >> np.arange(games, dtype=np.uint32)) & 1).astype(np.float32)
+
+
+def _outcomes(
+    probability: np.ndarray, fixed: dict[int, bool], seed: Optional[int]
+) -> tuple[np.ndarray, np.ndarray, bool]:
+    """(outcomes × games) favorite-won matrix and each row's weight"""
+    free = [g for g in range(probability.shape[0]) if g not in fixed]
+    if len(free) <= MAX_ENUMERATED:
+        free_bits = outcome_bits(len(free))
+        enumerated = True
+    else:
+        rng = np.random.default_rng(seed)
+        draws = rng.random((1 << MAX_ENUMERATED, len(free)), dtype=np.float32)
+        free_bits = (draws < probability[free]).astype(np.float32)
+        enumerated = False
+
+    outcomes = np.empty((free_bits.shape[0], probability.shape[0]), np.float32)
+    outcomes[:, free] = free_bits
+    for g, favorite_won in fixed.items():
+        outcomes[:, g] = float(favorite_won)
+    if enumerated:
+        p = probability[free].astype(np.float64)
+        weights = np.prod(np.where(free_bits == 1, p, 1.0 - p), axis=1)
+    else:
+        # sampled in proportion already
+        weights = np.ones(free_bits.shape[0])
+    return outcomes, weights / weights.sum(), enumerated
+
+
+def _fixed_games(week: WeekState, winners: Iterable[int]) -> dict[int, bool]:
+    fixed: dict[int, bool] = {}
+    for team_id in winners:
+        for g, game in enumerate(week.open_games):
+            if team_id in (game.home_team_id, game.road_team_id):
+                fixed[g] = team_id == game.favorite_team_id
+                break
+        else:
+            raise UnknownWinner(team_id)
+    return fixed
+
+
+def what_if(
+    session: Session,
+    week_info: WeekInfo,
+    winners: Iterable[int] = (),
+    seed: Optional[int] = None,
+) -> WhatIf:
+    """Each active player's chance at the week's awards, given `winners`"""
+    # pylint: disable=too-many-locals
+    week = load_week(session, week_info)
+    fixed = _fixed_games(week, winners)
+    matrix = week.open_games_matrix()
+    outcomes, weights, enumerated = _outcomes(
+        matrix.favorite_win_probability, fixed, seed
+    )
+    standing = week.standing
+    players = len(week.players)
+
+    won = np.zeros(players)
+    perfect = np.zeros(players)
+    face = np.zeros(players)
+    if players > 1:
+        points = standing.week_points + linear_totals(
+            outcomes, matrix.points_if_favorite, matrix.points_if_underdog
+        )
+        wins = standing.week_wins + linear_totals(
+            outcomes, matrix.wins_if_favorite, matrix.wins_if_underdog
+        )
+        losses = standing.week_losses + linear_totals(
+            outcomes, matrix.losses_if_favorite, matrix.losses_if_underdog
+        )
+        winner = won_the_week(wins, points)
+        won = np.bincount(winner[winner >= 0], weights[winner >= 0], players)
+        perfect = weights @ perfect_week(wins, losses)
+
+        # in your face: already earned in a final game, or earned in this row
+        earned = np.zeros(players, dtype=bool)
+        face_rows = np.zeros((outcomes.shape[0], players), dtype=bool)
+        for game in week.games:
+            if not game.is_final:
+                continue
+            picks = [p for p in week.picks if p.game_id == game.id]
+            solo = int(in_your_face([pick.is_win for pick in picks]))
+            if solo >= 0:
+                earned[week.player_index[picks[solo].player_id]] = True
+        for g in range(len(week.open_games)):
+            favorite = outcomes[:, g : g + 1]
+            correct = (favorite * matrix.wins_if_favorite[g]) + (
+                (1 - favorite) * matrix.wins_if_underdog[g]
+            )
+            solo = in_your_face(correct > 0)
+            rows = np.flatnonzero(solo >= 0)
+            face_rows[rows, solo[rows]] = True
+        face = weights @ (face_rows | earned)
+
+    rows = [
+        WhatIfPlayer(
+            player_id=player.id,
+            nick_name=player.nick_name,
+            won_the_week=float(won[i]),
+            perfect_week=float(perfect[i]),
+            in_your_face=float(face[i]),
+        )
+        for i, player in enumerate(week.players)
+    ]
+    rows.sort(key=lambda row: (row.won_the_week, row.perfect_week), reverse=True)
+    return WhatIf(
+        week_info=week_info,
+        open_games=len(week.open_games),
+        fixed_games=len(fixed),
+        outcomes=outcomes.shape[0],
+        enumerated=enumerated,
+        pregame_included=week.pregame_included,
+        players=rows,
+    )
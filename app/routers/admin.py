@@ -1,9 +1,11 @@
 # routers/admin_scheduler.py
-from fastapi import APIRouter, Request
+import weakref
+from typing import Iterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import HTMLResponse
 from starlette import status
-from starlette.templating import Jinja2Templates
-from starlette.responses import RedirectResponse
+from starlette.responses import RedirectResponse, JSONResponse, StreamingResponse
 from sqlmodel import Session
 
 from db import engine
@@ -12,8 +14,11 @@ from jobs.update_all_scores import update_all_scores
 from jobs.sync_team_records import sync_the_team_records
 from jobs.scheduler import job_scheduler, schedule_jobs
 from models.model_helpers import current_week_info
+from app.exports import MEDIA_TYPES, ExportError, export
+from app.metrics import route_timings
+from app.routers.api import _verify_api_key
+from app.templating import templates
 
-templates = Jinja2Templates(directory="templates")
 router = APIRouter(prefix="/admin", tags=["Scheduler"])
 
 
@@ -56,3 +61,44 @@ def job_schedule_jobs(request: Request):
     redirect_url = request.url_for("job_schedule")
     response = RedirectResponse(redirect_url, status_code=status.HTTP_302_FOUND)
     return response
+
+
+@router.get("/request_metrics")
+def request_metrics(reset: bool = False):
+    """Per-route wall time, query counts, ESPN calls and render time since startup"""
+    snapshot = route_timings.snapshot()
+    if reset:
+        route_timings.reset()
+    return JSONResponse(snapshot)
+
+
+def _closing(session: Session, chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """`chunks`, closing `session` (and its cursor) however the stream ends"""
+    try:
+        yield from chunks
+    finally:
+        session.close()
+
+
+@router.get("/export/{name}.{fmt}", dependencies=[Depends(_verify_api_key)])
+def export_dataset(name: str, fmt: str, season: Optional[int] = None):
+    """picks, games, game_lines, awards or weekly_results as csv or parquet, streamed"""
+    # outlives the request's dependencies, closed once the body is sent
+    session = Session(engine)
+    try:
+        chunks = export(session, name, fmt, season)
+    except ExportError as exc:
+        session.close()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+        ) from exc
+    body = _closing(session, chunks)
+    # a generator that never started has no finally to run: also close the
+    # session if the response is dropped before the first chunk
+    weakref.finalize(body, session.close)
+    filename = f"{name}-{season}.{fmt}" if season else f"{name}.{fmt}"
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
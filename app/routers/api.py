@@ -0,0 +1,413 @@
+# routers/api.py
+"""
+Read-only JSON API for the discord bot and other pollers.
+
+Every request needs an ``ApiKey`` token, either as ``Authorization: Bearer
+<token>`` or ``X-API-Key: <token>``.  Responses carry a strong ETag built from
+a cheap version query (row counts and the newest ``updated_at``), which is
+checked *before* the payload is built, so a poller whose data hasn't changed
+costs one aggregate query and gets a 304.
+"""
+
+import hashlib
+from typing import Callable, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse
+from starlette.responses import Response
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from db import engine
+from models import (
+    ApiKey,
+    Game,
+    Player,
+    PlayerGamePick,
+    PlayerProfileStats,
+    PlayerSeasonRecord,
+    Team,
+)
+from models.model_helpers import WeekInfo, current_week_info
+from app.projections import (
+    DEFAULT_SIMULATIONS,
+    UnknownWinner,
+    projection_cache,
+    state_key,
+    what_if,
+)
+
+router = APIRouter(
+    prefix="/api/v1", tags=["API"], default_response_class=ORJSONResponse
+)
+
+
+def _get_session():
+    with Session(engine) as session:
+        yield session
+
+
+def _get_current_week_info() -> WeekInfo:
+    return current_week_info()
+
+
+def _verify_api_key(request: Request, session: Session = Depends(_get_session)):
+    token: Optional[str] = request.headers.get("x-api-key")
+    scheme, _, credentials = request.headers.get("authorization", "").partition(" ")
+    if not token and scheme.lower() == "bearer":
+        token = credentials.strip()
+    if not token or not ApiKey.by_token(session, token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+def _etag(*version) -> str:
+    digest = hashlib.sha1(repr(version).encode(), usedforsecurity=False)
+    return f'"{digest.hexdigest()[:20]}"'
+
+
+def _versioned(request: Request, version: tuple, build: Callable[[], object]):
+    """304 when the client already has `version`, otherwise the built payload"""
+    etag = _etag(request.url.path, *version)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return ORJSONResponse(build(), headers=headers)
+
+
+def _table_version(session: Session, model, *where) -> tuple:
+    statement = select(func.count(), func.max(model.updated_at)).where(*where)
+    count, updated_at = session.exec(statement).one()
+    return count, updated_at.isoformat() if updated_at else None
+
+
+def _week_games_filter(week_info: WeekInfo) -> tuple:
+    return (
+        Game.season == week_info.season,
+        Game.season_type == week_info.season_type,
+        Game.week_no == week_info.week_no,
+    )
+
+
+def _week_picks_filter(week_info: WeekInfo) -> tuple:
+    return (
+        PlayerGamePick.season == week_info.season,
+        PlayerGamePick.season_type == week_info.season_type,
+        PlayerGamePick.week_no == week_info.week_no,
+    )
+
+
+def _game_json(game: Game) -> dict:
+    return {
+        "id": game.id,
+        "road_team_id": game.road_team_id,
+        "home_team_id": game.home_team_id,
+        "favorite_team_id": game.favorite_team_id,
+        "spread": game.spread,
+        "start_time": game.utc_start_time,
+        "status": game.game_status,
+        "road_team_score": game.road_team_score,
+        "home_team_score": game.home_team_score,
+    }
+
+
+def _team_json(team: Team) -> dict:
+    return {
+        "id": team.id,
+        "short_name": team.short_name,
+        "long_name": team.long_name,
+        "full_name": team.full_name,
+        "wins": team.wins,
+        "losses": team.losses,
+        "ties": team.ties,
+    }
+
+
+def _week_json(week_info: WeekInfo) -> dict:
+    return {
+        "season": week_info.season,
+        "season_type": week_info.season_type,
+        "week_no": week_info.week_no,
+    }
+
+
+@router.get("/weeks/{season}/{season_type}/{week_no}/games")
+def week_games(
+    request: Request,
+    season: int,
+    season_type: int,
+    week_no: int,
+    _key=Depends(_verify_api_key),
+    session: Session = Depends(_get_session),
+):
+    """The week's games and the teams playing in them"""
+    week_info = WeekInfo(season=season, season_type=season_type, week_no=week_no)
+    version = (
+        _table_version(session, Game, *_week_games_filter(week_info)),
+        _table_version(session, Team),
+    )
+
+    def build() -> dict:
+        games: List[Game] = Game.games_for_week(session=session, week_info=week_info)
+        team_ids = {g.home_team_id for g in games} | {g.road_team_id for g in games}
+        teams = session.exec(select(Team).where(Team.id.in_(team_ids))).all()
+        return {
+            "week": _week_json(week_info),
+            "games": [_game_json(game) for game in games],
+            "teams": [_team_json(team) for team in teams],
+        }
+
+    return _versioned(request, version, build)
+
+
+@router.get("/weeks/{season}/{season_type}/{week_no}/grid")
+def week_grid(
+    request: Request,
+    season: int,
+    season_type: int,
+    week_no: int,
+    _key=Depends(_verify_api_key),
+    session: Session = Depends(_get_session),
+):
+    """
+    Everybody's picks for the week, as on /allpicks.  Picks only show up once
+    their game has kicked off, so nothing leaks before the picks are locked.
+    """
+    week_info = WeekInfo(season=season, season_type=season_type, week_no=week_no)
+    version = (
+        _table_version(session, Game, *_week_games_filter(week_info)),
+        _table_version(session, PlayerGamePick, *_week_picks_filter(week_info)),
+    )
+
+    def build() -> dict:
+        games: List[Game] = Game.games_for_week(session=session, week_info=week_info)
+        started = {game.id for game in games if not game.is_pregame}
+        picks = PlayerGamePick.find_picks_for_week(week_info, session)
+        by_player: dict[int, List[PlayerGamePick]] = {}
+        for pick in picks:
+            by_player.setdefault(pick.player_id, []).append(pick)
+        players = session.exec(
+            select(Player).where(Player.id.in_(by_player.keys()))
+        ).all()
+        rows = []
+        for player in players:
+            # pylint: disable=protected-access
+            player_picks = by_player[player.id]
+            record = Player._record_from_picks(player_picks)
+            rows.append(
+                {
+                    "id": player.id,
+                    "nick_name": player.nick_name,
+                    "wins": record["wins"],
+                    "losses": record["losses"],
+                    "bonus": record["bonus"],
+                    "picks": [
+                        {
+                            "game_id": pick.game_id,
+                            "picked_team_id": pick.picked_team_id,
+                            "is_lock": pick.is_lock,
+                            "is_upset": pick.is_upset,
+                        }
+                        for pick in player_picks
+                        if pick.game_id in started
+                    ],
+                }
+            )
+        rows.sort(key=lambda row: row["wins"] + row["bonus"], reverse=True)
+        return {
+            "week": _week_json(week_info),
+            "games": [_game_json(game) for game in games],
+            "players": rows,
+        }
+
+    return _versioned(request, version, build)
+
+
+@router.get("/standings", name="api_standings")
+def standings(
+    request: Request,
+    season: Optional[int] = None,
+    _key=Depends(_verify_api_key),
+    session: Session = Depends(_get_session),
+):
+    """
+    Season standings for the active players, best first; with `season`, an
+    archived season's final standings for everyone who played it
+    """
+    if season is not None:
+        return _season_standings(request, session, season)
+    version = _table_version(session, Player)
+
+    def build() -> dict:
+        players = Player.active_players(session=session)
+        players.sort(key=lambda x: x.total_points, reverse=True)
+        return {
+            "players": [
+                {
+                    "id": player.id,
+                    "nick_name": player.nick_name,
+                    "wins": player.wins,
+                    "losses": player.losses,
+                    "bonus": player.bonus,
+                    "total_points": player.total_points,
+                    "winning_pct": round(player.winning_pct, 4),
+                }
+                for player in players
+            ]
+        }
+
+    return _versioned(request, version, build)
+
+
+def _season_standings(request: Request, session: Session, season: int):
+    if season not in PlayerSeasonRecord.archived_seasons(session=session):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"season {season} isn't archived",
+        )
+    version = _table_version(
+        session, PlayerSeasonRecord, PlayerSeasonRecord.season == season
+    )
+
+    def build() -> dict:
+        return {
+            "season": season,
+            "players": [
+                {
+                    "id": player.id,
+                    "nick_name": player.nick_name,
+                    "wins": record.wins,
+                    "losses": record.losses,
+                    "bonus": record.bonus,
+                    "total_points": record.total_points,
+                    "winning_pct": round(record.winning_pct, 4),
+                }
+                for record, player in PlayerSeasonRecord.leaderboard(
+                    session=session, season=season
+                )
+            ],
+        }
+
+    return _versioned(request, version, build)
+
+
+@router.get("/players/{player_id}/profile")
+def player_profile(
+    request: Request,
+    player_id: int,
+    _key=Depends(_verify_api_key),
+    session: Session = Depends(_get_session),
+):
+    """A player's weekly points, season rank, lock / upset rates and awards"""
+    player = session.get(Player, player_id)
+    if player is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    version = _table_version(
+        session, PlayerProfileStats, PlayerProfileStats.player_id == player_id
+    )
+
+    def build() -> dict:
+        stats = PlayerProfileStats.for_player(session, player_id)
+        return {"id": player.id, "nick_name": player.nick_name, **stats.chart_json()}
+
+    return _versioned(request, version, build)
+
+
+@router.get("/weeks/{season}/{season_type}/{week_no}/projections")
+def week_projections(
+    request: Request,
+    season: int,
+    season_type: int,
+    week_no: int,
+    simulations: int = Query(DEFAULT_SIMULATIONS, ge=1000, le=500_000),
+    _key=Depends(_verify_api_key),
+    session: Session = Depends(_get_session),
+    current_week: WeekInfo = Depends(_get_current_week_info),
+):
+    """
+    Each active player's chance of leading the season standings after the
+    week, winning the week and having a perfect week, from simulating the
+    week's games still to be decided.  The current week only: the projection
+    starts from today's season totals.
+    """
+    week_info = WeekInfo(season=season, season_type=season_type, week_no=week_no)
+    if week_info != current_week:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="projections are only available for the current week",
+        )
+    version = (state_key(session, week_info), simulations)
+
+    def build() -> dict:
+        projection = projection_cache.get(session, week_info, simulations)
+        return {
+            "week": _week_json(week_info),
+            "simulations": projection.simulations,
+            "open_games": projection.open_games,
+            "pregame_included": projection.pregame_included,
+            "players": [
+                {
+                    "id": row.player_id,
+                    "nick_name": row.nick_name,
+                    "season_points": row.season_points,
+                    "week_points": row.week_points,
+                    "expected_week_points": round(row.expected_week_points, 3),
+                    "first_after_week": round(row.first_after_week, 4),
+                    "week_win": round(row.week_win, 4),
+                    "perfect_week": round(row.perfect_week, 4),
+                }
+                for row in projection.players
+            ],
+        }
+
+    return _versioned(request, version, build)
+
+
+@router.get("/whatif")
+def current_week_what_if(
+    request: Request,
+    winner: List[int] = Query([]),
+    _key=Depends(_verify_api_key),
+    session: Session = Depends(_get_session),
+    week_info: WeekInfo = Depends(_get_current_week_info),
+):
+    """
+    Each active player's chance of winning the week, a perfect week and an in
+    your face award in the current week, if the teams in `winner` (repeat the
+    parameter) win their games
+    """
+    winners = sorted(set(winner))
+    version = (state_key(session, week_info), winners)
+
+    def build() -> dict:
+        try:
+            result = what_if(session, week_info, winners)
+        except UnknownWinner as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"team {exc} isn't playing in an undecided game this week",
+            ) from exc
+        return {
+            "week": _week_json(week_info),
+            "winners": winners,
+            "open_games": result.open_games,
+            "fixed_games": result.fixed_games,
+            "outcomes": result.outcomes,
+            "enumerated": result.enumerated,
+            "pregame_included": result.pregame_included,
+            "players": [
+                {
+                    "id": row.player_id,
+                    "nick_name": row.nick_name,
+                    "won_the_week": round(row.won_the_week, 4),
+                    "perfect_week": round(row.perfect_week, 4),
+                    "in_your_face": round(row.in_your_face, 4),
+                }
+                for row in result.players
+            ],
+        }
+
+    return _versioned(request, version, build)
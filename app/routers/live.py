@@ -0,0 +1,43 @@
+# routers/live.py
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Request, status
+from starlette.responses import StreamingResponse
+
+from app.live import score_broker, sse_frame, week_topic
+from models.model_helpers import WeekInfo
+
+router = APIRouter(prefix="/live", tags=["Live"])
+
+KEEPALIVE_SECONDS = 20
+# how long a browser waits before reconnecting after the stream drops
+RETRY_MS = 5000
+
+
+@router.get("/scores")
+async def live_scores(request: Request, season: int, season_type: int, week_no: int):
+    """Server-Sent Events stream of score changes for one week"""
+    if not request.cookies.get("tgfp-discord-id"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    topic = week_topic(
+        WeekInfo(season=season, season_type=season_type, week_no=week_no)
+    )
+
+    async def stream():
+        queue = score_broker.subscribe(topic)
+        try:
+            yield f"retry: {RETRY_MS}\n" + sse_frame("hello", {"week": topic})
+            while not await request.is_disconnected():
+                try:
+                    yield await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # proxies close connections that look idle
+                    yield ": keepalive\n\n"
+        finally:
+            score_broker.unsubscribe(topic, queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
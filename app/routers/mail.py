@@ -2,7 +2,6 @@ from pathlib import Path
 from typing import List, Optional
 
 from fastapi import APIRouter, Request, Form, Depends, HTTPException, status
-from fastapi.templating import Jinja2Templates
 from starlette.responses import JSONResponse
 from pydantic import BaseModel, EmailStr
 from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
@@ -10,7 +9,8 @@ from config import Config
 from db import engine
 from sqlmodel import Session
 
-from models import Player
+from models import current_player_cache
+from app.templating import templates
 
 config = Config.get_config()
 
@@ -35,8 +35,6 @@ conf = ConnectionConfig(
 
 router = APIRouter(prefix="/mail", tags=["mail"])
 
-templates = Jinja2Templates(directory=str(template_folder))
-
 
 def _get_session():
     with Session(engine) as session:
@@ -62,7 +60,7 @@ async def send_welcome(
     discord_id: int = Depends(_verify_player),
     session: Session = Depends(_get_session),
 ):
-    player: Player = Player.by_discord_id(session, discord_id)
+    player = current_player_cache.resolve(session, discord_id)
     context = {"player": player, "config": config}
     return templates.TemplateResponse(
         request=request, name="send_welcome.j2", context=context
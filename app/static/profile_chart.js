@@ -0,0 +1,62 @@
+// Draws the /profile charts from the JSON the page embeds
+// (PlayerProfileStats.chart_json).
+(function () {
+    var source = document.getElementById("profile_chart_data");
+    if (!source || typeof Chart === "undefined") {
+        return;
+    }
+    var data = JSON.parse(source.textContent);
+
+    new Chart(document.getElementById("profile_points_chart"), {
+        data: {
+            labels: data.labels,
+            datasets: [
+                {
+                    type: "bar",
+                    label: "Week points",
+                    data: data.week_points,
+                    backgroundColor: "#f0f3c5",
+                    borderColor: "#888",
+                    borderWidth: 1,
+                    yAxisID: "week"
+                },
+                {
+                    type: "line",
+                    label: "Season points",
+                    data: data.season_points,
+                    borderColor: "#a32f31",
+                    pointRadius: 2,
+                    yAxisID: "season"
+                }
+            ]
+        },
+        options: {
+            scales: {
+                week: {position: "left", beginAtZero: true},
+                season: {position: "right", beginAtZero: true, grid: {drawOnChartArea: false}}
+            }
+        }
+    });
+
+    new Chart(document.getElementById("profile_rank_chart"), {
+        type: "line",
+        data: {
+            labels: data.labels,
+            datasets: [
+                {
+                    label: "Place in the season",
+                    data: data.season_rank,
+                    borderColor: "#3c6e9f",
+                    pointRadius: 2,
+                    stepped: true
+                }
+            ]
+        },
+        options: {
+            scales: {
+                // first place at the top
+                y: {reverse: true, min: 1, ticks: {precision: 0}}
+            }
+        }
+    });
+})();
@@ -0,0 +1,210 @@
+"""
+Fingerprinted, precompressed static files.
+
+``python -m static_assets`` (run from the app dir; the Dockerfile does it at
+build time, and docker/entrypoint.sh again at start, since compose mounts
+./app over the image's copy) copies everything under ``static/`` to ``static/dist/`` with a
+content hash in the file name, writes ``.gz`` and ``.br`` variants of the text
+formats next to them, builds ``images/helmets.svg`` (every team helmet as a
+``<symbol>``, so a page of helmets is one request) and records the mapping in
+``static/dist/manifest.json``.
+
+Templates link assets with ``static_url('images/ari.svg')``, which resolves
+through the manifest.  :class:`StaticAssets` serves the precompressed variant
+the browser accepts, and marks fingerprinted files immutable.  Without a build
+everything still works, unfingerprinted and uncompressed.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import sys
+from pathlib import Path
+from typing import Optional
+
+from jinja2 import pass_context
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip alone still works
+    brotli = None
+
+STATIC_DIR = Path(__file__).parent / "static"
+DIST = "dist"
+MANIFEST = "manifest.json"
+HELMET_SPRITE = "images/helmets.svg"
+COMPRESSIBLE = {".css", ".js", ".svg", ".json", ".txt", ".html", ".map"}
+# (content-encoding, file suffix), best first
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+IMMUTABLE = "public, max-age=31536000, immutable"
+FINGERPRINTED = re.compile(r"\.[0-9a-f]{12}\.[^/.]+$")
+
+_SVG_ROOT = re.compile(r"<svg\b([^>]*)>(.*)</svg>", re.DOTALL)
+_VIEW_BOX = re.compile(r'viewBox="([^"]+)"')
+_ID = re.compile(r'\sid="[^"]*"')
+
+
+def helmet_symbol_id(short_name: str) -> str:
+    return f"helmet-{short_name}"
+
+
+def build_helmet_sprite(image_dir: Path) -> str:
+    """One SVG with a <symbol> per team helmet"""
+    symbols = []
+    for svg in sorted(image_dir.glob("*.svg")):
+        if svg.name == Path(HELMET_SPRITE).name:
+            continue
+        match = _SVG_ROOT.search(svg.read_text())
+        if not match:
+            continue
+        view_box = _VIEW_BOX.search(match.group(1))
+        view_box_attr = f' viewBox="{view_box.group(1)}"' if view_box else ""
+        # ids inside the helmets all clash once they share a document
+        body = _ID.sub("", match.group(2)).strip()
+        symbols.append(
+            f'<symbol id="{helmet_symbol_id(svg.stem)}"{view_box_attr}>{body}</symbol>'
+        )
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        'xmlns:xlink="http://www.w3.org/1999/xlink" style="display:none">\n'
+        + "\n".join(symbols)
+        + "\n</svg>\n"
+    )
+
+
+def _fingerprinted_name(relative: str, content: bytes) -> str:
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    path = Path(relative)
+    return str(path.with_name(f"{path.stem}.{digest}{path.suffix}"))
+
+
+def _write_variants(target: Path, content: bytes):
+    if target.suffix not in COMPRESSIBLE:
+        return
+    target.with_name(target.name + ".gz").write_bytes(
+        gzip.compress(content, compresslevel=9, mtime=0)
+    )
+    if brotli is not None:
+        target.with_name(target.name + ".br").write_bytes(
+            brotli.compress(content, quality=11)
+        )
+
+
+def build(static_dir: Path = STATIC_DIR) -> dict[str, str]:
+    """Rebuild ``static_dir/dist``; returns the manifest"""
+    dist = static_dir / DIST
+    if dist.exists():
+        shutil.rmtree(dist)
+    dist.mkdir()
+
+    sources: dict[str, bytes] = {}
+    for path in sorted(static_dir.rglob("*")):
+        relative = path.relative_to(static_dir)
+        if path.is_file() and relative.parts[0] != DIST:
+            sources[relative.as_posix()] = path.read_bytes()
+    sources[HELMET_SPRITE] = build_helmet_sprite(static_dir / "images").encode()
+
+    manifest = {}
+    for relative, content in sources.items():
+        fingerprinted = _fingerprinted_name(relative, content)
+        target = dist / fingerprinted
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+        _write_variants(target, content)
+        manifest[relative] = f"{DIST}/{fingerprinted}"
+    (dist / MANIFEST).write_text(json.dumps(manifest, indent=1, sort_keys=True))
+    return manifest
+
+
+def load_manifest(static_dir: Path = STATIC_DIR) -> dict[str, str]:
+    try:
+        return json.loads((static_dir / DIST / MANIFEST).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+_manifest: dict[str, str] = load_manifest()
+
+
+def asset_path(path: str) -> str:
+    """The path under /static to link for `path`"""
+    return _manifest.get(path, path)
+
+
+def has_asset(path: str) -> bool:
+    """True for files that only exist once built, such as the helmet sprite"""
+    return path in _manifest
+
+
+@pass_context
+def static_url(context: dict, path: str) -> str:
+    """Jinja global: ``url_for('static', ...)`` through the manifest"""
+    return str(context["request"].url_for("static", path=asset_path(path)))
+
+
+class StaticAssets(StaticFiles):
+    """StaticFiles that serves precompressed variants and caches fingerprints"""
+
+    def _precompressed(
+        self, full_path: str, request_headers: Headers
+    ) -> tuple[Optional[str], Optional[tuple[str, os.stat_result]]]:
+        # pylint: disable=import-outside-toplevel
+        # here, not at the top: ``python -m static_assets`` runs without the
+        # app package
+        from app.compression import choose_encoding
+
+        encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+        if encoding is None:
+            return None, None
+        variant = full_path + dict(ENCODINGS)[encoding]
+        try:
+            return encoding, (variant, os.stat(variant))
+        except OSError:
+            return None, None
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        full_path = str(full_path)
+        request_headers = Headers(scope=scope)
+        media_type = mimetypes.guess_type(full_path)[0] or "text/plain"
+        encoding, variant = None, None
+        if Path(full_path).suffix in COMPRESSIBLE:
+            encoding, variant = self._precompressed(full_path, request_headers)
+        if variant:
+            full_path, stat_result = variant
+
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            stat_result=stat_result,
+            media_type=media_type,
+        )
+        if encoding:
+            response.headers["content-encoding"] = encoding
+        response.headers["vary"] = "Accept-Encoding"
+        if FINGERPRINTED.search(scope.get("path", "")):
+            response.headers["cache-control"] = IMMUTABLE
+        else:
+            # revalidate: the name doesn't change when the content does
+            response.headers["cache-control"] = "no-cache"
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+if __name__ == "__main__":
+    built = build(Path(sys.argv[1]) if len(sys.argv) > 1 else STATIC_DIR)
+    print(f"{len(built)} static assets fingerprinted into {STATIC_DIR / DIST}")
@@ -0,0 +1,47 @@
+"""
+The one Jinja environment every router renders through.
+
+Compiled templates go to a filesystem bytecode cache, so a fresh worker loads
+them instead of parsing, and ``warm_templates`` compiles the lot during startup
+so the first requests after a deploy don't pay for it.  Outside production the
+environment still checks the files for changes on every render.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import jinja2
+
+from app.config import Config
+from app.metrics import TimedJinja2Templates
+from app.static_assets import has_asset, static_url
+
+config = Config.get_config()
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+BYTECODE_CACHE_DIR = Path(
+    os.getenv("TEMPLATE_CACHE_DIR", Path(tempfile.gettempdir()) / "tgfp-jinja")
+)
+
+
+def _environment() -> jinja2.Environment:
+    BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(TEMPLATE_DIR),
+        autoescape=True,
+        auto_reload=config.ENVIRONMENT != "production",
+        bytecode_cache=jinja2.FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR)),
+    )
+
+
+templates = TimedJinja2Templates(env=_environment())
+templates.env.globals.update(static_url=static_url, has_asset=has_asset)
+
+
+def warm_templates() -> int:
+    """Compile every template up front; returns how many there were"""
+    names = templates.env.list_templates(extensions=["j2", "html"])
+    for name in names:
+        templates.env.get_template(name)
+    return len(names)
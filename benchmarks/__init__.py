@@ -0,0 +1 @@
+"""Benchmarks for the TGFP hot paths (see benchmarks/README.md)"""
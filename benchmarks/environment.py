@@ -0,0 +1,46 @@
+"""
+Make the app importable outside its container.
+
+Must be called before anything under ``app`` is imported: the app reads its
+configuration (and creates its engines) at import time.
+"""
+
+import os
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+APP_DIR = ROOT / "app"
+
+# The app only needs these to be present; benchmarks never talk to discord,
+# the mail server or sentry.
+_PLACEHOLDER_ENV = {
+    "APP_VERSION": "benchmark",
+    "COOKIE_RETENTION_DAYS": "365",
+    "DISCORD_CLIENT_ID": "0",
+    "DISCORD_CLIENT_SECRET": "benchmark",
+    "DISCORD_REDIRECT_URI": "http://localhost/auth/callback",
+    "ENVIRONMENT": "benchmark",
+    "MAIL_FROM": "benchmark@example.com",
+    "MAIL_PASSWORD": "benchmark",
+    "MAIL_PORT": "587",
+    "MAIL_SERVER": "localhost",
+    "MAIL_USERNAME": "benchmark",
+    "SESSION_SECRET_KEY": "benchmark",
+}
+
+
+def bootstrap(database_url: str) -> None:
+    """Point the app at `database_url` and put both import roots on sys.path"""
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("SCHED_DB_URL", database_url)
+    for key, value in _PLACEHOLDER_ENV.items():
+        os.environ.setdefault(key, value)
+    # the app imports itself both as `app.x` and as top level `x`
+    for path in (str(ROOT), str(APP_DIR)):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    # templates and static files are resolved relative to the app dir
+    os.chdir(APP_DIR)
+    # main's lifespan normally pulls this in; the jobs log through it
+    import sentry_sdk.logger  # noqa: F401  pylint: disable=import-outside-toplevel
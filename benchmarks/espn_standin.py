@@ -0,0 +1,249 @@
+"""
+Local stand-in for site.api.espn.com.
+
+Serves a scoreboard / teams / standings payload (recorded JSON files, or the
+synthetic ones from :mod:`benchmarks.fixtures`) and replays the week's games on
+an accelerated clock: each game goes from scheduled, through in-progress with
+climbing scores, to final.  Errors and latency can be injected to see how the
+pollers behave when ESPN is having a bad Sunday.
+
+    python -m benchmarks.espn_standin --speed 120 --error-rate 0.05 --latency-ms 150
+    ESPN_SITE_API_HOST=http://127.0.0.1:6802 uvicorn main:app ...
+
+``GET /_standin/state`` shows the virtual clock, ``POST /_standin/reset``
+restarts the replay.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import json
+import pathlib
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from dateutil import parser as date_parser
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from benchmarks import fixtures
+
+GAME_LENGTH = timedelta(hours=3, minutes=15)
+SITE_PREFIX = "/apis/site/v2/sports/football/nfl"
+STANDINGS_PATHS = (
+    "/apis/v2/sports/football/nfl/standings",
+    "/apis/v2/sports/football/nfl//standings",
+)
+
+
+@dataclass
+class StandinSettings:
+    speed: float = 60.0
+    error_rate: float = 0.0
+    error_statuses: tuple[int, ...] = (502, 503)
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    seed: int = 0
+
+
+@dataclass
+class Replay:
+    """The recorded week plus an accelerated clock to play it back on"""
+
+    scoreboard: dict
+    teams: dict
+    standings: dict
+    settings: StandinSettings
+    final_scores: dict[str, tuple[int, int]] = field(default_factory=dict)
+    _virtual_start: datetime = field(init=False)
+    _real_start: float = field(init=False)
+
+    def __post_init__(self):
+        rng = random.Random(self.settings.seed)
+        for event in self.scoreboard["events"]:
+            self.final_scores[event["id"]] = (rng.randint(3, 38), rng.randint(3, 38))
+        self.reset()
+
+    def reset(self):
+        kickoffs = [date_parser.parse(e["date"]) for e in self.scoreboard["events"]]
+        first = min(kickoffs) if kickoffs else datetime.now(timezone.utc)
+        self._virtual_start = first - timedelta(minutes=5)
+        self._real_start = time.monotonic()
+
+    def now(self) -> datetime:
+        elapsed = time.monotonic() - self._real_start
+        return self._virtual_start + timedelta(seconds=elapsed * self.settings.speed)
+
+    def _event_at(self, event: dict, now: datetime) -> dict:
+        event = copy.deepcopy(event)
+        kickoff = date_parser.parse(event["date"])
+        progress = (now - kickoff) / GAME_LENGTH
+        home_final, road_final = self.final_scores[event["id"]]
+        if home_final == road_final:
+            home_final += 3
+        if progress <= 0:
+            status, progress = "STATUS_SCHEDULED", 0.0
+        elif progress < 1:
+            status = "STATUS_IN_PROGRESS"
+        else:
+            status, progress = "STATUS_FINAL", 1.0
+        status_data = {"type": {"name": status, "detail": f"{progress:.0%} played"}}
+        event["status"] = status_data
+        competition = event["competitions"][0]
+        competition["status"] = status_data
+        for competitor in competition["competitors"]:
+            final = home_final if competitor["homeAway"] == "home" else road_final
+            competitor["score"] = str(int(final * progress))
+            competitor.pop("winner", None)
+            if status == "STATUS_FINAL":
+                competitor["winner"] = final == max(home_final, road_final)
+        return event
+
+    def scoreboard_now(self) -> dict:
+        now = self.now()
+        payload = copy.copy(self.scoreboard)
+        payload["events"] = [self._event_at(e, now) for e in self.scoreboard["events"]]
+        return payload
+
+    def state(self) -> dict:
+        now = self.now()
+        statuses: dict[str, int] = {}
+        for event in self.scoreboard["events"]:
+            name = self._event_at(event, now)["status"]["type"]["name"]
+            statuses[name] = statuses.get(name, 0) + 1
+        return {
+            "virtual_now": now.isoformat(),
+            "speed": self.settings.speed,
+            "games": statuses,
+        }
+
+    @property
+    def all_final(self) -> bool:
+        return self.state()["games"].get("STATUS_FINAL", 0) == len(
+            self.scoreboard["events"]
+        )
+
+
+def create_app(replay: Replay) -> Starlette:
+    settings = replay.settings
+    rng = random.Random(settings.seed)
+
+    async def _misbehave() -> Optional[JSONResponse]:
+        delay = settings.latency_ms + rng.uniform(0, settings.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if settings.error_rate and rng.random() < settings.error_rate:
+            return JSONResponse(
+                {"error": "injected"}, status_code=rng.choice(settings.error_statuses)
+            )
+        return None
+
+    async def scoreboard(_request: Request):
+        return await _misbehave() or JSONResponse(replay.scoreboard_now())
+
+    async def teams(_request: Request):
+        return await _misbehave() or JSONResponse(replay.teams)
+
+    async def standings(_request: Request):
+        return await _misbehave() or JSONResponse(replay.standings)
+
+    async def state(_request: Request):
+        return JSONResponse(replay.state())
+
+    async def reset(_request: Request):
+        replay.reset()
+        return JSONResponse(replay.state())
+
+    routes = [
+        Route(f"{SITE_PREFIX}/scoreboard", scoreboard),
+        Route(f"{SITE_PREFIX}/teams", teams),
+        Route("/_standin/state", state),
+        Route("/_standin/reset", reset, methods=["POST"]),
+    ]
+    routes += [Route(path, standings) for path in STANDINGS_PATHS]
+    return Starlette(routes=routes)
+
+
+def _load(path: Optional[pathlib.Path], default: dict) -> dict:
+    return json.loads(path.read_text()) if path else default
+
+
+def build_replay(
+    settings: StandinSettings,
+    scoreboard: Optional[pathlib.Path] = None,
+    teams: Optional[pathlib.Path] = None,
+    standings: Optional[pathlib.Path] = None,
+    season: int = 2025,
+    season_type: int = 2,
+    week_no: int = 1,
+    games: int = 16,
+) -> Replay:
+    """Recorded payloads where given, synthetic ones for the rest"""
+    synthetic_scoreboard = None
+    if scoreboard is None:
+        synthetic_scoreboard = fixtures.scoreboard_payload(
+            season,
+            season_type,
+            week_no,
+            games,
+            rng=random.Random(settings.seed),
+        )
+    return Replay(
+        scoreboard=_load(scoreboard, synthetic_scoreboard),
+        teams=_load(teams, fixtures.teams_payload()),
+        standings=_load(standings, fixtures.standings_payload()),
+        settings=settings,
+    )
+
+
+def main(argv: Optional[list[str]] = None):
+    import uvicorn  # pylint: disable=import-outside-toplevel
+
+    parser = argparse.ArgumentParser(description="Local ESPN stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6802)
+    parser.add_argument("--scoreboard", type=pathlib.Path, help="recorded JSON")
+    parser.add_argument("--teams", type=pathlib.Path, help="recorded JSON")
+    parser.add_argument("--standings", type=pathlib.Path, help="recorded JSON")
+    parser.add_argument("--season", type=int, default=2025)
+    parser.add_argument("--season-type", type=int, default=2)
+    parser.add_argument("--week", type=int, default=1)
+    parser.add_argument("--games", type=int, default=16)
+    parser.add_argument(
+        "--speed", type=float, default=60.0, help="virtual seconds per real second"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    settings = StandinSettings(
+        speed=args.speed,
+        error_rate=args.error_rate,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        seed=args.seed,
+    )
+    replay = build_replay(
+        settings,
+        args.scoreboard,
+        args.teams,
+        args.standings,
+        args.season,
+        args.season_type,
+        args.week,
+        args.games,
+    )
+    uvicorn.run(create_app(replay), host=args.host, port=args.port, access_log=False)
+
+
+if __name__ == "__main__":
+    main()
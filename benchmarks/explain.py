@@ -0,0 +1,130 @@
+"""
+Check that the hot query shapes are served by the indexes meant for them.
+
+    python -m benchmarks.explain
+    python -m benchmarks.explain --database-url postgresql+psycopg://...
+
+Builds the synthetic league (the database is DROPPED and rebuilt, like
+``benchmarks.run``), runs EXPLAIN for each query and exits non-zero when a
+plan doesn't use its index.  On Postgres sequential scans are disabled for
+the check, since on a small league the planner rightly prefers them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Optional
+
+from benchmarks.environment import bootstrap
+from benchmarks.run import DEFAULT_DATABASE_URL
+
+
+def hot_queries(spec) -> list[tuple[str, str, object]]:
+    """(name, expected index, statement) for each query shape"""
+    # pylint: disable=import-outside-toplevel
+    from sqlmodel import select
+
+    from models import Game, Player, PlayerAward, PlayerGamePick
+
+    season, season_type, week_no = spec.current_season, spec.season_type, 3
+    return [
+        (
+            "Game.games_for_week",
+            "ix_game_week_start",
+            select(Game)
+            .where(Game.season == season)
+            .where(Game.week_no == week_no)
+            .where(Game.season_type == season_type)
+            .order_by(Game.start_time),
+        ),
+        (
+            "PlayerGamePick.find_picks_for_week",
+            "ix_playergamepick_week",
+            select(PlayerGamePick)
+            .where(PlayerGamePick.week_no == week_no)
+            .where(PlayerGamePick.season == season)
+            .where(PlayerGamePick.season_type == season_type),
+        ),
+        (
+            "Player.picks_for_week",
+            "ix_playergamepick_player_week",
+            select(PlayerGamePick)
+            .where(PlayerGamePick.player_id == 1)
+            .where(PlayerGamePick.season == season)
+            .where(PlayerGamePick.season_type == season_type)
+            .where(PlayerGamePick.week_no == week_no),
+        ),
+        (
+            "upsert_award_with_args",
+            "ix_playeraward_player_award_week",
+            select(PlayerAward)
+            .where(PlayerAward.player_id == 1)
+            .where(PlayerAward.award_id == 1)
+            .where(PlayerAward.season == season)
+            .where(PlayerAward.season_type == season_type)
+            .where(PlayerAward.week_no == week_no),
+        ),
+        (
+            "Player.by_discord_id",
+            "ix_player_discord_id",
+            select(Player).where(Player.discord_id == 1_000_000).limit(1),
+        ),
+    ]
+
+
+def explain(connection, statement) -> str:
+    """The plan for `statement` as text"""
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import text
+
+    sql = str(
+        statement.compile(
+            dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+        )
+    )
+    if connection.dialect.name == "sqlite":
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        return "\n".join(row[-1] for row in rows)
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        return json.dumps(plan, indent=1)
+    return "\n".join(str(row) for row in connection.execute(text(f"EXPLAIN {sql}")))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="EXPLAIN the hot queries")
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--players", type=int, default=30)
+    parser.add_argument("--seasons", type=int, default=2)
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args(argv)
+
+    bootstrap(args.database_url)
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import text
+
+    from db import engine
+    from benchmarks.league import LeagueSpec, generate_league
+
+    spec = LeagueSpec(players=args.players, seasons=args.seasons)
+    generate_league(engine, spec)
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
+
+    failures = 0
+    for name, index, statement in hot_queries(spec):
+        with engine.begin() as connection:
+            plan = explain(connection, statement)
+        uses_index = index in plan
+        failures += 0 if uses_index else 1
+        print(f"{'ok ' if uses_index else 'MISSING'} {name:<36} {index}")
+        if args.verbose or not uses_index:
+            print("    " + plan.replace("\n", "\n    "))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
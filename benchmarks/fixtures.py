@@ -0,0 +1,171 @@
+"""
+Synthetic ESPN payloads shaped like site.api.espn.com responses.
+
+Only the keys ``ESPNNfl`` actually reads are filled in, so these stay small
+while still exercising the same parsing code as the real feed.
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+
+# (abbreviation, location, short display name) -- abbreviations match the
+# helmet images in app/static/images
+TEAMS: list[tuple[str, str, str]] = [
+    ("ari", "Arizona", "Cardinals"),
+    ("atl", "Atlanta", "Falcons"),
+    ("bal", "Baltimore", "Ravens"),
+    ("buf", "Buffalo", "Bills"),
+    ("car", "Carolina", "Panthers"),
+    ("chi", "Chicago", "Bears"),
+    ("cin", "Cincinnati", "Bengals"),
+    ("cle", "Cleveland", "Browns"),
+    ("dal", "Dallas", "Cowboys"),
+    ("den", "Denver", "Broncos"),
+    ("det", "Detroit", "Lions"),
+    ("gb", "Green Bay", "Packers"),
+    ("hou", "Houston", "Texans"),
+    ("ind", "Indianapolis", "Colts"),
+    ("jac", "Jacksonville", "Jaguars"),
+    ("kc", "Kansas City", "Chiefs"),
+    ("la", "Los Angeles", "Rams"),
+    ("mia", "Miami", "Dolphins"),
+    ("min", "Minnesota", "Vikings"),
+    ("ne", "New England", "Patriots"),
+    ("no", "New Orleans", "Saints"),
+    ("nyg", "New York", "Giants"),
+    ("nyj", "New York", "Jets"),
+    ("oak", "Las Vegas", "Raiders"),
+    ("phi", "Philadelphia", "Eagles"),
+    ("pit", "Pittsburgh", "Steelers"),
+    ("sd", "Los Angeles", "Chargers"),
+    ("sea", "Seattle", "Seahawks"),
+    ("sf", "San Francisco", "49ers"),
+    ("tb", "Tampa Bay", "Buccaneers"),
+    ("ten", "Tennessee", "Titans"),
+    ("was", "Washington", "Commanders"),
+]
+
+
+def team_uid(index: int) -> str:
+    return f"s:20~l:28~t:{index + 1}"
+
+
+def teams_payload() -> dict:
+    """The /teams response"""
+    teams = []
+    for index, (abbr, location, name) in enumerate(TEAMS):
+        teams.append(
+            {
+                "team": {
+                    "uid": team_uid(index),
+                    "location": location,
+                    "shortDisplayName": name,
+                    "abbreviation": abbr.upper(),
+                    "displayName": f"{location} {name}",
+                    "logos": [{"href": f"https://example.invalid/{abbr}.png"}],
+                    "color": "000000",
+                    "alternateColor": "ffffff",
+                }
+            }
+        )
+    return {"sports": [{"leagues": [{"teams": teams}]}]}
+
+
+def standings_payload(rng: random.Random | None = None) -> dict:
+    """The /standings response, AFC first then NFC"""
+    rng = rng or random.Random(0)
+    entries = []
+    for index in range(len(TEAMS)):
+        wins = rng.randint(0, 17)
+        entries.append(
+            {
+                "team": {"uid": team_uid(index)},
+                "stats": [
+                    {"type": "wins", "value": wins},
+                    {"type": "losses", "value": 17 - wins},
+                    {"type": "ties", "value": 0},
+                ],
+            }
+        )
+    half = len(entries) // 2
+    return {
+        "children": [
+            {"standings": {"entries": entries[:half]}},
+            {"standings": {"entries": entries[half:]}},
+        ]
+    }
+
+
+def event_payload(
+    event_id: int,
+    season: int,
+    season_type: int,
+    week_no: int,
+    home_index: int,
+    road_index: int,
+    start_time: datetime,
+    status: str = "STATUS_SCHEDULED",
+    home_score: int = 0,
+    road_score: int = 0,
+    spread: float | None = 3.5,
+) -> dict:
+    """A single scoreboard event"""
+    home_abbr = TEAMS[home_index][0].upper()
+    status_data = {"type": {"name": status, "detail": status.title()}}
+    competitors = [
+        {"homeAway": "home", "uid": team_uid(home_index), "score": str(home_score)},
+        {"homeAway": "away", "uid": team_uid(road_index), "score": str(road_score)},
+    ]
+    if status == "STATUS_FINAL":
+        competitors[0]["winner"] = home_score > road_score
+        competitors[1]["winner"] = road_score > home_score
+    competition: dict = {"status": status_data, "competitors": competitors}
+    if spread is not None:
+        details = "EVEN" if spread == 0 else f"{home_abbr} -{spread}"
+        competition["odds"] = [{"details": details}]
+    return {
+        "uid": f"s:20~l:28~e:{event_id}",
+        "id": str(event_id),
+        "date": start_time.strftime("%Y-%m-%dT%H:%MZ"),
+        "name": f"{TEAMS[road_index][2]} at {TEAMS[home_index][2]}",
+        "week": {"number": week_no},
+        "season": {"year": season, "type": season_type},
+        "status": status_data,
+        "competitions": [competition],
+    }
+
+
+def scoreboard_payload(
+    season: int,
+    season_type: int,
+    week_no: int,
+    games: int = 16,
+    first_kickoff: datetime | None = None,
+    rng: random.Random | None = None,
+) -> dict:
+    """A /scoreboard response with `games` pregame events for the week"""
+    rng = rng or random.Random(week_no)
+    first_kickoff = first_kickoff or datetime.now(timezone.utc) + timedelta(days=2)
+    order = list(range(len(TEAMS)))
+    rng.shuffle(order)
+    events = []
+    for game_no in range(min(games, len(TEAMS) // 2)):
+        events.append(
+            event_payload(
+                event_id=season * 10000 + week_no * 100 + game_no,
+                season=season,
+                season_type=season_type,
+                week_no=week_no,
+                home_index=order[2 * game_no],
+                road_index=order[2 * game_no + 1],
+                start_time=first_kickoff + timedelta(hours=3 * (game_no // 4)),
+                spread=rng.choice([0, 1.5, 2.5, 3, 3.5, 6.5, 7, 10.5]),
+            )
+        )
+    return {
+        "season": {"year": season, "type": season_type},
+        "week": {"number": week_no},
+        "events": events,
+    }
@@ -0,0 +1,173 @@
+"""
+Synthetic league generator.
+
+Builds teams, players, games and picks with the app's own models.  Every week
+is final except the last week of the last season, which is left pregame and
+un-picked so the picks page and the picks form have something to do.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, select
+
+from benchmarks.fixtures import TEAMS
+
+
+@dataclass
+class LeagueSpec:
+    players: int = 30
+    seasons: int = 2
+    weeks: int = 18
+    games_per_week: int = 16
+    first_season: int = 2024
+    season_type: int = 2
+    seed: int = 1
+    # leave the last week pregame and un-picked (False: don't create it at all)
+    open_week: bool = True
+
+    @property
+    def current_season(self) -> int:
+        return self.first_season + self.seasons - 1
+
+
+def _teams(session: Session):
+    from models import Team
+
+    for index, (abbr, location, name) in enumerate(TEAMS):
+        session.add(
+            Team(
+                city=location,
+                long_name=name,
+                losses=0,
+                short_name=abbr,
+                ties=0,
+                wins=0,
+                full_name=f"{location} {name}",
+                logo_url="",
+                tgfp_nfl_team_id=f"s:20~l:28~t:{index + 1}",
+                discord_emoji="",
+            )
+        )
+    session.commit()
+    return list(session.exec(select(Team).order_by(Team.id)).all())
+
+
+def _players(session: Session, spec: LeagueSpec):
+    from models import Player
+
+    for number in range(spec.players):
+        session.add(
+            Player(
+                first_name=f"Player{number}",
+                last_name="Bench",
+                nick_name=f"p{number}",
+                active=True,
+                wins=0,
+                losses=0,
+                bonus=0,
+                email=f"player{number}@example.com",
+                discord_id=1_000_000 + number,
+            )
+        )
+    session.commit()
+    return list(session.exec(select(Player).order_by(Player.id)).all())
+
+
+def _week_games(spec: LeagueSpec, season: int, week_no: int, teams, rng, is_final):
+    kickoff = datetime(season, 9, 7, 17, tzinfo=timezone.utc) + timedelta(
+        weeks=week_no - 1
+    )
+    if not is_final:
+        kickoff = datetime.now(timezone.utc) + timedelta(days=2)
+    order = list(teams)
+    rng.shuffle(order)
+    rows = []
+    for game_no in range(min(spec.games_per_week, len(order) // 2)):
+        home, road = order[2 * game_no], order[2 * game_no + 1]
+        home_score = rng.randint(0, 40) if is_final else 0
+        road_score = rng.randint(0, 40) if is_final else 0
+        if is_final and home_score == road_score:
+            home_score += 3
+        rows.append(
+            {
+                "favorite_team_id": rng.choice([home.id, road.id]),
+                "road_team_id": road.id,
+                "home_team_id": home.id,
+                "game_status": "STATUS_FINAL" if is_final else "STATUS_SCHEDULED",
+                "spread": rng.choice([1.5, 2.5, 3.0, 3.5, 6.5, 7.0, 10.5]),
+                "start_time": kickoff + timedelta(hours=3 * (game_no // 4)),
+                "week_no": week_no,
+                "season_type": spec.season_type,
+                "road_team_score": road_score,
+                "home_team_score": home_score,
+                "season": season,
+                "tgfp_nfl_game_id": f"bench:{season}:{spec.season_type}:{week_no}:{game_no}",
+            }
+        )
+    return rows
+
+
+def generate_league(engine, spec: LeagueSpec) -> None:
+    """Drop and recreate every table on `engine`, then fill it per `spec`"""
+    from models import Game, GamePickStats, PlayerGamePick
+    from models.award_helpers import init_award_table
+
+    rng = random.Random(spec.seed)
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    init_award_table()
+    with Session(engine) as session:
+        teams = _teams(session)
+        players = _players(session, spec)
+        game_rows = []
+        for season in range(spec.first_season, spec.current_season + 1):
+            for week_no in range(1, spec.weeks + 1):
+                is_final = not (season == spec.current_season and week_no == spec.weeks)
+                if not is_final and not spec.open_week:
+                    continue
+                game_rows.extend(
+                    _week_games(spec, season, week_no, teams, rng, is_final)
+                )
+        session.execute(insert(Game), game_rows)
+        session.commit()
+
+        pick_rows = []
+        games = session.exec(select(Game).order_by(Game.id)).all()
+        by_week: dict[tuple[int, int], list[Game]] = {}
+        for game in games:
+            if game.is_final:
+                by_week.setdefault((game.season, game.week_no), []).append(game)
+        for (season, week_no), week_games in by_week.items():
+            for player in players:
+                lock_game = rng.choice(week_games)
+                upset_game = rng.choice(week_games)
+                for game in week_games:
+                    underdog = (
+                        game.road_team_id
+                        if game.favorite_team_id == game.home_team_id
+                        else game.home_team_id
+                    )
+                    picked = rng.choice([game.home_team_id, game.road_team_id])
+                    if game is upset_game:
+                        picked = underdog
+                    pick_rows.append(
+                        {
+                            "player_id": player.id,
+                            "game_id": game.id,
+                            "picked_team_id": picked,
+                            "season": season,
+                            "season_type": spec.season_type,
+                            "week_no": week_no,
+                            "is_lock": game is lock_game,
+                            "is_upset": game is upset_game,
+                        }
+                    )
+        for start in range(0, len(pick_rows), 5000):
+            session.execute(insert(PlayerGamePick), pick_rows[start : start + 5000])
+        GamePickStats.rebuild(session)
+        session.commit()
@@ -0,0 +1,185 @@
+"""
+End to end game-day run of the job pipeline against the ESPN stand-in.
+
+Builds a league whose last week doesn't exist yet, starts the stand-in, then
+runs the real jobs: ``create_the_picks`` for the week, the per-game
+``update_a_game`` pollers (on a thread pool the size of the scheduler's) until
+the replay has every game final, and finally ``update_all_awards``.
+
+    python -m benchmarks.pipeline --speed 900 --poll-interval 1 --error-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import socket
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from benchmarks.environment import bootstrap
+from benchmarks.run import DEFAULT_DATABASE_URL
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_standin(replay, port: int):
+    # pylint: disable=import-outside-toplevel
+    import uvicorn
+
+    from benchmarks.espn_standin import create_app
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            create_app(replay), host="127.0.0.1", port=port, log_level="warning"
+        )
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    # pylint: disable=import-outside-toplevel,too-many-locals
+    parser = argparse.ArgumentParser(description="Game-day pipeline benchmark")
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--players", type=int, default=30)
+    parser.add_argument("--weeks", type=int, default=18)
+    parser.add_argument("--games", type=int, default=16)
+    parser.add_argument("--speed", type=float, default=900.0)
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=600.0)
+    args = parser.parse_args(argv)
+
+    import os
+
+    port = _free_port()
+    os.environ["ESPN_SITE_API_HOST"] = f"http://127.0.0.1:{port}"
+    bootstrap(args.database_url)
+
+    from sqlmodel import Session
+
+    from db import engine, jobs_engine
+    from app.metrics import instrument_engine, track_stats
+    from jobs import award_update_all
+    from jobs.create_picks import create_the_picks
+    from jobs.update_game import update_a_game
+    from models import Game
+    from models.model_helpers import WeekInfo
+
+    from benchmarks.espn_standin import StandinSettings, build_replay
+    from benchmarks.league import LeagueSpec, generate_league
+
+    spec = LeagueSpec(
+        players=args.players, seasons=1, weeks=args.weeks, open_week=False
+    )
+    week_info = WeekInfo(spec.current_season, spec.season_type, spec.weeks)
+    replay = build_replay(
+        StandinSettings(
+            speed=args.speed, error_rate=args.error_rate, latency_ms=args.latency_ms
+        ),
+        season=week_info.season,
+        season_type=week_info.season_type,
+        week_no=week_info.week_no,
+        games=args.games,
+    )
+    server = _start_standin(replay, port)
+    instrument_engine(engine)
+    instrument_engine(jobs_engine)
+    generate_league(engine, spec)
+
+    started = time.perf_counter()
+    with track_stats() as stats:
+        create_the_picks(week_info=week_info)
+    print(
+        f"create_the_picks: {(time.perf_counter() - started) * 1000:.0f}ms, "
+        f"{stats.db_queries} queries, {stats.espn_calls} ESPN calls"
+    )
+    with Session(engine) as session:
+        game_ids = [g.id for g in Game.games_for_week(session, week_info)]
+
+    poll_times: list[float] = []
+    failures: Counter[str] = Counter()
+    polls = 0
+    espn_calls = 0
+    lock = threading.Lock()
+
+    def poll(game_id: int):
+        nonlocal espn_calls
+        job_started = time.perf_counter()
+        with track_stats() as job_stats:
+            try:
+                update_a_game(game_id)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                with lock:
+                    failures[type(exc).__name__] += 1
+        with lock:
+            poll_times.append(time.perf_counter() - job_started)
+            espn_calls += job_stats.espn_calls
+
+    def still_live() -> list[int]:
+        # the scheduler drops a game's job once the game is final
+        with Session(engine) as session:
+            games = Game.games_for_week(session, week_info)
+            return [g.id for g in games if not g.is_final]
+
+    replay.reset()
+    day_started = time.perf_counter()
+    with ThreadPoolExecutor(args.workers) as pool:
+        while game_ids and time.perf_counter() - day_started < args.timeout:
+            round_started = time.perf_counter()
+            list(pool.map(poll, game_ids))
+            polls += 1
+            game_ids = still_live()
+            time.sleep(
+                max(0.0, args.poll_interval - (time.perf_counter() - round_started))
+            )
+    day_seconds = time.perf_counter() - day_started
+
+    award_update_all.send_award_notification = lambda session: None
+    started = time.perf_counter()
+    with track_stats() as stats:
+        award_update_all.update_all_awards()
+    awards_ms = (time.perf_counter() - started) * 1000
+
+    with Session(engine) as session:
+        games = Game.games_for_week(session, week_info)
+        final = sum(1 for g in games if g.is_final)
+    server.should_exit = True
+
+    print(
+        f"game day: {polls} polling rounds in {day_seconds:.1f}s, "
+        f"{final}/{len(games)} games final in the db"
+    )
+    if poll_times:
+        print(
+            f"update_a_game: median {statistics.median(poll_times) * 1000:.0f}ms, "
+            f"p95 {_percentile(poll_times, 0.95) * 1000:.0f}ms, "
+            f"{espn_calls} ESPN calls, {sum(failures.values())} failed runs"
+        )
+    for error, count in failures.most_common():
+        print(f"  {count} x {error}")
+    print(f"update_all_awards: {awards_ms:.0f}ms, {stats.db_queries} queries")
+    return 0 if final == len(games) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
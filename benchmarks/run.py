@@ -0,0 +1,280 @@
+"""
+Time the hot paths against a synthetic league.
+
+    python -m benchmarks.run --players 40 --seasons 3
+    python -m benchmarks.run --save-baseline          # record a new baseline
+    python -m benchmarks.run --database-url postgresql+psycopg://...
+
+The database at --database-url is DROPPED and rebuilt, never point it at a
+real league.  Exits non-zero when a benchmark is slower (beyond --tolerance)
+or runs more queries than the stored baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import random
+import re
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+from benchmarks.environment import ROOT, bootstrap
+
+DEFAULT_DATABASE_URL = f"sqlite:///{ROOT / 'benchmarks' / 'bench.db'}"
+DEFAULT_BASELINE = ROOT / "benchmarks" / "baseline.json"
+
+
+@dataclass
+class Result:
+    name: str
+    runs: int
+    median_ms: float
+    min_ms: float
+    queries: Optional[int]
+
+
+def _queries_from_server_timing(header: str) -> Optional[int]:
+    match = re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', header or "")
+    return int(match.group(1)) if match else None
+
+
+def _measure(name: str, repeat: int, func: Callable[[int], Optional[int]]) -> Result:
+    """`func(iteration)` runs once and returns the number of queries it made"""
+    timings = []
+    queries = None
+    for iteration in range(repeat):
+        started = time.perf_counter()
+        queries = func(iteration)
+        timings.append((time.perf_counter() - started) * 1000)
+    return Result(
+        name=name,
+        runs=repeat,
+        median_ms=round(statistics.median(timings), 2),
+        min_ms=round(min(timings), 2),
+        queries=queries,
+    )
+
+
+def run_benchmarks(spec, repeat: int) -> list[Result]:
+    # pylint: disable=import-outside-toplevel,too-many-locals
+    from fastapi.testclient import TestClient
+    from sqlmodel import Session, select
+
+    import main
+    from db import engine
+    from espn_nfl import ESPNNfl
+    from jobs import award_update_all
+    from jobs.update_player_records import update_player_records
+    from app.metrics import route_timings, track_stats
+    from models import Game, Player
+    from models.model_helpers import WeekInfo
+
+    from benchmarks import fixtures
+
+    current = WeekInfo(spec.current_season, spec.season_type, spec.weeks)
+    previous = WeekInfo(spec.current_season, spec.season_type, spec.weeks - 1)
+    main.app.dependency_overrides[main._get_current_week_info] = lambda: current
+
+    with Session(engine) as session:
+        players = list(session.exec(select(Player).order_by(Player.id)).all())
+        games = Game.games_for_week(session=session, week_info=current)
+        game_teams = [(g.id, g.home_team_id, g.road_team_id) for g in games]
+        discord_ids = [p.discord_id for p in players]
+
+    client = TestClient(main.app)
+
+    def get(path: str, discord_id: int) -> Callable[[int], Optional[int]]:
+        def request(_iteration: int) -> Optional[int]:
+            response = client.get(path, cookies={"tgfp-discord-id": str(discord_id)})
+            response.raise_for_status()
+            return _queries_from_server_timing(response.headers.get("server-timing"))
+
+        return request
+
+    def get_streamed(route: str, path: str, discord_id: int):
+        """
+        A streamed page's Server-Timing header goes out before the template
+        runs its queries: count them from the route's totals (what
+        /admin/request_metrics reports), which are added once the body is sent
+        """
+
+        def request(_iteration: int) -> Optional[int]:
+            route_timings.reset()
+            response = client.get(path, cookies={"tgfp-discord-id": str(discord_id)})
+            response.raise_for_status()
+            return route_timings.snapshot()[f"GET {route}"]["max_db_queries"]
+
+        return request
+
+    def picks_form(iteration: int) -> Optional[int]:
+        rng = random.Random(iteration)
+        form = {}
+        for game_id, home_id, road_id in game_teams:
+            form[f"game_{game_id}"] = str(rng.choice([home_id, road_id]))
+        form["lock"] = next(iter(form.values()))
+        response = client.post(
+            "/picks_form",
+            data=form,
+            cookies={"tgfp-discord-id": str(discord_ids[iteration])},
+        )
+        response.raise_for_status()
+        return _queries_from_server_timing(response.headers.get("server-timing"))
+
+    def player_records(_iteration: int) -> int:
+        with track_stats() as stats, Session(engine) as session:
+            update_player_records(session=session)
+        return stats.db_queries
+
+    def all_awards(_iteration: int) -> int:
+        with track_stats() as stats:
+            award_update_all.update_all_awards()
+        return stats.db_queries
+
+    scoreboard = fixtures.scoreboard_payload(
+        spec.current_season, spec.season_type, spec.weeks, spec.games_per_week
+    )
+    teams_data = fixtures.teams_payload()["sports"][0]["leagues"][0]["teams"]
+    standings_data = fixtures.standings_payload()
+    standings_entries = [
+        entry
+        for conference in standings_data["children"]
+        for entry in conference["standings"]["entries"]
+    ]
+
+    def espn_parse(_iteration: int) -> None:
+        # pylint: disable=protected-access
+        nfl = ESPNNfl(week_no=spec.weeks, season_type=spec.season_type)
+        nfl._games_source_data = scoreboard["events"]
+        nfl._teams_source_data = teams_data
+        nfl._standings_source_data = standings_entries
+        for nfl_game in nfl.games():
+            _ = (nfl_game.home_team, nfl_game.away_team, nfl_game.favored_team)
+            _ = (nfl_game.spread, nfl_game.total_home_points, nfl_game.winning_team)
+        return None
+
+    viewer = discord_ids[0]
+    allpicks_path = (
+        f"/allpicks?season={previous.season}"
+        f"&season_type={previous.season_type}&week_no={previous.week_no}"
+    )
+    # warm the template cache so the first timed request isn't a compile
+    get(allpicks_path, viewer)(0)
+    get("/standings", viewer)(0)
+
+    # the discord webhook isn't part of what we're measuring
+    award_update_all.send_award_notification = lambda session: None
+
+    return [
+        _measure("espn_parse", repeat, espn_parse),
+        _measure("allpicks", repeat, get_streamed("/allpicks", allpicks_path, viewer)),
+        _measure("standings", repeat, get("/standings", viewer)),
+        _measure("picks_page", repeat, get("/picks", viewer)),
+        _measure("picks_form", min(repeat, len(discord_ids)), picks_form),
+        _measure("update_player_records", repeat, player_records),
+        _measure("update_all_awards", repeat, all_awards),
+    ]
+
+
+def compare(results: list[Result], baseline: dict, tolerance: float) -> list[str]:
+    """Returns a line per regression against `baseline`"""
+    regressions = []
+    for result in results:
+        before = baseline.get("results", {}).get(result.name)
+        if not before:
+            continue
+        if result.median_ms > before["median_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{result.name}: {before['median_ms']}ms -> {result.median_ms}ms"
+            )
+        if (
+            result.queries is not None
+            and before.get("queries") is not None
+            and result.queries > before["queries"]
+        ):
+            regressions.append(
+                f"{result.name}: {before['queries']} -> {result.queries} queries"
+            )
+    return regressions
+
+
+def _print_table(results: list[Result], baseline: dict):
+    before = baseline.get("results", {})
+    print(
+        f"{'benchmark':<24}{'runs':>6}{'median ms':>12}{'min ms':>10}{'queries':>9}"
+        f"{'vs baseline':>14}"
+    )
+    for result in results:
+        change = ""
+        if result.name in before and before[result.name]["median_ms"]:
+            ratio = result.median_ms / before[result.name]["median_ms"] - 1
+            change = f"{ratio:+.0%}"
+        queries = "-" if result.queries is None else result.queries
+        print(
+            f"{result.name:<24}{result.runs:>6}{result.median_ms:>12}"
+            f"{result.min_ms:>10}{queries:>9}{change:>14}"
+        )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--players", type=int, default=30)
+    parser.add_argument("--seasons", type=int, default=2)
+    parser.add_argument("--weeks", type=int, default=18)
+    parser.add_argument("--games-per-week", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--baseline", type=pathlib.Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed slowdown before a benchmark counts as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    bootstrap(args.database_url)
+    # pylint: disable=import-outside-toplevel
+    from db import engine
+    from benchmarks.league import LeagueSpec, generate_league
+
+    spec = LeagueSpec(
+        players=args.players,
+        seasons=args.seasons,
+        weeks=args.weeks,
+        games_per_week=args.games_per_week,
+        seed=args.seed,
+    )
+    started = time.perf_counter()
+    generate_league(engine, spec)
+    print(f"generated {spec} in {time.perf_counter() - started:.1f}s")
+
+    results = run_benchmarks(spec, args.repeat)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    _print_table(results, baseline)
+
+    if args.save_baseline:
+        payload = {
+            "spec": asdict(spec),
+            "results": {r.name: asdict(r) for r in results},
+        }
+        args.baseline.write_text(json.dumps(payload, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if baseline and baseline.get("spec") != asdict(spec):
+        print("warning: baseline was recorded with a different league spec")
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
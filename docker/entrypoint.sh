@@ -37,5 +37,9 @@ if [[ "${TGFP_DEBUG_MIGRATIONS:-0}" == "1" ]]; then
   uv run alembic -c "$ALEMBIC_CONFIG" current || true
 fi
 
+# Fingerprint and precompress the static files.  The image builds them too,
+# but compose bind-mounts ./app over /app, which hides the image's copy
+uv run python -m static_assets
+
 # Launch app
 exec uv run uvicorn main:app --host 0.0.0.0 --port 8000 --proxy-headers
\ No newline at end of file